@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020 by Ihor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+End-to-end conversion benchmark on samples/cgm.
+
+Every sample is converted to SVG and SK2 in a fresh interpreter,
+so peak RSS is measured per sample. Stages:
+
+  cgm_to_sk2  streamed CGM parsing and SK2 translation (as converter
+              does, CGM model is not built)
+  update      SK2 model update
+  svg_save    SK2 -> SVG translation streamed into file (as converter
+              does, SVG model is not built)
+  sk2_save    SK2 serialization
+
+Savers update document model before writing. These updates are
+reported by TIMING events and counted in update stage, not in
+saving one, so stage times add up to total time.
+
+Usage:
+  python benchmarks/convert_bench.py --output results.json
+  python benchmarks/convert_bench.py --output new.json --baseline results.json \\
+    --time-threshold 0.10 --rss-threshold 0.10 --size-threshold 0.02
+
+Exit status is 1 when any metric regresses above threshold
+against baseline.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import typing as tp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES_DIR = os.path.join(ROOT, "samples", "cgm")
+STAGES = ("cgm_to_sk2", "update", "svg_save", "sk2_save")
+
+
+def _peak_rss_kb() -> int:
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # macOS reports bytes, Linux reports kilobytes
+  return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_sample(path: str, out_dir: str) -> tp.Dict:
+  """Converts single sample measuring every stage.
+  Should be called in fresh interpreter.
+  """
+  sys.path.insert(0, ROOT)
+  from qc3 import events, qc3_init
+  from qc3.formats.cgm import cgm_filters, cgm_to_sk2
+  from qc3.formats.sk2.sk2_presenter import SK2_Presenter
+  from qc3.formats.svg.svg_presenter import SVG_Presenter
+
+  app = qc3_init()
+  app.init_color_management()
+  appdata = app.appdata
+
+  name = os.path.splitext(os.path.basename(path))[0]
+  svg_path = os.path.join(out_dir, name + ".svg")
+  sk2_path = os.path.join(out_dir, name + ".sk2")
+  stages = dict.fromkeys(STAGES, 0.0)
+  stage_rss = {}
+  updates = []
+
+  def update_receiver(_stage, _doc_id, start, end):
+    updates.append(end - start)
+
+  def stage(stage_name, func, *args):
+    updates.clear()
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    # Model updates made by savers go to update stage
+    stages["update"] += sum(updates)
+    stages[stage_name] += duration - sum(updates)
+    stage_rss[stage_name] = _peak_rss_kb()
+    return result
+
+  def translate(sk2_doc):
+    records = cgm_filters.read_records(path)
+    translator = cgm_to_sk2.CGM_to_SK2_Translator()
+    translator.translate_records(records, sk2_doc, update=False)
+
+  events.connect(events.TIMING, update_receiver, ("update",))
+  sk2_doc = SK2_Presenter(appdata)
+  sk2_doc.doc_file = path
+  stage("cgm_to_sk2", translate, sk2_doc)
+  stage("update", sk2_doc.update)
+  svg_doc = SVG_Presenter(appdata)
+  stage("svg_save", svg_doc.stream_from_sk2, sk2_doc, svg_path)
+  svg_doc.close()
+  stage("sk2_save", sk2_doc.save, sk2_path)
+  sk2_doc.close()
+
+  return {
+    "stages": stages,
+    "total": sum(stages.values()),
+    "stage_peak_rss_kb": stage_rss,
+    "peak_rss_kb": _peak_rss_kb(),
+    "output_size": {
+      "svg": os.path.getsize(svg_path),
+      "sk2": os.path.getsize(sk2_path),
+    },
+  }
+
+
+def aggregate(runs: tp.List[tp.Dict]) -> tp.Dict:
+  """Merges results of sample runs. Times and memory are taken
+  from best run for every value, output sizes from the largest one.
+  """
+
+  def merge(key, func):
+    return {name: func(run[key][name] for run in runs) for name in runs[0][key]}
+
+  stages = merge("stages", min)
+  return {
+    "stages": stages,
+    "total": sum(stages.values()),
+    "stage_peak_rss_kb": merge("stage_peak_rss_kb", min),
+    "peak_rss_kb": min(run["peak_rss_kb"] for run in runs),
+    "output_size": merge("output_size", max),
+  }
+
+
+def measure(path: str, repeat: int) -> tp.Dict:
+  """Runs sample benchmark in subprocesses and aggregates runs"""
+  runs = []
+  with tempfile.TemporaryDirectory() as out_dir:
+    for _i in range(repeat):
+      cmd = [sys.executable, os.path.abspath(__file__), "--worker", path, out_dir]
+      proc = subprocess.run(cmd, stdout=subprocess.PIPE, universal_newlines=True)
+      if proc.returncode:
+        raise RuntimeError("Benchmark of %s is failed" % path)
+      runs.append(json.loads(proc.stdout.splitlines()[-1]))
+  return aggregate(runs)
+
+
+def compare(results: tp.Dict, baseline: tp.Dict, thresholds: tp.Dict) -> tp.List[str]:
+  """Returns list of regression descriptions"""
+  regressions = []
+
+  def check(label, new, old, threshold):
+    if old and threshold is not None and new > old * (1.0 + threshold):
+      regressions.append(
+        "%s: %.4g -> %.4g (+%.1f%%)" % (label, old, new, (new / old - 1.0) * 100)
+      )
+
+  for name, sample in results["samples"].items():
+    base = baseline.get("samples", {}).get(name)
+    if base is None:
+      continue
+    for stage_name, value in sample["stages"].items():
+      old = base["stages"].get(stage_name)
+      check("%s %s time" % (name, stage_name), value, old, thresholds["time"])
+    check("%s total time" % name, sample["total"], base["total"], thresholds["time"])
+    check("%s peak RSS" % name, sample["peak_rss_kb"], base["peak_rss_kb"], thresholds["rss"])
+    for fmt, size in sample["output_size"].items():
+      old = base["output_size"].get(fmt)
+      check("%s %s size" % (name, fmt), size, old, thresholds["size"])
+  return regressions
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description="CGM conversion benchmark")
+  parser.add_argument("--samples", default=SAMPLES_DIR, help="CGM samples directory")
+  parser.add_argument("--repeat", type=int, default=3, help="runs per sample")
+  parser.add_argument("--output", default="", help="results JSON file")
+  parser.add_argument("--baseline", default="", help="baseline JSON file")
+  parser.add_argument("--time-threshold", type=float, default=0.10)
+  parser.add_argument("--rss-threshold", type=float, default=0.10)
+  parser.add_argument("--size-threshold", type=float, default=0.0)
+  parser.add_argument("--worker", nargs=2, help=argparse.SUPPRESS)
+  args = parser.parse_args()
+
+  if args.worker:
+    print(json.dumps(run_sample(*args.worker)))
+    return 0
+
+  paths = sorted(
+    glob.glob(os.path.join(args.samples, "*.cgm"))
+    + glob.glob(os.path.join(args.samples, "*.CGM"))
+  )
+  results = {
+    "meta": {
+      "python": platform.python_version(),
+      "platform": platform.platform(),
+      "repeat": args.repeat,
+    },
+    "samples": {},
+  }
+  header = "%-28s" % "sample" + "".join("%11s" % s for s in STAGES)
+  print(header + "%11s%10s" % ("total", "RSS MB"))
+  for path in paths:
+    name = os.path.basename(path)
+    sample = measure(path, max(1, args.repeat))
+    results["samples"][name] = sample
+    row = "%-28s" % name[:27]
+    row += "".join("%11.4f" % sample["stages"][s] for s in STAGES)
+    print(row + "%11.4f%10.1f" % (sample["total"], sample["peak_rss_kb"] / 1024.0))
+
+  if args.output:
+    with open(args.output, "w") as fileptr:
+      json.dump(results, fileptr, indent=1, sort_keys=True)
+
+  if args.baseline:
+    with open(args.baseline) as fileptr:
+      baseline = json.load(fileptr)
+    thresholds = {
+      "time": args.time_threshold,
+      "rss": args.rss_threshold,
+      "size": args.size_threshold,
+    }
+    regressions = compare(results, baseline, thresholds)
+    if regressions:
+      print("\nRegressions against %s:" % args.baseline)
+      print("  " + "\n  ".join(regressions))
+      return 1
+    print("\nNo regressions against %s" % args.baseline)
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
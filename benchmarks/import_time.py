@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020 by Ihor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+CLI startup import benchmark based on 'python -X importtime'.
+
+Usage: python benchmarks/import_time.py [--max-ms 150] [--json out.json]
+
+Fails (exit status 1) if startup imports any of deferred modules
+(text, cairo, raster and help rendering stacks) or if cumulative import
+time exceeds provided threshold.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import typing as tp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET = "qc3.application"
+
+# Modules which must not be imported on CLI startup
+DEFERRED = (
+  "cairo",
+  "jinja2",
+  "PIL",
+  "qc3.app_cms",
+  "qc3.cms",
+  "qc3.libcairo",
+  "qc3.libimg",
+  "qc3.libpango",
+)
+
+
+def measure(target: str = TARGET) -> tp.List[tp.Tuple[str, int, int]]:
+  """Imports target in fresh interpreter
+
+  :return: (list) (module, self us, cumulative us) records
+  """
+  cmd = [sys.executable, "-X", "importtime", "-c", "import %s" % target]
+  proc = subprocess.run(cmd, cwd=ROOT, stderr=subprocess.PIPE, universal_newlines=True)
+  if proc.returncode:
+    sys.stderr.write(proc.stderr)
+    raise RuntimeError("Cannot import %s" % target)
+  records = []
+  for line in proc.stderr.splitlines():
+    if not line.startswith("import time:") or "[us]" in line:
+      continue
+    self_us, cumulative_us, name = line[len("import time:") :].split("|")
+    records.append((name.strip(), int(self_us), int(cumulative_us)))
+  return records
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description="Measures CLI startup imports")
+  parser.add_argument("--repeat", type=int, default=5, help="number of runs")
+  parser.add_argument("--max-ms", type=float, default=0.0, help="time threshold")
+  parser.add_argument("--top", type=int, default=15, help="slowest modules to show")
+  parser.add_argument("--json", dest="json_path", default="", help="report file")
+  args = parser.parse_args()
+
+  runs = [measure() for _i in range(max(1, args.repeat))]
+  # Best run is the least noisy one
+  best = min(runs, key=lambda records: records[-1][2])
+  total_ms = best[-1][2] / 1000.0
+  modules = {name for name, _self, _cum in best}
+  leaked = sorted(
+    name
+    for name in modules
+    if any(name == item or name.startswith(item + ".") for item in DEFERRED)
+  )
+
+  print("%s cumulative import time: %.1f ms" % (TARGET, total_ms))
+  print("\nSlowest modules (self time):")
+  for name, self_us, _cum in sorted(best, key=lambda r: -r[1])[: args.top]:
+    print("  %8.1f ms  %s" % (self_us / 1000.0, name))
+
+  if args.json_path:
+    report = {
+      "target": TARGET,
+      "total_ms": total_ms,
+      "modules": {name: self_us for name, self_us, _cum in best},
+      "deferred_leaks": leaked,
+    }
+    with open(args.json_path, "w") as fileptr:
+      json.dump(report, fileptr, indent=1, sort_keys=True)
+
+  status = 0
+  if leaked:
+    print("\nFAIL: deferred modules are imported on startup:")
+    print("  " + "\n  ".join(leaked))
+    status = 1
+  if args.max_ms and total_ms > args.max_ms:
+    print("\nFAIL: import time %.1f ms exceeds %.1f ms" % (total_ms, args.max_ms))
+    status = 1
+  return status
+
+
+if __name__ == "__main__":
+  sys.exit(main())
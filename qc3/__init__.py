@@ -43,3 +43,29 @@ def qc3_run(cwd: tp.Optional[str] = None) -> tp.NoReturn:
   :param cwd: (str|None) application working directory
   """
   qc3_init()(cwd or os.getcwd())
+
+
+_library_app = None
+
+
+def convert_bytes(
+  data: tp.Union[bytes, tp.BinaryIO],
+  out_format: str,
+  in_format: tp.Optional[str] = None,
+  **options: tp.Any
+) -> bytes:
+  """Translates in-memory file content without temporary files.
+
+  :param data: (bytes|file object) input file content
+  :param out_format: (str) output format id, e.g. 'svg'
+  :param in_format: (str|None) input format id, detected from content if None
+  :param options: translation options
+  :return: (bytes) output file content
+  """
+  global _library_app
+  from .translate import convert_data
+
+  if _library_app is None:
+    _library_app = qc3_init()
+    _library_app.init_color_management()
+  return convert_data(_library_app.appdata, data, out_format, in_format, options)
@@ -24,11 +24,13 @@ import typing as tp
 
 import qc3
 # from .qc3const import MODEL_LOADERS, PALETTE_LOADERS, BITMAP_LOADERS, MODEL_SAVERS, PALETTE_SAVERS, BITMAP_SAVERS
-from . import app_cms, events, msgconst, configure, translate, qc3const
-from .app_palettes import PaletteManager
+from . import events, msgconst, configure, translate, qc3const
 from .qc3conf import QCData, QCConfig
 from .utils.mixutils import echo, config_logging
-from jinja2 import Template
+
+if tp.TYPE_CHECKING:
+  from .app_cms import AppColorManager
+  from .app_palettes import PaletteManager
 
 LOG = logging.getLogger(__name__)
 
@@ -40,6 +42,13 @@ LOG_MAP: tp.Dict[int, tp.Callable] = {
   msgconst.ERROR: LOG.error,
   msgconst.STOP: lambda *args: args,
 }
+LOG_LEVELS: tp.Dict[int, int] = {
+  msgconst.JOB: logging.INFO,
+  msgconst.INFO: logging.INFO,
+  msgconst.OK: logging.INFO,
+  msgconst.WARNING: logging.WARNING,
+  msgconst.ERROR: logging.ERROR,
+}
 
 HELP_TEMPLATE = '''
 
@@ -47,6 +56,18 @@ Additional information:
 
 Usage: {{program_name}} [OPTIONS] INPUT_FILE OUTPUT_FILE
 Example: {{program_name}} drawing.cgm drawing.svg
+         {{program_name}} --page=1 catalog.cgm first_page.svg
+
+ --page=N                Translate N-th picture of CGM metafile only
+ --pages=N-M             Translate pictures N..M of CGM metafile only
+ --split-pictures        Translate pictures of CGM metafile in parallel
+                         processes (see --jobs)
+ --merge-primitives      Merge runs of CGM polylines with the same style
+                         into multi-path curves
+ --cull-clipped          Skip CGM primitives which are completely outside
+                         of clip rectangle
+ --simplify              Flatten curves with output resolution tolerance
+                         and simplify polylines on CGM export
 
 ---Bulk operations:---------------------------------
 
@@ -57,6 +78,19 @@ Example: {{program_name}} --recursive --format=PDF '~/clipart/*.svg' ~/clipart_p
  --vs, --verbose-short   Show minimized internal logs
  --dry-run               Execute command without translation
  --recursive             Recursive scanning
+ --jobs=N                Number of parallel conversion processes
+                         (default: number of CPUs)
+ --incremental           Skip files not changed since previous run
+                         (uses .qc3-manifest.json in output directory)
+ --profile=REPORT        Write per-file and per-batch stage timings
+                         (parse, update, text layout, path building,
+                         serialization) into REPORT JSON file
+
+---Conversion daemon:-------------------------------
+
+Usage: {{program_name}} --serve /path/to.sock
+ Accepts newline-delimited JSON jobs, for example:
+ {"input": "/in/drawing.cgm", "output": "/out/drawing.svg", "format": "svg"}
 
 ---Configuring:-------------------------------------
 
@@ -92,6 +126,35 @@ Examples: {{program_name}} --configure 'cms_use=yes'
 ----------------------------------------------------
 '''
 
+
+def page_range(value: str) -> tp.Tuple[int, int]:
+  """Parses 'N' or 'N-M' page range argument
+
+  :return: (tuple) first and last page numbers (1-based)
+  """
+  try:
+    first, _sep, last = value.partition("-")
+    pages = (int(first), int(last or first))
+  except ValueError:
+    pages = (0, 0)
+  if not 0 < pages[0] <= pages[1]:
+    raise argparse.ArgumentTypeError("invalid page range: '%s'" % value)
+  return pages
+
+
+class HelpParser(argparse.ArgumentParser):
+  """ArgumentParser which renders help epilog on demand only"""
+
+  def __init__(self, *args, epilog_factory: tp.Optional[tp.Callable] = None, **kwargs):
+    argparse.ArgumentParser.__init__(self, *args, **kwargs)
+    self.epilog_factory = epilog_factory
+
+  def format_help(self) -> str:
+    if self.epilog is None and self.epilog_factory is not None:
+      self.epilog = self.epilog_factory()
+    return argparse.ArgumentParser.format_help(self)
+
+
 class QCApplication:
   """Represents QueConverter application.
   The object exists during translation process only.
@@ -100,9 +163,10 @@ class QCApplication:
   path: str
   config: QCConfig
   appdata: QCData
-  default_cms: app_cms.AppColorManager
-  palettes: PaletteManager
+  default_cms: "AppColorManager"
+  palettes: "PaletteManager"
   log_filepath: str
+  log_level: str = "INFO"
   do_verbose: bool = False
 
   def __init__(self, path: str = "", cfgdir: str = "~", check: bool = True) -> None:
@@ -122,6 +186,40 @@ class QCApplication:
     setattr(qc3, "config", self.config)
     setattr(qc3, "appdata", self.appdata)
 
+  def init_runtime(self, do_verbose: bool = False, log_level: str = "INFO") -> None:
+    """Prepares logging and color management before translation.
+    Called once per process, i.e. also in every batch worker.
+
+    :param do_verbose: (bool) echo all event messages
+    :param log_level: (str) logging level
+    """
+    self.do_verbose = do_verbose
+    self.log_level = log_level
+
+    config_logging(filepath=self.log_filepath, level=log_level)
+    events.connect(events.MESSAGES, self.verbose, self.get_message_levels())
+    self.init_color_management()
+
+  def get_message_levels(self) -> tp.Set[int]:
+    """Returns message types which are echoed or logged,
+    so other messages are not even formatted.
+    """
+    if self.do_verbose:
+      return set(msgconst.MESSAGES)
+    levels = {msgconst.ERROR, msgconst.STOP}
+    for msg_type, level in LOG_LEVELS.items():
+      if LOG.isEnabledFor(level):
+        levels.add(msg_type)
+    return levels
+
+  def init_color_management(self) -> None:
+    """Creates application color manager and palettes."""
+    from .app_cms import AppColorManager
+    from .app_palettes import PaletteManager
+
+    self.default_cms = AppColorManager(self)
+    self.palettes = PaletteManager(self)
+
   def verbose(self, *args: tp.Union[int, str]) -> None:
     """Logging callable to write event message records
 
@@ -141,9 +239,23 @@ class QCApplication:
     options['verbose'] = self.args.verbose > 0
     options['verbose-short'] = self.args.verbose_short
     options['recursive'] = self.args.recursive
+    options['jobs'] = self.args.jobs
+    options['incremental'] = self.args.incremental
+    options['profile'] = self.args.profile
+    if self.args.pages:
+      options['pages'] = self.args.pages
+    if self.args.split_pictures:
+      options['split-pictures'] = True
+    if self.args.merge_primitives:
+      options['merge-primitives'] = True
+    if self.args.cull_clipped:
+      options['cull-clipped'] = True
+    if self.args.simplify:
+      options['simplify'] = True
     return options
 
-  def __parse_args(self) -> tp.Optional[tp.NoReturn]:
+  def __render_help_epilog(self) -> str:
+    from jinja2 import Template
 
     template = Template(HELP_TEMPLATE)
     additional_help_data = {}
@@ -174,11 +286,13 @@ class QCApplication:
       additional_help_data['bitmap_savers'] = sep.join(BITMAP_SAVERS)
     else:
       additional_help_data['bitmap_savers'] = nunyet
+    return template.render(**additional_help_data)
 
-    parser = argparse.ArgumentParser(
-      prog=additional_help_data['program_name'],
+  def __parse_args(self) -> tp.Optional[tp.NoReturn]:
+    parser = HelpParser(
+      prog=self.appdata.app_proc,
       formatter_class=argparse.RawDescriptionHelpFormatter,
-      epilog=template.render(**additional_help_data),
+      epilog_factory=self.__render_help_epilog,
     )
     parser.add_argument("files", nargs='*', default=[], help="specify files to convert")
     parser.add_argument(
@@ -233,6 +347,76 @@ class QCApplication:
       default='',
       help="set configuration values",
     )
+    parser.add_argument(
+      "-j",
+      "--jobs",
+      action="store",
+      dest="jobs",
+      type=int,
+      default=os.cpu_count() or 1,
+      help="number of parallel conversion processes for bulk operations",
+    )
+    parser.add_argument(
+      "--incremental",
+      action="store_true",
+      dest="incremental",
+      default=False,
+      help="skip files which are not changed since previous bulk translation",
+    )
+    parser.add_argument(
+      "--page",
+      "--pages",
+      action="store",
+      dest="pages",
+      type=page_range,
+      default=None,
+      metavar="N[-M]",
+      help="translate only specified pictures of multi-picture CGM file",
+    )
+    parser.add_argument(
+      "--split-pictures",
+      action="store_true",
+      dest="split_pictures",
+      default=False,
+      help="translate pictures of multi-picture CGM file in parallel",
+    )
+    parser.add_argument(
+      "--merge-primitives",
+      action="store_true",
+      dest="merge_primitives",
+      default=False,
+      help="merge consecutive CGM primitives with the same style into one curve",
+    )
+    parser.add_argument(
+      "--cull-clipped",
+      action="store_true",
+      dest="cull_clipped",
+      default=False,
+      help="skip CGM primitives which are completely outside of clip rectangle",
+    )
+    parser.add_argument(
+      "--simplify",
+      action="store_true",
+      dest="simplify",
+      default=False,
+      help="simplify exported CGM paths up to output resolution",
+    )
+    parser.add_argument(
+      "--profile",
+      action="store",
+      dest="profile",
+      default='',
+      metavar="REPORT",
+      help="write per-stage timing report (JSON) into REPORT file",
+    )
+    parser.add_argument(
+      "--serve",
+      action="store",
+      dest="serve",
+      default='',
+      metavar="SOCKET",
+      help="run conversion daemon on Unix domain socket",
+    )
     parser.add_argument(
       "--log",
       "--log-level",
@@ -330,10 +514,12 @@ class QCApplication:
   def get_translation_args(
     self,
     current_dir: tp.Optional[str],
-  ) -> tp.Union[tp.NoReturn, tp.Tuple[tp.Callable, tp.List[str], tp.Dict]]:
+  ) -> tp.Union[tp.NoReturn, int]:
     """Prepares QueConverter execution command, options, targets and destinations
+    and runs translation
 
     :param current_dir: (str|None) directory path where QueConverter command executed
+    :return: (int) number of files which are failed or skipped in batch translation
     """
     current_dir = current_dir or os.getcwd()
     # files, options = cmds.parse_cmd_args(current_dir)
@@ -348,8 +534,9 @@ class QCApplication:
       sys.exit(1)
 
     options = self.__mk_options()
+    failed = 0
     if any(["*" in files[0], "?" in files[0]]):
-      translate.wildcard_convert(self.appdata, files, options)
+      failed = translate.wildcard_convert(self.appdata, files, options)
       if os.path.exists(files[1]):
         if not os.path.isdir(files[1]):
           msg = 'Destination directory "%s" is not a directory!'
@@ -358,7 +545,7 @@ class QCApplication:
       else:
         os.makedirs(files[1])
     elif len(files) > 2:
-      translate.multiple_convert(self.appdata, files, options)
+      failed = translate.multiple_convert(self.appdata, files, options)
       if os.path.exists(files[-1]):
         if not os.path.isdir(files[-1]):
           msg = 'Destination directory "%s" is not a directory!'
@@ -370,7 +557,8 @@ class QCApplication:
       self.__show_short_help('Source file "%s" is not found!' % files[0])
       sys.exit(1)
     else:
-      translate.convert(self.appdata, files, options)
+      translate.single_convert(self.appdata, files, options)
+    return failed
 
   def __call__(self, current_dir: tp.Optional[str] = None) -> tp.NoReturn:
     """QueConverter translation callable.
@@ -378,22 +566,20 @@ class QCApplication:
     :param current_dir: (str|None) directory path where QueConverter command executed
     """
     self.check_sys_args(current_dir=current_dir)
+    self.init_runtime(self.args.verbose > 0, self.args.log_level)
 
-    self.do_verbose = self.args.verbose > 0
+    if self.args.serve:
+      from . import daemon
 
-    events.connect(events.MESSAGES, self.verbose)
-    config_logging(
-      filepath=self.log_filepath, level=self.args.log_level
-    )
-
-    self.default_cms = app_cms.AppColorManager(self)
-    self.palettes = PaletteManager(self)
+      daemon.serve(self.appdata, os.path.abspath(self.args.serve), self.__mk_options())
+      sys.exit(0)
 
     # ------------ EXECUTION ----------------
     status = 0
     # noinspection PyBroadException
     try:
-      self.get_translation_args(current_dir=current_dir)
+      if self.get_translation_args(current_dir=current_dir):
+        status = 1
     except Exception as ex:
       msg = str(ex)
       print(msg)
@@ -17,12 +17,13 @@
 import typing as tp
 from copy import deepcopy
 
-from PIL import Image
-
 from qc3 import qc3const
 from . import cs
 from . import libcms
 
+if tp.TYPE_CHECKING:
+    from PIL import Image
+
 
 class DefaultColorManager:
     """The class provides default color manager.
@@ -118,7 +119,7 @@ class DefaultColorManager:
         libcms.cms_do_transform(transform, in_color, out_color)
         return cs.decode_colorb(out_color, cs_out)
 
-    def do_bitmap_transform(self, img: Image, mode: str, cs_out: tp.Optional[str] = None) -> Image:
+    def do_bitmap_transform(self, img: "Image", mode: str, cs_out: tp.Optional[str] = None) -> "Image":
         """Does image proof transform. Returns new image instance.
 
         :param img: (Image) Pillow Image instance
@@ -147,7 +148,7 @@ class DefaultColorManager:
         libcms.cms_do_transform(transform, in_color, out_color)
         return cs.decode_colorb(out_color, qc3const.COLOR_RGB)
 
-    def do_proof_bitmap_transform(self, img: Image) -> Image:
+    def do_proof_bitmap_transform(self, img: "Image") -> "Image":
         """Does image proof transform. Returns new image instance.
 
         :param img: (Image) Pillow Image instance
@@ -335,7 +336,7 @@ class DefaultColorManager:
         """
         return cs.val_255(self.get_display_color(color))
 
-    def convert_image(self, img: Image, outmode: str, cs_out: tp.Optional[str] = None) -> Image:
+    def convert_image(self, img: "Image", outmode: str, cs_out: tp.Optional[str] = None) -> "Image":
         """Converts image between color spaces and image modes. Returns new image instance.
 
         :param img: (Image) Pillow Image instance
@@ -357,7 +358,7 @@ class DefaultColorManager:
 
         return self.do_bitmap_transform(img, outmode, cs_out)
 
-    def adjust_image(self, img: Image, profile_bytes: bytes) -> Image:
+    def adjust_image(self, img: "Image", profile_bytes: bytes) -> "Image":
         """Adjust image with embedded profile to similar color space defined by current profile.
         Returns new image instance.
 
@@ -373,7 +374,7 @@ class DefaultColorManager:
             custom_profile, cs_in, out_profile, cs_out, intent, self.flags)
         return libcms.cms_do_bitmap_transform(transform, img, cs_in, cs_out)
 
-    def get_display_image(self, img: Image) -> Image:
+    def get_display_image(self, img: "Image") -> "Image":
         """Creates display image representation. Returns new image instance.
 
         :param img: (Image) Pillow Image instance
@@ -20,11 +20,12 @@
 import os
 import typing as tp
 
-from PIL import Image
-
 from qc3 import qc3const
 from . import _lcms2
 
+if tp.TYPE_CHECKING:
+    from PIL import Image
+
 
 class CmsError(Exception):
     """CMS specific exception class
@@ -400,8 +401,8 @@ def cms_do_transform(transform: qc3const.PyCapsule, inbuff: tp.List[int], outbuf
         raise CmsError(msg)
 
 
-def cms_do_bitmap_transform(transform: qc3const.PyCapsule, image: Image.Image,
-                            in_mode: str, out_mode: str) -> Image.Image:
+def cms_do_bitmap_transform(transform: qc3const.PyCapsule, image: "Image.Image",
+                            in_mode: str, out_mode: str) -> "Image.Image":
     """Provides PIL images support for color management.
     Currently supports L, RGB, CMYK and LAB modes only.
 
@@ -422,6 +423,8 @@ def cms_do_bitmap_transform(transform: qc3const.PyCapsule, image: Image.Image,
     if out_mode not in qc3const.IMAGE_COLORSPACES:
         raise CmsError('unsupported out_mode type: %s' % out_mode)
 
+    from PIL import Image
+
     w, h = image.size
     image.load()
     new_image = Image.new(out_mode, (w, h))
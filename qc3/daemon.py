@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020 by Ihor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Warm conversion daemon.
+
+The daemon keeps application config, color profiles and font map
+loaded and accepts translation jobs over Unix domain socket.
+Each request and each reply is a single JSON object per line.
+
+Request:
+  {"input": "/in/drawing.cgm", "output": "/out/drawing.svg",
+   "format": "svg", "options": {...}}
+
+Reply:
+  {"status": "ok", "input": ..., "output": ...,
+   "timings": {"detect": 0.001, "load": 0.120, "save": 0.030, "total": 0.151}}
+  {"status": "error", "message": "...", "timings": {...}}
+
+Jobs are executed one by one, because translators share
+process-wide state (event channels, application config).
+Run several daemons for parallel processing.
+"""
+
+import copy
+import json
+import logging
+import os
+import socketserver
+import time
+import typing as tp
+
+from qc3 import events, msgconst, translate
+
+LOG = logging.getLogger(__name__)
+
+
+def _warm_up() -> None:
+  """Loads lazily initialized resources before first request."""
+  # noinspection PyBroadException
+  try:
+    from qc3 import libpango
+
+    libpango.get_fonts()
+  except Exception:
+    LOG.exception("Font map preloading is failed")
+
+
+def process_request(appdata, request: tp.Dict, options: tp.Dict) -> tp.Dict:
+  """Executes single translation job
+
+  :param appdata: (QCData) application data
+  :param request: (dict) decoded request
+  :param options: (dict) default translation options
+  :return: (dict) reply
+  """
+  timings = {}
+  reply = {"input": request.get("input"), "output": request.get("output")}
+  try:
+    files = (request["input"], request["output"])
+    kw = copy.deepcopy(options)
+    kw.update(request.get("options") or {})
+    if request.get("format"):
+      kw["format"] = request["format"]
+    translate.convert(appdata, files, kw, timings=timings)
+    reply["status"] = "ok"
+  except Exception as e:
+    reply["status"] = "error"
+    reply["message"] = str(e) or e.__class__.__name__
+  reply["timings"] = timings
+  return reply
+
+
+class ConversionHandler(socketserver.StreamRequestHandler):
+  def handle(self) -> None:
+    for line in self.rfile:
+      line = line.strip()
+      if not line:
+        continue
+      start = time.monotonic()
+      try:
+        request = json.loads(line.decode("utf-8"))
+        if not isinstance(request, dict):
+          raise ValueError("Request should be JSON object")
+      except ValueError as e:
+        reply = {"status": "error", "message": "Bad request: %s" % e}
+      else:
+        reply = process_request(self.server.appdata, request, self.server.options)
+      reply.setdefault("timings", {})["request"] = time.monotonic() - start
+      self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+      self.wfile.flush()
+
+
+class ConversionServer(socketserver.UnixStreamServer):
+  def __init__(self, sock_path: str, appdata, options: tp.Dict) -> None:
+    self.appdata = appdata
+    self.options = options
+    socketserver.UnixStreamServer.__init__(self, sock_path, ConversionHandler)
+
+
+def serve(appdata, sock_path: str, options: tp.Dict) -> None:
+  """Runs conversion daemon until interrupted
+
+  :param appdata: (QCData) application data
+  :param sock_path: (str) Unix domain socket path
+  :param options: (dict) default translation options
+  """
+  if os.path.exists(sock_path):
+    os.remove(sock_path)
+  _warm_up()
+  server = ConversionServer(sock_path, appdata, options)
+  msg = "Conversion daemon is listening on %s" % sock_path
+  events.emit(events.MESSAGES, msgconst.INFO, msg)
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+    if os.path.exists(sock_path):
+      os.remove(sock_path)
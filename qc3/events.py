@@ -27,6 +27,14 @@ Signal arguments:
 CONFIG_MODIFIED   attr, value - modified config field
 FILTER_INFO       msg, position - info message and progress in range 0.0-1.0
 MESSAGES          msg_type, msg - message type and message text
+TIMING            stage, doc_id, start, end - translation stage name,
+                  document format id (or None) and time.monotonic()
+                  stage start and end timestamps
+
+Receiver may declare collection of accepted levels (values
+of the first signal argument, e.g. MESSAGES msg_type) on connecting.
+Signal is not delivered to receivers which do not accept its level,
+and emit_msg() does not format message text if nobody accepts it.
 
 """
 
@@ -39,16 +47,23 @@ CANCEL_OPERATION = False
 CONFIG_MODIFIED = ['CONFIG_MODIFIED']
 FILTER_INFO = ['FILTER_INFO']
 MESSAGES = ['MESSAGES']
+TIMING = ['TIMING']
+
+# Accepted levels of receivers: (channel name, receiver) -> frozenset
+LEVELS = {}
 
 
-def connect(channel, receiver):
+def connect(channel, receiver, levels=None):
     """
     Connects signal receive method
-    to provided channel.
+    to provided channel. If levels are provided, receiver
+    gets signals with accepted first argument only.
     """
     if callable(receiver):
         try:
             channel.append(receiver)
+            if levels is not None:
+                LEVELS[(channel[0], receiver)] = frozenset(levels)
         except Exception as e:
             msg = 'Cannot connect <%s> receiver to <%s> channel. %s'
             LOG.error(msg, receiver, channel, e)
@@ -62,16 +77,40 @@ def disconnect(channel, receiver):
     if callable(receiver):
         try:
             channel.remove(receiver)
+            if receiver not in channel:
+                LEVELS.pop((channel[0], receiver), None)
         except Exception as e:
             msg = 'Cannot disconnect <%s> receiver from <%s> channel. %s'
             LOG.error(msg, receiver, channel, e)
 
 
+def is_wanted(channel, level=None):
+    """
+    Checks whether any receiver in channel
+    accepts signal of provided level.
+    """
+    if len(channel) == 1:
+        return False
+    name = channel[0]
+    for receiver in channel[1:]:
+        levels = LEVELS.get((name, receiver))
+        if levels is None or level in levels:
+            return True
+    return False
+
+
 def emit(channel, *args):
     """
-    Sends signal to all receivers in channel.
+    Sends signal to all receivers in channel
+    which accept signal level.
     """
+    if len(channel) == 1:
+        return
+    name = channel[0]
     for receiver in channel[1:]:
+        levels = LEVELS.get((name, receiver))
+        if levels is not None and args[0] not in levels:
+            continue
         try:
             if callable(receiver):
                 receiver(*args)
@@ -81,11 +120,22 @@ def emit(channel, *args):
             continue
 
 
+def emit_msg(channel, level, msg, *args):
+    """
+    Sends (level, msg % args) signal. Message is formatted
+    only if some receiver accepts the level.
+    """
+    if is_wanted(channel, level):
+        emit(channel, level, msg % args if args else msg)
+
+
 def clean_channel(channel):
     """
     Cleans channel queue.
     """
     name = channel[0]
+    for receiver in channel[1:]:
+        LEVELS.pop((name, receiver), None)
     channel[:] = []
     channel.append(name)
 
@@ -94,5 +144,5 @@ def clean_all_channels():
     """
     Cleans all channels.
     """
-    for item in (CONFIG_MODIFIED, MESSAGES, FILTER_INFO):
+    for item in (CONFIG_MODIFIED, MESSAGES, FILTER_INFO, TIMING):
         clean_channel(item)
@@ -15,7 +15,9 @@
 # 	You should have received a copy of the GNU Affero General Public License
 # 	along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
 import logging
+import os
 from importlib import import_module
 
 from qc3 import events, msgconst
@@ -29,6 +31,13 @@ LOADERS = {}
 SAVERS = {}
 CHECKERS = {}
 
+# Format checkers match signatures against first HEADER_SIZE bytes
+# of file, so file is read only once for detection. If header does
+# not decide (e.g. SVG root tag follows long DOCTYPE or comments),
+# checkers are called for the whole file.
+HEADER_SIZE = 4096
+DETECTION_CACHE_SIZE = 1024
+
 
 def _get_loader(pid):
   if not isinstance(pid, str):
@@ -83,44 +92,62 @@ def get_loader_by_id(pid):
   return loader
 
 
+def read_header(path, size=HEADER_SIZE):
+  """Reads file header used for format sniffing."""
+  with open(path, "rb") as fileptr:
+    return fileptr.read(size)
+
+
+def _sniff(header, ld_formats, ext=None):
+  """Matches header buffer (or whole file by path) against format
+  checkers. Formats registered for file extension are checked first.
+
+  :return: (str|None, bool) format id and 'found by extension' flag
+  """
+  if ext is not None:
+    for item in ld_formats:
+      if ext in qc3const.FORMAT_EXTENSION[item]:
+        checker = _get_checker(item)
+        if checker and checker(header):
+          return item, True
+  for item in ld_formats:
+    checker = _get_checker(item)
+    if checker is not None and checker(header):
+      return item, False
+  return None, False
+
+
+@functools.lru_cache(maxsize=DETECTION_CACHE_SIZE)
+def _detect_format(path, file_size, mtime, experimental):
+  # file_size and mtime are cache keys only
+  ld_formats = [] + qc3const.LOADER_FORMATS
+  if experimental:
+    ld_formats += qc3const.EXPERIMENTAL_LOADERS
+  ext = get_file_extension(path)
+  ret = _sniff(read_header(path), ld_formats, ext)
+  if ret[0] is None and file_size > HEADER_SIZE:
+    ret = _sniff(path, ld_formats, ext)
+  return ret
+
+
 def get_loader(path, experimental=False, return_id=False):
   if not fsutils.exists(path):
     return None
   if not fsutils.isfile(path):
     return None
 
-  ret_id = None
-
   ext = get_file_extension(path)
-  loader = None
-  ld_formats = [] + qc3const.LOADER_FORMATS
-
   msg = "Start to search for loader by file extension %s" % (ext.__str__())
   events.emit(events.MESSAGES, msgconst.INFO, msg)
 
-  if experimental:
-    ld_formats += qc3const.EXPERIMENTAL_LOADERS
-  for item in ld_formats:
-    if ext in qc3const.FORMAT_EXTENSION[item]:
-      checker = _get_checker(item)
-      if checker and checker(path):
-        loader = _get_loader(item)
-        ret_id = item
-        break
-
-  if loader is None:
+  stat = os.stat(path)
+  ret_id, by_ext = _detect_format(path, stat.st_size, stat.st_mtime_ns, experimental)
+  if not by_ext:
     msg = "Loader is not found or not suitable for %s" % path
     events.emit(events.MESSAGES, msgconst.WARNING, msg)
     msg = "Start to search loader by file content"
     events.emit(events.MESSAGES, msgconst.INFO, msg)
-
-    for item in ld_formats:
-      checker = _get_checker(item)
-      if checker is not None:
-        if checker(path):
-          loader = _get_loader(item)
-          ret_id = item
-          break
+  loader = _get_loader(ret_id) if ret_id else None
 
   if loader is None:
     msg = "Loader is not found for %s" % path
@@ -135,6 +162,34 @@ def get_loader(path, experimental=False, return_id=False):
   return loader
 
 
+def get_loader_by_data(data, experimental=False, return_id=False):
+  """Searches loader for in-memory file content
+
+  :param data: (bytes) file content
+  """
+  ld_formats = [] + qc3const.LOADER_FORMATS
+  if experimental:
+    ld_formats += qc3const.EXPERIMENTAL_LOADERS
+  msg = "Start to search loader by file content"
+  events.emit(events.MESSAGES, msgconst.INFO, msg)
+  ret_id = _sniff(bytes(data[:HEADER_SIZE]), ld_formats)[0]
+  if ret_id is None and len(data) > HEADER_SIZE:
+    ret_id = _sniff(bytes(data), ld_formats)[0]
+  loader = _get_loader(ret_id) if ret_id else None
+
+  if loader is None:
+    msg = "Loader is not found for in-memory data"
+    events.emit(events.MESSAGES, msgconst.ERROR, msg)
+  else:
+    loader_name = loader.__str__().split(" ")[1]
+    msg = 'Loader "%s" is found for in-memory data' % loader_name
+    events.emit(events.MESSAGES, msgconst.OK, msg)
+
+  if return_id:
+    return loader, ret_id
+  return loader
+
+
 def get_saver_by_id(pid):
   saver = _get_saver(pid)
   if not saver:
@@ -23,31 +23,46 @@ from qc3 import qc3const, utils
 from qc3.formats.cgm.cgm_const import CGM_SIGNATURE
 from qc3.formats.cgm.cgm_presenter import CGM_Presenter
 from qc3.formats.sk2.sk2_presenter import SK2_Presenter
-from qc3.utils.fsutils import get_fileptr
+from qc3.formats.generic_filters import get_source_fileptr
 from qc3.utils.mixutils import merge_cnf
+from qc3.utils.workers import get_worker_appdata
 
 
 def cgm_loader(appdata, filename=None, fileptr=None, translate=True, cnf=None, **kw):
+  pages = kw.pop("pages", None)
+  split = kw.pop("split-pictures", False)
+  options = {
+    "merge": kw.pop("merge-primitives", False),
+    "cull": kw.pop("cull-clipped", False),
+  }
+  workers = int(kw.get("jobs") or 1)
   cnf = merge_cnf(cnf, kw)
   cgm_doc = CGM_Presenter(appdata, cnf)
-  cgm_doc.load(filename, fileptr)
   if translate:
+    # Translation streams elements from file, CGM model is not built
     sk2_doc = SK2_Presenter(appdata, cnf)
     if filename:
       sk2_doc.doc_file = filename
-    cgm_doc.translate_to_sk2(sk2_doc)
+    # Nested process pools are not used in bulk translation workers
+    if split and filename and workers > 1 and get_worker_appdata() is None:
+      cgm_doc.split_to_sk2(sk2_doc, filename, cnf, pages, workers, **options)
+    else:
+      cgm_doc.stream_to_sk2(sk2_doc, filename, fileptr, pages, **options)
     cgm_doc.close()
     return sk2_doc
+  cgm_doc.load(filename, fileptr)
   return cgm_doc
 
 
 def cgm_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None, **kw):
+  simplify = kw.pop("simplify", False)
   cnf = merge_cnf(cnf, kw)
   if sk2_doc.cid == qc3const.CGM:
     translate = False
   if translate:
     cgm_doc = CGM_Presenter(sk2_doc.appdata, cnf)
-    cgm_doc.translate_from_sk2(sk2_doc)
+    # Encoded metafile is written as is, CGM model is not built
+    cgm_doc.translate_from_sk2(sk2_doc, raw=True, simplify=simplify)
     cgm_doc.save(filename, fileptr)
     cgm_doc.close()
   else:
@@ -55,6 +70,6 @@ def cgm_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None, **
 
 
 def check_cgm(path):
-  with get_fileptr(path) as fileptr:
+  with get_source_fileptr(path) as fileptr:
     sign = fileptr.read(2)
   return utils.uint16_be(sign) & 0xFFE0 == CGM_SIGNATURE
@@ -506,7 +506,7 @@ CGM_INIT = {
   "marker.size": None,
   "clip": {},
   "clip.mode": 1,
-  "clip.rect": VDC_INT_EXTEND,
+  "clip.rect": None,  # VDC extent
   "scale": {},
   "scale.mode": 0,  # abstract
   "scale.metric": 0.0,
@@ -15,39 +15,141 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import time
+
+from qc3 import _, events, qc3const
 from qc3.formats.cgm import cgm_utils, cgm_const, cgm_model
 from qc3.formats.generic_filters import AbstractBinaryLoader, AbstractSaver
+from qc3.formats.generic_filters import map_fileptr
+
+
+def iter_records(data, pos=0, end=None):
+  """Yields CgmRecord elements straight from binary CGM content
+  (bytes or memoryview) without building CGM model. Elements of
+  METAFILE DEFAULTS REPLACEMENT follow the replacement element.
+  """
+  for element_id, size, _header, params in cgm_utils.iter_elements(data, pos, end):
+    yield cgm_model.CgmRecord(element_id, params, size)
+    if element_id == cgm_const.METAFILE_DEFAULTS_REPLACEMENT:
+      yield from iter_records(params[:size])
+
+
+def track_records(records, data_size):
+  """Passes CgmRecord elements through emitting parsing progress
+  messages and 'parse' TIMING event like CGM loader does. Parse time
+  is time spent in element decoding, so translation of yielded
+  elements is excluded.
+
+  :param records: (iterator) CgmRecord elements
+  :param data_size: (int) size of binary CGM content
+  """
+  timing = events.is_wanted(events.TIMING, "parse")
+  progress = data_size and events.is_wanted(events.FILTER_INFO)
+  if not (timing or progress):
+    yield from records
+    return
+  records = iter(records)
+  start = time.monotonic()
+  parse_time = 0.0
+  parsed = 0
+  position = 0.0
+  try:
+    while True:
+      resumed = time.monotonic()
+      record = next(records, None)
+      parse_time += time.monotonic() - resumed
+      if record is None:
+        break
+      if progress:
+        # Element header is 2-4 bytes, estimation is enough here
+        parsed += len(record.params) + 4
+        value = min(0.95, 0.95 * parsed / data_size)
+        if value - position > 0.05:
+          position = value
+          events.emit(events.FILTER_INFO, _("Parsing in progress..."), value)
+      yield record
+  finally:
+    if timing:
+      events.emit(events.TIMING, "parse", qc3const.CGM, start, start + parse_time)
+
+
+def select_pictures(pictures, pages):
+  """Returns picture index entries of requested pages
+
+  :param pictures: (list) picture index (see cgm_utils.scan_pictures)
+  :param pages: (tuple) first and last picture numbers (1-based)
+  """
+  first, last = pages
+  selected = pictures[first - 1 : last]
+  if first < 1 or not selected:
+    msg = "Pictures %d-%d are requested, file has %d picture(s)"
+    raise Exception(msg % (first, last, len(pictures)))
+  return selected
+
+
+def iter_pages(data, pages):
+  """Yields metafile descriptor elements and elements
+  of requested pictures only.
+
+  :param data: (bytes|memoryview) binary CGM content
+  :param pages: (tuple) first and last picture numbers (1-based)
+  """
+  descriptor_end, pictures = cgm_utils.scan_pictures(data)
+  selected = select_pictures(pictures, pages)
+  yield from iter_records(data, 0, descriptor_end)
+  for start, end in selected:
+    yield from iter_records(data, start, end)
+
+
+def read_records(path=None, fileptr=None, pages=None):
+  """Streams CgmRecord elements of CGM file
+
+  :param path: (str|None) file path
+  :param fileptr: (file object|None) binary stream if path is not provided
+  :param pages: (tuple|None) first and last pictures to translate
+  """
+  if path:
+    with open(path, "rb") as fileptr:
+      data = map_fileptr(fileptr)
+  else:
+    data = map_fileptr(fileptr)
+  if pages:
+    records = iter_pages(data, pages)
+  else:
+    records = iter_records(data)
+  yield from track_records(records, len(data))
+
+
+def build_model(data):
+  """Builds CGM model from binary CGM content. Element parameters
+  are zero-copy views of data if it is memoryview.
+
+  :param data: (bytes|memoryview) binary CGM content
+  :return: (CgmMetafile) CGM model
+  """
+  model = cgm_model.CgmMetafile()
+  parent_stack = [model]
+  for element_id, size, header, params in cgm_utils.iter_elements(data):
+    header = bytes(header)
+    if element_id == cgm_const.BEGIN_PICTURE:
+      picture = cgm_model.CgmPicture()
+      parent_stack[-1].add(picture)
+      parent_stack.append(picture)
+    if element_id == cgm_const.END_METAFILE and len(parent_stack) > 1:
+      parent_stack = parent_stack[:-1]
+
+    parent_stack[-1].add(cgm_model.element_factory(header, params, size))
+
+    if element_id == cgm_const.END_PICTURE:
+      parent_stack = parent_stack[:-1]
+  return model
 
 
 class CgmLoader(AbstractBinaryLoader):
   name = "CGM_Loader"
-  parent_stack = None
 
   def do_load(self):
-    self.model = cgm_model.CgmMetafile()
-    self.parent_stack = [self.model]
-    self.fileptr.seek(0, 2)
-    filesz = self.fileptr.tell()
-    self.fileptr.seek(0, 0)
-    while self.fileptr.tell() < filesz:
-      header = self.fileptr.read(2)
-      element_id, size = cgm_utils.parse_header(header)[1:]
-      if size == 0x1F:
-        header += self.fileptr.read(2)
-        size = cgm_utils.parse_header(header)[2]
-      params = self.fileptr.read(((size + 1) // 2) * 2)
-      if element_id == cgm_const.BEGIN_PICTURE:
-        picture = cgm_model.CgmPicture()
-        self.parent_stack[-1].add(picture)
-        self.parent_stack.append(picture)
-      if element_id == cgm_const.END_METAFILE and len(self.parent_stack) > 1:
-        self.parent_stack = self.parent_stack[:-1]
-
-      self.parent_stack[-1].add(cgm_model.element_factory(header, params))
-
-      if element_id == cgm_const.END_PICTURE:
-        self.parent_stack = self.parent_stack[:-1]
-    self.parent_stack = None
+    self.model = build_model(self.get_buffer())
 
 
 class CgmSaver(AbstractSaver):
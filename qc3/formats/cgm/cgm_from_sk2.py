@@ -15,171 +15,179 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import array
 import logging
+import sys
 
-from qc3 import utils, qc3const, libgeom, sk2const
-from qc3.formats.cgm import cgm_model, cgm_const
+from qc3 import qc3const, libgeom, sk2const
+from qc3.formats.cgm import cgm_model, cgm_const, cgm_filters, cgm_utils
 
 LOG = logging.getLogger(__name__)
 
 SCALE = 39.37 * qc3const.pt_to_mm
+# Flattening and simplification tolerance in VDC units
+SIMPLIFY_TOLERANCE = 1.0
 
+WORD = cgm_utils.get_struct(">h")
+FLOAT = cgm_utils.get_struct(">f")
+# Max length of CGM string in short form
+MAX_STR_LEN = 254
 
-def cgm_unit(val, double=False):
-  func = utils.py_int2signed_dword if double else utils.py_int2signed_word
-  return func(int(round(SCALE * val)), True)
 
+def pack_words(values):
+  """Packs sequence of ints into big-endian signed words at once"""
+  words = array.array("h", values)
+  if sys.byteorder == "little":
+    words.byteswap()
+  return words.tobytes()
 
-def builder(element_id, **kwargs):
-  elf = cgm_model.element_factory
-  header = params = ""
+
+def pack_points(points):
+  """Packs points into VDC (16-bit integers) by single call"""
+  return pack_words([int(round(SCALE * val)) for point in points for val in point])
+
+
+def pack_str(txt):
+  data = txt.encode(cgm_utils.TEXT_ENCODING, "replace")[:MAX_STR_LEN]
+  return bytes((len(data),)) + data
+
+
+def pack_color(color):
+  return bytes(color)
+
+
+def dash_index(dashes):
+  dashes = tuple(dashes)
+  if not dashes:
+    return 0
+  if dashes in cgm_const.LINE_DASHTABLE:
+    return cgm_const.LINE_DASHTABLE.index(dashes) + 1
+  return 2
+
+
+def builder(buf, element_id, **kwargs):
+  """Appends binary element to bytearray buffer"""
+  params = b""
   if element_id == cgm_const.BEGIN_METAFILE:
-    txt = kwargs.get("txt", "Computer Graphics Metafile")
-    params = utils.py_int2byte(len(txt)) + txt
-    header = utils.py_int2word(0x0020 + len(params), True)
+    params = pack_str(kwargs.get("txt", "Computer Graphics Metafile"))
   elif element_id == cgm_const.END_METAFILE:
-    header = "\x00\x40"
+    pass
   elif element_id == cgm_const.METAFILE_VERSION:
-    version = kwargs.get("version", 1)
-    params = utils.py_int2word(version, True)
-    header = "\x10\x22"
+    params = WORD.pack(kwargs.get("version", 1))
   elif element_id == cgm_const.METAFILE_DESCRIPTION:
-    txt = kwargs.get("description", "Created by UniConverter")
-    params = utils.py_int2byte(len(txt)) + txt
-    header = "\x10\x5f" + utils.py_int2word(len(params), True)
+    params = pack_str(kwargs.get("description", "Created by UniConverter"))
   elif element_id == cgm_const.METAFILE_ELEMENT_LIST:
-    header = "\x11\x66"
-    params = "\x00\x01\xff\xff\x00\x01"
+    params = b"\x00\x01\xff\xff\x00\x01"
   elif element_id == cgm_const.VDC_TYPE:
-    header = "\x10\x62"
-    params = "\x00\x00"
+    params = b"\x00\x00"
   elif element_id == cgm_const.INTEGER_PRECISION:
-    header = "\x10\x82"
-    params = "\x00\x10"
+    params = b"\x00\x10"
   elif element_id == cgm_const.REAL_PRECISION:
-    header = "\x10\xa6"
-    params = "\x00\x00\x00\x09\x00\x17"
+    params = b"\x00\x00\x00\x09\x00\x17"
   elif element_id == cgm_const.INDEX_PRECISION:
-    header = "\x10\xc2"
-    params = "\x00\x08"
+    params = b"\x00\x08"
   elif element_id == cgm_const.COLOUR_PRECISION:
-    header = "\x10\xe2"
-    params = "\x00\x08"
+    params = b"\x00\x08"
   elif element_id == cgm_const.COLOUR_INDEX_PRECISION:
-    header = "\x11\x02"
-    params = "\x00\x08"
+    params = b"\x00\x08"
   # Page elements
   elif element_id == cgm_const.BEGIN_PICTURE:
-    page_number = kwargs.get("page_number", 1)
-    txt = "Page %d" % page_number
-    params = utils.py_int2byte(len(txt)) + txt
-    header = "\x00" + utils.py_int2byte(len(params) + 0x60)
+    params = pack_str("Page %d" % kwargs.get("page_number", 1))
   elif element_id == cgm_const.BEGIN_PICTURE_BODY:
-    header = "\x00\x80"
+    pass
   elif element_id == cgm_const.END_PICTURE:
-    header = "\x00\xa0"
+    pass
   elif element_id == cgm_const.SCALING_MODE:
-    header = "\x20\x26"
-    params = "\x00\x01" + "\x3c\xd0\x13\xa9"
+    params = b"\x00\x01" + b"\x3c\xd0\x13\xa9"
   elif element_id == cgm_const.COLOUR_SELECTION_MODE:
-    header = "\x20\x42"
-    params = "\x00\x01"
+    params = b"\x00\x01"
   elif element_id == cgm_const.LINE_WIDTH_SPECIFICATION_MODE:
-    header = "\x20\x62"
-    params = "\x00\x01"
+    params = b"\x00\x01"
   elif element_id == cgm_const.EDGE_WIDTH_SPECIFICATION_MODE:
-    header = "\x20\xa2"
-    params = "\x00\x01"
+    params = b"\x00\x01"
   elif element_id == cgm_const.VDC_EXTENT:
     bbox = kwargs.get("bbox", (0.0, 0.0, 1.0, 1.0))
-    header = "\x20\xc8"
-    params = "".join([cgm_unit(val) for val in bbox])
+    params = pack_words([int(round(SCALE * val)) for val in bbox])
   # Polyline
   elif element_id == cgm_const.LINE_WIDTH:
-    header = "\x50\x64"
-    val = kwargs.get("width", 2.5)
-    params = utils.py_float2float(val, True)
+    params = FLOAT.pack(kwargs.get("width", 2.5))
   elif element_id == cgm_const.LINE_TYPE:
-    header = "\x50\x42"
-    dashes = tuple(kwargs.get("dashes", []))
-    index = 0
-    if dashes:
-      index = (
-        cgm_const.LINE_DASHTABLE.index(dashes) + 1
-        if dashes in cgm_const.LINE_DASHTABLE
-        else 2
-      )
-    params = utils.py_int2word(index, True)
+    params = WORD.pack(dash_index(kwargs.get("dashes", [])))
   elif element_id == cgm_const.LINE_COLOUR:
-    header = "\x50\x83"
-    color = kwargs.get("color", (0, 0, 0))
-    params = "".join([utils.py_int2byte(item) for item in color])
+    params = pack_color(kwargs.get("color", (0, 0, 0)))
   elif element_id == cgm_const.POLYLINE:
-    points = kwargs.get("points", [(0, 0), (1, 1)])
-    params = "".join([cgm_unit(x) + cgm_unit(y) for x, y in points])
-    header = "\x40\x3f" + utils.py_int2word(len(params), True)
+    params = pack_points(kwargs.get("points", [(0, 0), (1, 1)]))
   # Polygon
   elif element_id == cgm_const.INTERIOR_STYLE:
-    empty = kwargs.get("empty", False)
-    header = "\x52\xc2"
-    params = "\x00\x00" if empty else "\x00\x01"
+    params = b"\x00\x00" if kwargs.get("empty", False) else b"\x00\x01"
   elif element_id == cgm_const.FILL_COLOUR:
-    header = "\x52\xe3"
-    color = kwargs.get("color", (0, 0, 0))
-    params = "".join([utils.py_int2byte(item) for item in color])
+    params = pack_color(kwargs.get("color", (0, 0, 0)))
   elif element_id == cgm_const.EDGE_VISIBILITY:
-    header = "\x53\xc2"
-    visible = kwargs.get("visible", True)
-    params = "\x00\x01" if visible else "\x00\x00"
+    params = b"\x00\x01" if kwargs.get("visible", True) else b"\x00\x00"
   elif element_id == cgm_const.EDGE_COLOUR:
-    header = "\x52\xa3"
-    color = kwargs.get("color", (0, 0, 0))
-    params = "".join([utils.py_int2byte(item) for item in color])
+    params = pack_color(kwargs.get("color", (0, 0, 0)))
   elif element_id == cgm_const.EDGE_WIDTH:
-    header = "\x53\x84"
-    val = kwargs.get("width", 2.5)
-    params = utils.py_float2float(val, True)
+    params = FLOAT.pack(kwargs.get("width", 2.5))
   elif element_id == cgm_const.EDGE_TYPE:
-    header = "\x53\x61"
-    dashes = tuple(kwargs.get("dashes", []))
-    index = 0
-    if dashes:
-      index = (
-        cgm_const.LINE_DASHTABLE.index(dashes) + 1
-        if dashes in cgm_const.LINE_DASHTABLE
-        else 2
-      )
-    params = utils.py_int2word(index, True)
+    params = WORD.pack(dash_index(kwargs.get("dashes", [])))
   elif element_id == cgm_const.POLYGON:
     points = kwargs.get("points")
-    if points:
-      params = "".join([cgm_unit(x) + cgm_unit(y) for x, y in points])
-      header = "\x40\xff" + utils.py_int2word(len(params), True)
+    if not points:
+      return buf
+    params = pack_points(points)
   elif element_id == cgm_const.POLYGON_SET:
-    polygons = kwargs.get("polygons")
-    params = ""
-    for points in polygons:
-      if points:
-        end = "\x00\x03"
-        if not points[0] == points[-1]:
-          points += [points[0]]
-          end = "\x00\x02"
-        params += "\x00\x01".join([cgm_unit(x) + cgm_unit(y) for x, y in points]) + end
-    header = "\x41\x1f" + utils.py_int2word(len(params), True)
-
-  if header:
-    return elf(header, params)
+    # Every point is followed by edge flag: 1 - visible edge,
+    # 2 - close invisible, 3 - close visible
+    values = []
+    for points in kwargs.get("polygons"):
+      if not points:
+        continue
+      end = 3
+      if not points[0] == points[-1]:
+        points = points + [points[0]]
+        end = 2
+      for x, y in points:
+        values += [int(round(SCALE * x)), int(round(SCALE * y)), 1]
+      values[-1] = end
+    params = pack_words(values)
+  else:
+    return buf
+  return cgm_utils.pack_element(buf, element_id, params)
 
 
 class SK2_to_CGM_Translator(object):
-  cgm_doc = None
-  cgm_model = None
+  buf = None
   sk2_doc = None
   sk2_mtds = None
+  tolerance = None
+
+  def __init__(self, simplify=False):
+    """
+    :param simplify: (bool) flatten curves with tolerance of output
+                     resolution and drop redundant polyline points
+    """
+    if simplify:
+      self.tolerance = SIMPLIFY_TOLERANCE / SCALE
+
+  def translate(self, sk2_doc, cgm_doc, raw=False):
+    """Translates SK2 document into CGM document
 
-  def translate(self, sk2_doc, cgm_doc):
-    self.cgm_doc = cgm_doc
-    self.cgm_model = cgm_doc.model
+    :param raw: (bool) keep encoded metafile as single chunk
+                instead of building CGM model (for saving only)
+    """
+    data = bytes(self.encode(sk2_doc))
+    if raw:
+      cgm_doc.model = cgm_model.get_empty_cgm()
+      cgm_doc.model.chunk = data
+    else:
+      cgm_doc.model = cgm_filters.build_model(data)
+
+  def encode(self, sk2_doc):
+    """Returns binary CGM content of SK2 document
+
+    :return: (bytearray) encoded metafile
+    """
+    self.buf = bytearray()
     self.sk2_doc = sk2_doc
     self.sk2_mtds = sk2_doc.methods
 
@@ -203,13 +211,14 @@ class SK2_to_CGM_Translator(object):
 
     self.add(cgm_const.END_METAFILE)
 
-    self.cgm_doc = None
-    self.cgm_model = None
+    buf = self.buf
+    self.buf = None
     self.sk2_doc = None
     self.sk2_mtds = None
+    return buf
 
   def add(self, element_id, **kwargs):
-    self.cgm_model.add(builder(element_id, **kwargs))
+    builder(self.buf, element_id, **kwargs)
 
   def process_page(self, page, index=1):
     self.add(cgm_const.BEGIN_PICTURE, page_number=index)
@@ -248,13 +257,18 @@ class SK2_to_CGM_Translator(object):
       for item in obj.childs:
         self.process_obj(item)
 
+  def get_paths(self, obj):
+    if self.tolerance is None:
+      return libgeom.get_flattened_paths(obj)
+    return libgeom.get_simplified_paths(obj, self.tolerance)
+
   def make_polylines(self, obj, paths=None):
     stroke = obj.style[1]
     self.add(cgm_const.LINE_WIDTH, width=stroke[1])
     color = self.sk2_doc.cms.get_display_color255(stroke[2])[:3]
     self.add(cgm_const.LINE_COLOUR, color=color)
     if not paths:
-      paths = libgeom.get_flattened_paths(obj)
+      paths = self.get_paths(obj)
     for path in paths:
       points = [
         path[0],
@@ -264,7 +278,7 @@ class SK2_to_CGM_Translator(object):
   def make_polygons(self, obj):
     fill = obj.style[0]
     stroke = obj.style[1]
-    paths = libgeom.get_flattened_paths(obj)
+    paths = self.get_paths(obj)
     if not paths:
       return
     if stroke and stroke[7]:
@@ -15,6 +15,8 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import collections
+
 from qc3.formats.cgm import cgm_const, cgm_utils
 from qc3.formats.generic import BinaryModelObject
 
@@ -27,7 +29,7 @@ class CgmFolder(BinaryModelObject):
 
   def __init__(self):
     self.childs = []
-    self.chunk = ""
+    self.chunk = b""
 
   def resolve(self, name=""):
     sz = "%d" % len(self.childs)
@@ -57,16 +59,26 @@ ICONS = {
 
 
 class CgmElement(BinaryModelObject):
-  def __init__(self, command_header, params):
+  def __init__(self, command_header, params, params_sz=None):
     self.cache_fields = []
     self.command_header = command_header
     self.params = params
-    self.chunk = command_header + params
     self.element_class, self.element_id, self.params_sz = parse_header(
       self.command_header
     )
+    # Header of partitioned element keeps the first partition size only
+    if params_sz is not None:
+      self.params_sz = params_sz
     self.is_padding = self.params_sz < len(self.params)
 
+  @property
+  def chunk(self):
+    if cgm_utils.is_partitioned(self.command_header):
+      params = bytes(self.params[: self.params_sz])
+      return bytes(cgm_utils.pack_element(bytearray(), self.element_id, params))
+    # params may be a memoryview of loaded file content
+    return self.command_header + bytes(self.params)
+
   def resolve(self, name=""):
     icon = ICONS.get(self.element_id, True)
     if isinstance(icon, bool):
@@ -75,30 +87,26 @@ class CgmElement(BinaryModelObject):
     return icon, title, 0
 
   def update_for_sword(self):
-    self.cache_fields = cgm_utils.get_markup(self.command_header, self.params)
+    self.cache_fields = cgm_utils.get_markup(self.command_header, bytes(self.params))
+
+
+# Lightweight element of streaming translation (see cgm_filters.iter_records)
+CgmRecord = collections.namedtuple("CgmRecord", ("element_id", "params", "params_sz"))
 
 
 class CgmDefReplacement(CgmElement):
   cgm_folder_name = ""
 
-  def __init__(self, command_header, params):
-    CgmElement.__init__(self, command_header, params)
+  def __init__(self, command_header, params, params_sz=None):
+    CgmElement.__init__(self, command_header, params, params_sz)
     self.childs = []
-    self.params = ""
-    self.chunk = command_header
+    self.params = b""
     self.cgm_folder_name = cgm_const.CGM_ID[self.element_id]
-    self.parse_childs(params)
+    self.parse_childs(params[: self.params_sz])
 
   def parse_childs(self, chunk):
-    while chunk:
-      header, chunk = chunk[:2], chunk[2:]
-      cls, eid, sz = parse_header(header)
-      if sz == 0x1F:
-        header += chunk[:2]
-        chunk = chunk[2:]
-        sz = parse_header(header)[2]
-      params, chunk = chunk[:sz], chunk[sz:]
-      self.add(CgmElement(header, params))
+    for _element_id, size, header, params in cgm_utils.iter_elements(chunk):
+      self.add(CgmElement(bytes(header), params, size))
 
   def resolve(self, name=""):
     sz = "%d" % len(self.childs)
@@ -112,9 +120,9 @@ ID_TO_CLS = {
 
 def padding(params):
   sz = len(params)
-  return params + "\x00" if sz > (sz // 2) * 2 else params
+  return bytes(params) + b"\x00" if sz > (sz // 2) * 2 else params
 
 
-def element_factory(header, params):
+def element_factory(header, params, params_sz=None):
   element_id = parse_header(header)[1]
-  return ID_TO_CLS.get(element_id, CgmElement)(header, padding(params))
+  return ID_TO_CLS.get(element_id, CgmElement)(header, padding(params), params_sz)
@@ -16,6 +16,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
+import time
 
 from qc3 import qc3const
 from qc3.formats.generic import BinaryModelPresenter
@@ -44,8 +45,43 @@ class CGM_Presenter(BinaryModelPresenter):
   def new(self):
     self.model = cgm_model.get_empty_cgm()
 
-  def translate_from_sk2(self, sk2_doc):
-    cgm_from_sk2.SK2_to_CGM_Translator().translate(sk2_doc, self)
+  def translate_from_sk2(self, sk2_doc, raw=False, **kw):
+    """
+    :param raw: (bool) keep encoded metafile without building CGM model,
+                translated document can be saved only
+    :param kw: (dict) translator options
+    """
+    start = time.monotonic()
+    cgm_from_sk2.SK2_to_CGM_Translator(**kw).translate(sk2_doc, self, raw)
+    self.send_timing("from_sk2", start)
 
   def translate_to_sk2(self, sk2_doc):
+    start = time.monotonic()
     cgm_to_sk2.CGM_to_SK2_Translator().translate(self, sk2_doc)
+    self.send_timing("to_sk2", start)
+
+  def stream_to_sk2(self, sk2_doc, filename=None, fileptr=None, pages=None, **kw):
+    """Translates CGM file into SK2 document element by element
+    without building CGM model.
+
+    :param pages: (tuple|None) first and last pictures (1-based) to translate
+    :param kw: (dict) translator options
+    """
+    start = time.monotonic()
+    self.parsing_msg(0.03)
+    records = cgm_filters.read_records(filename, fileptr, pages)
+    cgm_to_sk2.CGM_to_SK2_Translator(**kw).translate_records(records, sk2_doc)
+    self.send_timing("to_sk2", start)
+
+  def split_to_sk2(self, sk2_doc, filename, cnf, pages=None, workers=2, **kw):
+    """Translates pictures of CGM file into SK2 document in parallel
+
+    :param cnf: (dict) SK2 document config values
+    :param workers: (int) number of pool processes
+    :param kw: (dict) translator options
+    """
+    start = time.monotonic()
+    self.parsing_msg(0.03)
+    translator = cgm_to_sk2.CGM_to_SK2_Translator(**kw)
+    translator.translate_split(self.appdata, filename, sk2_doc, cnf, pages, workers)
+    self.send_timing("to_sk2", start)
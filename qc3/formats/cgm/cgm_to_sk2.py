@@ -16,20 +16,87 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import copy
+import functools
 import logging
-import struct
 
-from qc3 import _, utils, sk2const, libgeom, qc3const, libpango
-from qc3.formats.cgm import cgm_const, cgm_utils
+from qc3 import _, utils, sk2const, libgeom, qc3const
+from qc3.formats.cgm import cgm_const, cgm_filters, cgm_utils
+from qc3.formats.generic_filters import map_fileptr
 from qc3.formats.sk2 import sk2_model
+from qc3.utils.workers import get_executor, get_worker_appdata
 
 LOG = logging.getLogger(__name__)
 
 
+# Per mode CGM state keys of stroke style:
+# (width, widthmode, color, dashtable, type)
+STROKE_KEYS = {
+  mode: tuple(
+    "%s.%s" % (mode, key) for key in ("width", "widthmode", "color", "dashtable", "type")
+  )
+  for mode in ("line", "edge")
+}
+
+
 def sign(num):
   return num / abs(num)
 
 
+def circle_bbox(center, r):
+  x, y = center
+  r = abs(r)
+  return [x - r, y - r, x + r, y + r]
+
+
+def arc_bbox(p1, p2, p3):
+  """Returns bbox of full circle passing through 3 points,
+  or bbox of points for degenerated arc
+  """
+  center = libgeom.circle_center_by_3points(p1, p2, p3)
+  if not center:
+    return libgeom.bbox_for_points([p1, p2, p3])
+  return circle_bbox(center, libgeom.distance(center, p1))
+
+
+def iter_model(model):
+  """Yields CGM model elements in file order (depth first)"""
+  stack = list(reversed(model.childs))
+  while stack:
+    element = stack.pop()
+    yield element
+    stack.extend(reversed(element.childs))
+
+
+def _translate_picture(path, cgm_defaults, fontmap, cnf, options, span):
+  """Process pool job: translates single picture of CGM file
+  and returns SK2 page detached from its document.
+
+  :param options: (dict) translator keyword arguments
+  :return: (tuple) SK2 page and number of culled primitives
+  """
+  from qc3.formats.sk2.sk2_presenter import SK2_Presenter
+
+  sk2_doc = SK2_Presenter(get_worker_appdata(), cnf)
+  translator = CGM_to_SK2_Translator(**options)
+  translator.begin(sk2_doc)
+  translator.cgm = translator.cgm_defaults = cgm_defaults
+  translator.fontmap = fontmap
+  with open(path, "rb") as fileptr:
+    data = map_fileptr(fileptr)
+  translator.process_elements(cgm_filters.iter_records(data, *span))
+  translator.end(update=False)
+  page = sk2_doc.methods.get_pages().pop()
+  sk2_doc.close()
+  # Document config is not sent back, it is restored on model update
+  page.parent = None
+  stack = [page]
+  while stack:
+    obj = stack.pop()
+    obj.config = None
+    stack.extend(obj.childs)
+  return page, translator.culled
+
+
 class CGM_to_SK2_Translator(object):
   sk2_doc = None
   sk2_model = None
@@ -41,20 +108,118 @@ class CGM_to_SK2_Translator(object):
   trafo = None
   scale = None
   fontmap = None
+  handlers = None
+  styles = None
+  merge = False
+  cull = False
+  culled = 0
+  clip_bbox = None
+
+  def __init__(self, merge=False, cull=False):
+    """
+    :param merge: (bool) merge runs of stroke-only primitives
+                  with the same style into multi-path curves
+    :param cull: (bool) skip primitives which are completely
+                 outside of clip rectangle
+    """
+    self.handlers = self.get_handlers()
+    self.styles = {}
+    self.merge = merge
+    self.cull = cull
+
+  def get_handlers(self):
+    """Returns element_id -> bound handler method table,
+    e.g. POLYLINE -> self._polyline
+    """
+    handlers = {}
+    for element_id, name in cgm_const.CGM_ID.items():
+      mtd = getattr(self, "_" + name.replace(" ", "_").lower(), None)
+      if mtd is not None:
+        handlers[element_id] = mtd
+    return handlers
 
   def translate(self, cgm_doc, sk2_doc):
+    self.translate_records(iter_model(cgm_doc.model), sk2_doc)
+
+  def translate_records(self, elements, sk2_doc, update=True):
+    """Translates CGM elements in file order. Elements may be
+    model objects or CgmRecord tuples of streaming translation.
+
+    :param update: (bool) update SK2 model after translation
+    """
+    self.begin(sk2_doc)
+    self.process_elements(elements)
+    self.report_culled()
+    self.end(update)
+
+  def translate_split(self, appdata, path, sk2_doc, cnf, pages=None, workers=2):
+    """Translates pictures of CGM file in process pool. Metafile
+    descriptor is translated here and its defaults seed every job,
+    translated pages are merged in original order.
+
+    :param cnf: (dict) SK2 document config values for pool jobs
+    :param pages: (tuple|None) first and last pictures (1-based)
+    :param workers: (int) number of pool processes
+    """
+    with open(path, "rb") as fileptr:
+      data = map_fileptr(fileptr)
+    descriptor_end, pictures = cgm_utils.scan_pictures(data)
+    if pages:
+      pictures = cgm_filters.select_pictures(pictures, pages)
+    if len(pictures) < 2:
+      self.translate_records(cgm_filters.read_records(path, pages=pages), sk2_doc)
+      return
+
+    self.begin(sk2_doc)
+    self.process_elements(cgm_filters.iter_records(data, 0, descriptor_end))
+    if self.cgm_defaults is None:
+      raise Exception("BEGIN METAFILE element is not found")
+    options = {"merge": self.merge, "cull": self.cull}
+    job = functools.partial(
+      _translate_picture, path, self.cgm_defaults, self.fontmap, cnf, options
+    )
+    with get_executor(appdata, min(workers, len(pictures))) as executor:
+      for page, culled in executor.map(job, pictures):
+        self.add_page(page)
+        self.culled += culled
+    self.report_culled()
+    self.end()
+
+  def begin(self, sk2_doc):
     self.sk2_doc = sk2_doc
     self.sk2_model = sk2_doc.model
     self.sk2_mtds = sk2_doc.methods
     self.sk2_mtds.delete_pages()
     self.fontmap = []
-
-    for element in cgm_doc.model.childs:
-      if element.element_id == cgm_const.END_METAFILE:
+    self.culled = 0
+
+  def process_elements(self, elements):
+    get_handler = self.handlers.get
+    end_metafile = cgm_const.END_METAFILE
+    for element in elements:
+      element_id = element.element_id
+      if element_id == end_metafile:
         break
-      self.process_element(element)
-
-    self.sk2_model.do_update()
+      handler = get_handler(element_id)
+      if handler is not None:
+        handler(element)
+
+  def add_page(self, page):
+    """Appends page translated in other process"""
+    pages = self.sk2_mtds.get_pages_obj()
+    page.parent = pages
+    pages.childs.append(page)
+    pages.page_counter += 1
+    page.name = _("Page") + " %i" % pages.page_counter
+
+  def report_culled(self):
+    if self.culled:
+      msg = "%i primitive(s) outside of clip rectangle are skipped"
+      self.sk2_doc.send_info(msg, self.culled)
+
+  def end(self, update=True):
+    if update:
+      self.sk2_model.do_update()
     self.sk2_doc = None
     self.sk2_model = None
     self.sk2_mtds = None
@@ -63,74 +228,73 @@ class CGM_to_SK2_Translator(object):
     self.cgm = None
     self.cgm_defaults = None
     self.fontmap = None
+    self.styles = {}
+    self.clip_bbox = None
 
   def process_element(self, element):
-    signature = cgm_const.CGM_ID.get(element.element_id, "").replace(" ", "_").lower()
-    if signature:
-      mtd = getattr(self, "_" + signature, None)
-      if mtd:
-        mtd(element)
-    for child in element.childs:
-      self.process_element(child)
+    handler = self.handlers.get(element.element_id)
+    if handler is not None:
+      handler(element)
 
   # READER ------>
-  def read_fmt(self, fmt, chunk):
-    sz = struct.calcsize(fmt)
-    return struct.unpack(fmt, chunk[:sz]), chunk[sz:]
+  # Readers take element parameters (bytes or memoryview) and offset,
+  # and return read value and offset of the next field.
+
+  def read_fmt(self, fmt, chunk, pos=0):
+    fmt = cgm_utils.get_struct(fmt)
+    return fmt.unpack_from(chunk, pos), pos + fmt.size
 
-  def read_int(self, chunk):
+  def read_int(self, chunk, pos=0):
     fmt, fn = cgm_utils.INT_F[self.cgm["intprec"]]
-    return fn(fmt, chunk)
+    return fn(fmt, chunk, pos)
 
-  def read_index(self, chunk):
+  def read_index(self, chunk, pos=0):
     fmt, fn = cgm_utils.INT_F[self.cgm["inxprec"]]
-    return fn(fmt, chunk)
+    return fn(fmt, chunk, pos)
 
-  def read_str(self, chunk):
-    if not chunk:
-      return "", chunk
-    sz = utils.byte2py_int(chunk[0])
-    title = chunk[1 : 1 + sz]
-    return title, chunk[1 + sz :]
+  def read_str(self, chunk, pos=0):
+    if pos >= len(chunk):
+      return "", pos
+    sz = chunk[pos]
+    pos += 1
+    title = bytes(chunk[pos : pos + sz]).decode(cgm_utils.TEXT_ENCODING)
+    return title, pos + sz
 
-  def read_real(self, chunk, precision=None):
+  def read_real(self, chunk, pos=0, precision=None):
     precision = self.cgm["realprec"] if precision is None else precision
     fmt, fn = cgm_utils.REAL_F[precision]
-    return fn(fmt, chunk)
+    return fn(fmt, chunk, pos)
 
-  def read_enum(self, chunk):
-    return cgm_utils._unpack(">h", chunk)
+  def read_enum(self, chunk, pos=0):
+    fmt, fn = cgm_utils.ENUM_F
+    return fn(fmt, chunk, pos)
 
-  def read_vdc(self, chunk):
+  def read_vdc(self, chunk, pos=0):
     fmt, fn = cgm_utils.VDC_F[self.cgm["vdc.type"]][self.cgm["vdc.prec"]]
-    return fn(fmt, chunk)
+    return fn(fmt, chunk, pos)
 
-  def read_point(self, chunk):
-    x, chunk = self.read_vdc(chunk)
-    y, chunk = self.read_vdc(chunk)
-    return [x, y], chunk
+  def read_point(self, chunk, pos=0):
+    x, pos = self.read_vdc(chunk, pos)
+    y, pos = self.read_vdc(chunk, pos)
+    return [x, y], pos
 
-  def read_points(self, chunk):
-    sz = 2 * self.cgm["vdc.size"]
-    points = []
-    while len(chunk) >= sz:
-      point, chunk = self.read_point(chunk)
-      points.append(point)
-    return points
+  def read_points(self, chunk, pos=0):
+    vdc_type, vdc_prec = self.cgm["vdc.type"], self.cgm["vdc.prec"]
+    return cgm_utils.unpack_points(chunk, vdc_type, vdc_prec, pos)
 
   def read_path(self, chunk):
     points = self.read_points(chunk)
     return [points[0], points[1:], sk2const.CURVE_OPENED]
 
-  def read_color(self, chunk, color_mode=None):
+  def read_color(self, chunk, pos=0, color_mode=None):
     if self.cgm["color.mode"] == 1 or color_mode == 1:
-      color, chunk = self.read_fmt(self.cgm["color.absstruct"], chunk)
+      color, pos = self.read_fmt(self.cgm["color.absstruct"], chunk, pos)
       color = [x - y for x, y in zip(color, self.cgm["color.offset"])]
       color = [x / y for x, y in zip(color, self.cgm["color.scale"])]
     else:
-      (indx,), chunk = self.read_fmt(self.cgm["color.inxstruct"], chunk)
+      (indx,), pos = self.read_fmt(self.cgm["color.inxstruct"], chunk, pos)
       color = self.cgm["color.table"][indx % self.cgm["color.maxindex"]]
-    return color, chunk
+    return color, pos
 
   # READER END =====
 
@@ -141,13 +305,14 @@ class CGM_to_SK2_Translator(object):
     return []
 
   def get_stroke_style(self, mode="line"):
-    if not self.cgm["%s.width" % mode]:
+    width_key, widthmode_key, color_key, dashtable_key, type_key = STROKE_KEYS[mode]
+    width = self.cgm[width_key]
+    if not width:
       return []
-    width = self.cgm["%s.width" % mode]
-    if self.cgm["%s.widthmode" % mode] == 0:
+    if self.cgm[widthmode_key] == 0:
       width *= self.scale
-    color = [qc3const.COLOR_RGB, list(self.cgm["%s.color" % mode]), 1.0, ""]
-    dash = self.cgm["%s.dashtable" % mode][self.cgm["%s.type" % mode] - 1]
+    color = [qc3const.COLOR_RGB, list(self.cgm[color_key]), 1.0, ""]
+    dash = self.cgm[dashtable_key][self.cgm[type_key] - 1]
     cap = sk2const.CAP_BUTT
     join = sk2const.JOIN_MITER
     miter_limit = 10.433
@@ -168,6 +333,8 @@ class CGM_to_SK2_Translator(object):
     ]
 
   def get_text_style(self):
+    from qc3 import libpango
+
     cgm_font = self.fontmap[self.cgm["text.fontindex"] - 1]
     family, face = libpango.find_font_and_face(cgm_font)
     size = self.cgm["text.height"] * self.scale
@@ -176,7 +343,27 @@ class CGM_to_SK2_Translator(object):
     cluster_flag = True
     return [family, face, size, alignment, spacing, cluster_flag]
 
+  def set_attr(self, key, value):
+    """Changes CGM state attribute and drops cached styles
+
+    :param key: (str) CGM state key, e.g. 'line.width'
+    :param value: attribute value
+    """
+    self.cgm[key] = value
+    self.styles = {}
+
   def get_style(self, fill=False, stroke=False, text=False):
+    """Returns style of primitive for current CGM state.
+    Style is built once after attribute change and is shared
+    by all following primitives, so it should not be changed in place.
+    """
+    kind = "stroke" if stroke else "text" if text else "fill" if fill else ""
+    style = self.styles.get(kind)
+    if style is None:
+      style = self.styles[kind] = self.make_style(fill, stroke, text)
+    return style
+
+  def make_style(self, fill=False, stroke=False, text=False):
     if stroke:
       return [[], self.get_stroke_style(), [], []]
 
@@ -220,9 +407,79 @@ class CGM_to_SK2_Translator(object):
     ]
     scale = [sign(width) * sc, 0.0, 0.0, sign(height) * sc, 0.0, 0.0]
     self.trafo = libgeom.multiply_trafo(tr, scale)
+    self.styles = {}
 
   def get_trafo(self):
-    return copy.deepcopy(self.trafo)
+    """Returns page transformation shared by all primitives.
+    SK2 objects replace their trafo on transformation,
+    so the list is never changed in place. set_trafo() assigns
+    new list as well, and add_curve() relies on it: curves are
+    merged only if their trafo is the current list (identity check).
+    """
+    return self.trafo
+
+  def set_clip(self):
+    """Updates clip bbox (in VDC) which is used for culling"""
+    self.clip_bbox = None
+    if self.cull and self.cgm["clip.mode"]:
+      (x0, y0), (x1, y1) = self.cgm["clip.rect"] or self.cgm["vdc.extend"]
+      self.clip_bbox = libgeom.normalize_bbox([x0, y0, x1, y1])
+
+  def is_culled(self, bbox):
+    """Checks that primitive is completely outside of clip rectangle.
+    Culled primitives are counted. Clipping is checked against primitive
+    locus, i.e. line width is not taken into account.
+
+    :param bbox: (list) primitive bbox in VDC
+    """
+    if self.clip_bbox is None or libgeom.is_bbox_overlap(bbox, self.clip_bbox):
+      return False
+    self.culled += 1
+    return True
+
+  def get_text_bbox(self, point, txt):
+    """Returns conservative text bbox (in VDC) for culling: square
+    around anchor point which covers text of any orientation and
+    alignment, glyph advance is assumed not to exceed character
+    height (scaled by expansion factor). If character height is not
+    set, text is culled by its anchor point only.
+
+    :param point: (list) text anchor point in VDC
+    :param txt: (str) text string
+    """
+    height = self.cgm["text.height"]
+    if not height:
+      return point + point
+    expansion = max(1.0, abs(self.cgm["text.expansion"]))
+    return circle_bbox(point, height * expansion * (len(txt) + 1))
+
+  def add_curve(self, paths, style):
+    """Appends curve to current layer. If merging is enabled,
+    stroke-only paths are appended to previous curve with the same
+    style and trafo, subpaths are stroked independently, so the result
+    is the same. Filled paths are never merged: fill rule and painting
+    order of overlapped fills and edges would be changed.
+    """
+    if self.clip_bbox is not None:
+      points = [path[0] for path in paths]
+      for path in paths:
+        points.extend(path[1])
+      if self.is_culled(libgeom.bbox_for_points(points)):
+        return
+    childs = self.layer.childs
+    if self.merge and not style[0] and childs:
+      last = childs[-1]
+      if (
+        last.cid == sk2_model.CURVE
+        and last.style is style
+        and last.trafo is self.trafo
+      ):
+        last.paths.extend(paths)
+        return
+    curve = sk2_model.Curve(
+      self.layer.config, self.layer, paths, self.get_trafo(), style
+    )
+    childs.append(curve)
 
   def set_page(self, extend):
     left, bottom = extend[0]
@@ -253,6 +510,7 @@ class CGM_to_SK2_Translator(object):
   # 0x0060
   def _begin_picture(self, element):
     self.cgm = copy.deepcopy(self.cgm_defaults)
+    self.styles = {}
 
     if self.cgm["vdc.extend"] is None:
       if self.cgm["vdc.type"] == 0:
@@ -276,9 +534,6 @@ class CGM_to_SK2_Translator(object):
     width = vdc[1][0] - vdc[0][0]
     maxsz = max(abs(height), abs(width))
 
-    if self.cgm["clip.rect"] is None:
-      self.cgm["clip.rect"] = vdc
-
     if self.cgm["marker.size"] is None:
       if self.cgm["marker.sizemode"] == 0:
         self.cgm["marker.size"] = maxsz / 100.0
@@ -307,6 +562,7 @@ class CGM_to_SK2_Translator(object):
   def _begin_picture_body(self, _element):
     self.set_trafo(self.cgm["vdc.extend"])
     self.set_page(self.cgm["vdc.extend"])
+    self.set_clip()
 
   # 0x1040
   def _metafile_description(self, element):
@@ -331,14 +587,15 @@ class CGM_to_SK2_Translator(object):
     bits = self.read_int(element.params)[0]
     if bits not in (8, 16, 24, 32):
       raise Exception("Unsupported %d-bit integer precision" % bits)
-    self.cgm["intsize"] = bits / 8
+    self.cgm["intsize"] = bits // 8
     self.cgm["intprec"] = self.cgm["intsize"] - 1
 
   # 0x10a0
   def _real_precision(self, element):
-    real_type, chunk = self.read_enum(element.params)
-    p0, chunk = self.read_int(chunk)
-    p1, chunk = self.read_int(chunk)
+    chunk = element.params
+    real_type, pos = self.read_enum(chunk)
+    p0, pos = self.read_int(chunk, pos)
+    p1, pos = self.read_int(chunk, pos)
     prec = (p0, p1)
     prec_type = cgm_const.REAL_PRECISION_MAP.get(prec)
     if prec_type is None:
@@ -350,7 +607,7 @@ class CGM_to_SK2_Translator(object):
     bits = self.read_int(element.params)[0]
     if bits not in (8, 16, 24, 32):
       raise Exception("Unsupported %d-bit index precision" % bits)
-    self.cgm["inxsize"] = bits / 8
+    self.cgm["inxsize"] = bits // 8
     self.cgm["inxprec"] = self.cgm["inxsize"] - 1
 
   # 0x10e0
@@ -378,8 +635,8 @@ class CGM_to_SK2_Translator(object):
   # 0x1140
   def _colour_value_extent(self, element):
     chunk = element.params
-    bottom, chunk = self.read_fmt(self.cgm["color.absstruct"], chunk)
-    top, chunk = self.read_fmt(self.cgm["color.absstruct"], chunk)
+    bottom, pos = self.read_fmt(self.cgm["color.absstruct"], chunk)
+    top, pos = self.read_fmt(self.cgm["color.absstruct"], chunk, pos)
     self.cgm["color.offset"] = tuple(l * r for l, r in zip(bottom, (1.0, 1.0, 1.0)))
     self.cgm["color.scale"] = tuple(
       l - r for l, r in zip(top, self.cgm["color.offset"])
@@ -388,17 +645,18 @@ class CGM_to_SK2_Translator(object):
   # 0x11a0
   def _font_list(self, element):
     chunk = element.params[: element.params_sz]
-    while chunk:
-      font, chunk = self.read_str(chunk)
+    pos = 0
+    while pos < len(chunk):
+      font, pos = self.read_str(chunk, pos)
       self.fontmap.append(font.strip())
 
   # Structural elements
   # 0x2020
   def _scaling_mode(self, element):
     chunk = element.params
-    self.cgm["scale.mode"], chunk = self.read_enum(chunk)
+    self.cgm["scale.mode"], pos = self.read_enum(chunk)
     precision = None if self.cgm["realprec"] in (2, 3) else 2
-    self.cgm["scale.metric"], chunk = self.read_real(chunk, precision)
+    self.cgm["scale.metric"] = self.read_real(chunk, pos, precision)[0]
     if self.cgm["scale.mode"] == 1 and self.cgm["scale.metric"] == 0:
       self.cgm["scale.mode"] = 0
 
@@ -408,7 +666,7 @@ class CGM_to_SK2_Translator(object):
 
   # 0x2060
   def _line_width_specification_mode(self, element):
-    self.cgm["line.widthmode"] = self.read_enum(element.params)[0]
+    self.set_attr("line.widthmode", self.read_enum(element.params)[0])
 
   # 0x2080
   def _marker_size_specification_mode(self, element):
@@ -416,13 +674,13 @@ class CGM_to_SK2_Translator(object):
 
   # 0x20a0
   def _edge_width_specification_mode(self, element):
-    self.cgm["edge.widthmode"] = self.read_enum(element.params)[0]
+    self.set_attr("edge.widthmode", self.read_enum(element.params)[0])
 
   # 0x20c0
   def _vdc_extent(self, element):
     chunk = element.params
-    ll, chunk = self.read_point(chunk)
-    ur, chunk = self.read_point(chunk)
+    ll, pos = self.read_point(chunk)
+    ur, pos = self.read_point(chunk, pos)
     self.cgm["vdc.extend"] = (ll, ur)
 
   # 0x20e0
@@ -433,7 +691,7 @@ class CGM_to_SK2_Translator(object):
   def _vdc_integer_precision(self, element):
     bit_depth = self.read_int(element.params)[0]
     if bit_depth in (8, 16, 24, 32):
-      self.cgm["vdc.intsize"] = bit_depth / 8
+      self.cgm["vdc.intsize"] = bit_depth // 8
       self.cgm["vdc.intprec"] = self.cgm["vdc.intsize"] - 1
       if self.cgm["vdc.type"] == 0:
         self.cgm["vdc.size"] = self.cgm["vdc.intsize"]
@@ -444,9 +702,9 @@ class CGM_to_SK2_Translator(object):
   # 0x3040
   def _vdc_real_precision(self, element):
     chunk = element.params
-    prec_type, chunk = self.read_enum(chunk)
-    x, chunk = self.read_int(chunk)
-    y, chunk = self.read_int(chunk)
+    prec_type, pos = self.read_enum(chunk)
+    x, pos = self.read_int(chunk, pos)
+    y, pos = self.read_int(chunk, pos)
     precision = (x, y)
     if prec_type == 1:
       if precision == (16, 16):
@@ -470,57 +728,41 @@ class CGM_to_SK2_Translator(object):
   # 0x30a0
   def _clip_rectangle(self, element):
     chunk = element.params
-    p0, chunk = self.read_point(chunk)
-    p1, chunk = self.read_point(chunk)
+    p0, pos = self.read_point(chunk)
+    p1, pos = self.read_point(chunk, pos)
     self.cgm["clip.rect"] = (p0, p1)
+    self.set_clip()
+
+  # 0x30c0
+  def _clip_indicator(self, element):
+    self.cgm["clip.mode"] = self.read_enum(element.params)[0]
+    self.set_clip()
 
   # ### Line related
   # 0x4020
   def _polyline(self, element):
-    curve = sk2_model.Curve(
-      self.layer.config,
-      self.layer,
-      [
-        self.read_path(element.params),
-      ],
-      self.get_trafo(),
-      self.get_style(stroke=True),
-    )
-    self.layer.childs.append(curve)
+    paths = [
+      self.read_path(element.params),
+    ]
+    self.add_curve(paths, self.get_style(stroke=True))
 
   # 0x4040
   def _disjoint_polyline(self, element):
     points = self.read_points(element.params)
-    first_point = None
-    paths = []
-    for point in points:
-      if first_point:
-        paths.append(
-          [
-            first_point,
-            [
-              point,
-            ],
-            sk2const.CURVE_OPENED,
-          ]
-        )
-        first_point = None
-      else:
-        first_point = point
-    curve = sk2_model.Curve(
-      self.layer.config,
-      self.layer,
-      paths,
-      self.get_trafo(),
-      self.get_style(stroke=True),
-    )
-    self.layer.childs.append(curve)
+    paths = [
+      [start, [end], sk2const.CURVE_OPENED]
+      for start, end in zip(points[::2], points[1::2])
+    ]
+    self.add_curve(paths, self.get_style(stroke=True))
 
   # 0x4080
   def _text(self, element):
-    (x, y), chunk = self.read_point(element.params)
-    flg, chunk = self.read_enum(chunk)
-    txt, chunk = self.read_str(chunk)
+    chunk = element.params
+    (x, y), pos = self.read_point(chunk)
+    flg, pos = self.read_enum(chunk, pos)
+    txt, pos = self.read_str(chunk, pos)
+    if self.clip_bbox is not None and self.is_culled(self.get_text_bbox([x, y], txt)):
+      return
     p0 = libgeom.apply_trafo_to_point([x, y], self.get_trafo())
 
     py, px = self.cgm["text.orientation"]
@@ -539,25 +781,19 @@ class CGM_to_SK2_Translator(object):
     if path[0] != path[1][-1]:
       path[1].append([] + path[0])
     path[2] = sk2const.CURVE_CLOSED
-    curve = sk2_model.Curve(
-      self.layer.config,
-      self.layer,
-      [
-        path,
-      ],
-      self.get_trafo(),
-      self.get_style(fill=True),
-    )
-    self.layer.childs.append(curve)
+    paths = [
+      path,
+    ]
+    self.add_curve(paths, self.get_style(fill=True))
 
   # 0x4100
   def _polygon_set(self, element):
     paths = []
     path = [None, [], sk2const.CURVE_CLOSED]
-    chunk = element.params
-    for _i in range(len(chunk) / (2 * self.cgm["vdc.size"] + 2)):
-      point, chunk = self.read_point(chunk)
-      flag, chunk = self.read_enum(chunk)
+    points, flags = cgm_utils.unpack_flagged_points(
+      element.params, self.cgm["vdc.type"], self.cgm["vdc.prec"]
+    )
+    for point, flag in zip(points, flags):
       if not path[0]:
         path[0] = point
       else:
@@ -573,19 +809,15 @@ class CGM_to_SK2_Translator(object):
         path[1].append([] + path[0])
       paths.append(path)
     if paths:
-      curve = sk2_model.Curve(
-        self.layer.config,
-        self.layer,
-        paths,
-        self.get_trafo(),
-        self.get_style(fill=True),
-      )
-      self.layer.childs.append(curve)
+      self.add_curve(paths, self.get_style(fill=True))
 
   # 0x4160
   def _rectangle(self, element):
-    ll, chunk = self.read_point(element.params)
-    ur, chunk = self.read_point(chunk)
+    chunk = element.params
+    ll, pos = self.read_point(chunk)
+    ur, pos = self.read_point(chunk, pos)
+    if self.clip_bbox is not None and self.is_culled(libgeom.normalize_bbox(ll + ur)):
+      return
     w, h = ur[0] - ll[0], ur[1] - ll[1]
     rect = sk2_model.Rectangle(
       self.layer.config,
@@ -598,8 +830,12 @@ class CGM_to_SK2_Translator(object):
 
   # 0x4180
   def _circle(self, element):
-    center, chunk = self.read_point(element.params)
-    r = self.read_vdc(chunk)[0] * self.scale
+    chunk = element.params
+    center, pos = self.read_point(chunk)
+    r, pos = self.read_vdc(chunk, pos)
+    if self.clip_bbox is not None and self.is_culled(circle_bbox(center, r)):
+      return
+    r *= self.scale
     x, y = libgeom.apply_trafo_to_point(center, self.get_trafo())
     rect = [x - r, y - r, 2 * r, 2 * r]
     circle = sk2_model.Circle(
@@ -609,9 +845,12 @@ class CGM_to_SK2_Translator(object):
 
   # 0x41a0
   def _circular_arc_3_point(self, element):
-    p1, chunk = self.read_point(element.params)
-    p2, chunk = self.read_point(chunk)
-    p3, chunk = self.read_point(chunk)
+    chunk = element.params
+    p1, pos = self.read_point(chunk)
+    p2, pos = self.read_point(chunk, pos)
+    p3, pos = self.read_point(chunk, pos)
+    if self.clip_bbox is not None and self.is_culled(arc_bbox(p1, p2, p3)):
+      return
     p1, p2, p3 = libgeom.apply_trafo_to_points([p1, p2, p3], self.get_trafo())
     center = libgeom.circle_center_by_3points(p1, p2, p3)
     if not center:
@@ -634,10 +873,13 @@ class CGM_to_SK2_Translator(object):
 
   # 0x41c0
   def _circular_arc_3_point_close(self, element):
-    p1, chunk = self.read_point(element.params)
-    p2, chunk = self.read_point(chunk)
-    p3, chunk = self.read_point(chunk)
-    flag = self.read_enum(chunk)[0]
+    chunk = element.params
+    p1, pos = self.read_point(chunk)
+    p2, pos = self.read_point(chunk, pos)
+    p3, pos = self.read_point(chunk, pos)
+    flag = self.read_enum(chunk, pos)[0]
+    if self.clip_bbox is not None and self.is_culled(arc_bbox(p1, p2, p3)):
+      return
     p1, p2, p3 = libgeom.apply_trafo_to_points([p1, p2, p3], self.get_trafo())
     center = libgeom.circle_center_by_3points(p1, p2, p3)
     if not center:
@@ -663,11 +905,15 @@ class CGM_to_SK2_Translator(object):
 
   # 0x41e0
   def _circular_arc_centre(self, element):
-    center, chunk = self.read_point(element.params)
-    p1, chunk = self.read_point(chunk)
-    p2, chunk = self.read_point(chunk)
+    chunk = element.params
+    center, pos = self.read_point(chunk)
+    p1, pos = self.read_point(chunk, pos)
+    p2, pos = self.read_point(chunk, pos)
+    r = self.read_vdc(chunk, pos)[0]
+    if self.clip_bbox is not None and self.is_culled(circle_bbox(center, r)):
+      return
     center, p1, p2 = libgeom.apply_trafo_to_points([center, p1, p2], self.get_trafo())
-    r = self.read_vdc(chunk)[0] * self.scale
+    r *= self.scale
     angle1 = libgeom.get_point_angle(p1, center)
     angle2 = libgeom.get_point_angle(p2, center)
     x, y = center
@@ -685,12 +931,16 @@ class CGM_to_SK2_Translator(object):
 
   # 0x4200
   def _circular_arc_centre_close(self, element):
-    center, chunk = self.read_point(element.params)
-    p1, chunk = self.read_point(chunk)
-    p2, chunk = self.read_point(chunk)
-    flag = self.read_enum(chunk)[0]
+    chunk = element.params
+    center, pos = self.read_point(chunk)
+    p1, pos = self.read_point(chunk, pos)
+    p2, pos = self.read_point(chunk, pos)
+    flag, pos = self.read_enum(chunk, pos)
+    r = self.read_vdc(chunk, pos)[0]
+    if self.clip_bbox is not None and self.is_culled(circle_bbox(center, r)):
+      return
     center, p1, p2 = libgeom.apply_trafo_to_points([center, p1, p2], self.get_trafo())
-    r = self.read_vdc(chunk)[0] * self.scale
+    r *= self.scale
     angle1 = libgeom.get_point_angle(p1, center)
     angle2 = libgeom.get_point_angle(p2, center)
     x, y = center
@@ -711,12 +961,15 @@ class CGM_to_SK2_Translator(object):
 
   # 0x4220
   def _ellipse(self, element):
-    center, chunk = self.read_point(element.params)
-    cdp1, chunk = self.read_point(chunk)
-    cdp2, chunk = self.read_point(chunk)
+    chunk = element.params
+    center, pos = self.read_point(chunk)
+    cdp1, pos = self.read_point(chunk, pos)
+    cdp2, pos = self.read_point(chunk, pos)
     cdp3 = libgeom.contra_point(cdp1, center)
     cdp4 = libgeom.contra_point(cdp2, center)
     bbox = libgeom.sum_bbox(cdp1 + cdp2, cdp3 + cdp4)
+    if self.clip_bbox is not None and self.is_culled(libgeom.normalize_bbox(bbox)):
+      return
     bbox = libgeom.apply_trafo_to_bbox(bbox, self.get_trafo())
     rect = libgeom.bbox_to_rect(bbox)
     circle = sk2_model.Circle(
@@ -734,91 +987,95 @@ class CGM_to_SK2_Translator(object):
 
   # 0x5040
   def _line_type(self, element):
-    self.cgm["line.type"] = self.read_index(element.params)[0]
+    self.set_attr("line.type", self.read_index(element.params)[0])
 
   # 0x5060
   def _line_width(self, element):
     chunk = element.params
-    self.cgm["line.width"] = (
+    self.set_attr(
+      "line.width",
       self.read_vdc(chunk)[0]
       if self.cgm["line.widthmode"] == 0
-      else self.read_real(chunk)[0]
+      else self.read_real(chunk)[0],
     )
 
   # 0x5080
   def _line_colour(self, element):
-    self.cgm["line.color"] = self.read_color(element.params)[0]
+    self.set_attr("line.color", self.read_color(element.params)[0])
 
   # 0x5100
   def _marker_colour(self, element):
-    self.cgm["marker.color"] = self.read_color(element.params)[0]
+    self.set_attr("marker.color", self.read_color(element.params)[0])
 
   # 0x5140
   def _text_font_index(self, element):
-    self.cgm["text.fontindex"] = self.read_index(element.params)[0]
+    self.set_attr("text.fontindex", self.read_index(element.params)[0])
 
   # 0x5180
   def _character_expansion_factor(self, element):
-    self.cgm["text.expansion"] = self.read_real(element.params)[0]
+    self.set_attr("text.expansion", self.read_real(element.params)[0])
 
   # 0x51c0
   def _text_colour(self, element):
-    self.cgm["text.color"] = self.read_color(element.params)[0]
+    self.set_attr("text.color", self.read_color(element.params)[0])
 
   # 0x51e0
   def _character_height(self, element):
-    self.cgm["text.height"] = self.read_vdc(element.params)[0]
+    self.set_attr("text.height", self.read_vdc(element.params)[0])
 
   # 0x5200
   def _character_orientation(self, element):
-    p0, chunk = self.read_point(element.params)
-    p1, chunk = self.read_point(chunk)
-    self.cgm["text.orientation"] = (p0, p1)
+    chunk = element.params
+    p0, pos = self.read_point(chunk)
+    p1, pos = self.read_point(chunk, pos)
+    self.set_attr("text.orientation", (p0, p1))
 
   # 0x5240
   def _text_alignment(self, element):
-    self.cgm["text.alignment"] = self.read_enum(element.params)[0]
+    self.set_attr("text.alignment", self.read_enum(element.params)[0])
 
   # 0x52c0
   def _interior_style(self, element):
-    self.cgm["fill.type"] = self.read_enum(element.params)[0]
+    self.set_attr("fill.type", self.read_enum(element.params)[0])
 
   # 0x52e0
   def _fill_colour(self, element):
-    self.cgm["fill.color"] = self.read_color(element.params)[0]
+    self.set_attr("fill.color", self.read_color(element.params)[0])
 
   # 0x5360
   def _edge_type(self, element):
-    self.cgm["edge.type"] = self.read_index(element.params)[0]
+    self.set_attr("edge.type", self.read_index(element.params)[0])
 
   # 0x5380
   def _edge_width(self, element):
     chunk = element.params
-    self.cgm["edge.width"] = (
+    self.set_attr(
+      "edge.width",
       self.read_vdc(chunk)[0]
       if self.cgm["edge.widthmode"] == 0
-      else self.read_real(chunk)[0]
+      else self.read_real(chunk)[0],
     )
 
   # 0x53a0
   def _edge_colour(self, element):
-    self.cgm["edge.color"] = self.read_color(element.params)[0]
+    self.set_attr("edge.color", self.read_color(element.params)[0])
 
   # 0x53c0
   def _edge_visibility(self, element):
-    self.cgm["edge.visible"] = self.read_enum(element.params)[0]
+    self.set_attr("edge.visible", self.read_enum(element.params)[0])
 
   # 0x5440
   def _colour_table(self, element):
-    pos, chunk = cgm_utils._unpack(self.cgm["color.inxstruct"], element.params)
-    sz = struct.calcsize(self.cgm["color.absstruct"])
-    while len(chunk) >= sz:
-      cgm_color, chunk = self.read_color(chunk, 1)
-      self.cgm["color.table"][pos] = cgm_color
-      pos += 1
+    chunk = element.params
+    (indx,), pos = self.read_fmt(self.cgm["color.inxstruct"], chunk)
+    end = len(chunk) - cgm_utils.get_struct(self.cgm["color.absstruct"]).size
+    while pos <= end:
+      cgm_color, pos = self.read_color(chunk, pos, 1)
+      self.cgm["color.table"][indx] = cgm_color
+      indx += 1
 
   # 0x7040
   def _application_data(self, element):
     if self.sk2_model.metainfo[3]:
       self.sk2_model.metainfo[3] += "\n\n"
-    self.sk2_model.metainfo[3] += self.read_str(element.params[2:])[0]
+    self.sk2_model.metainfo[3] += self.read_str(element.params, 2)[0]
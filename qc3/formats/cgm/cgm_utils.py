@@ -17,49 +17,273 @@
 
 import struct
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
 from qc3 import utils
 from qc3.formats.cgm import cgm_const
 
 
+HEADER = struct.Struct(">H")
+# Long form parameters longer than partition size are split
+# into partitions, all partitions except the last are flagged
+PARTITION_SIZE = 0x7FFE
+PARTITION_FLAG = 0x8000
+# Binary CGM strings use ISO 8859-1 character set by default
+TEXT_ENCODING = "latin-1"
+
+_STRUCTS = {}
+
+
+def get_struct(fmt):
+  """Returns precompiled struct.Struct for provided format"""
+  compiled = _STRUCTS.get(fmt)
+  if compiled is None:
+    compiled = _STRUCTS[fmt] = struct.Struct(fmt)
+  return compiled
+
+
 def parse_header(chunk):
-  header = utils.uint16_be(chunk[:2])
+  header = HEADER.unpack_from(chunk)[0]
   element_class = header >> 12
   element_id = header & 0xFFE0
   size = header & 0x001F
   if len(chunk) == 4:
-    size = utils.uint16_be(chunk[2:]) & 0x7FFF
+    size = HEADER.unpack_from(chunk, 2)[0] & 0x7FFF
   return element_class, element_id, size
 
 
-def _unpack(fmt, chunk):
-  sz = struct.calcsize(fmt)
-  return struct.unpack(fmt, chunk[:sz])[0], chunk[sz:]
+def is_partitioned(header):
+  """Checks long form element header for partition flag"""
+  return len(header) == 4 and bool(HEADER.unpack_from(header, 2)[0] & PARTITION_FLAG)
+
+
+def skip_partitions(data, pos):
+  """Returns offset of element which follows partitioned parameters,
+  pos is offset of the first partition length word
+  """
+  unpack_header = HEADER.unpack_from
+  while True:
+    word = unpack_header(data, pos)[0]
+    pos += 2 + (((word & 0x7FFF) + 1) // 2) * 2
+    if not word & PARTITION_FLAG:
+      return pos
+
+
+def join_partitions(data, pos):
+  """Joins partitioned parameters of long form element (copying them),
+  pos is offset of the first partition length word
+
+  :return: (tuple) parameters with padding, parameters size
+  and offset of the next element
+  """
+  unpack_header = HEADER.unpack_from
+  parts = []
+  size = 0
+  while True:
+    word = unpack_header(data, pos)[0]
+    partsz = word & 0x7FFF
+    parts.append(data[pos + 2 : pos + 2 + partsz])
+    size += partsz
+    pos += 2 + ((partsz + 1) // 2) * 2
+    if not word & PARTITION_FLAG:
+      break
+  params = b"".join(parts) + b"\x00" * (size % 2)
+  return params, size, pos
+
+
+def iter_elements(data, pos=0, end=None):
+  """Walks binary CGM content and yields (element_id, size, header, params)
+  tuples. Header and params are slices of data (zero-copy for memoryview),
+  params include padding byte if size is odd. Parameters of partitioned
+  element are joined into bytes.
+  """
+  unpack_header = HEADER.unpack_from
+  datasz = len(data) if end is None else end
+  while pos < datasz:
+    start = pos
+    word = unpack_header(data, pos)[0]
+    pos += 2
+    size = word & 0x001F
+    if size == 0x1F:
+      size = unpack_header(data, pos)[0]
+      if size & PARTITION_FLAG:
+        params, size, next_pos = join_partitions(data, pos)
+        yield word & 0xFFE0, size, data[start : pos + 2], params
+        pos = next_pos
+        continue
+      pos += 2
+    params = data[pos : pos + ((size + 1) // 2) * 2]
+    yield word & 0xFFE0, size, data[start:pos], params
+    pos += len(params)
+
+
+def pack_element(buf, element_id, params=b""):
+  """Appends binary element to bytearray. Parameters of 31 bytes
+  and longer are written in long form, parameters longer than
+  PARTITION_SIZE are partitioned.
+
+  :param buf: (bytearray) output buffer
+  :param element_id: (int) element id, e.g. cgm_const.POLYLINE
+  :param params: (bytes) element parameters without padding
+  """
+  size = len(params)
+  if size < 0x1F:
+    buf += HEADER.pack(element_id | size)
+    buf += params
+  else:
+    buf += HEADER.pack(element_id | 0x1F)
+    for pos in range(0, size, PARTITION_SIZE):
+      part = params[pos : pos + PARTITION_SIZE]
+      flag = PARTITION_FLAG if pos + PARTITION_SIZE < size else 0
+      buf += HEADER.pack(flag | len(part))
+      buf += part
+  if size % 2:
+    buf += b"\x00"
+  return buf
+
+
+def scan_pictures(data):
+  """Builds picture offset index decoding element headers only,
+  parameters are skipped by offset.
+
+  :param data: (bytes|memoryview) binary CGM content
+  :return: (tuple) offset of the first BEGIN PICTURE (end of metafile
+  descriptor) and list of (start, end) offsets of pictures
+  """
+  unpack_header = HEADER.unpack_from
+  datasz = len(data)
+  descriptor_end = None
+  pictures = []
+  picture_start = None
+  pos = 0
+  while pos < datasz:
+    start = pos
+    word = unpack_header(data, pos)[0]
+    pos += 2
+    size = word & 0x001F
+    if size == 0x1F:
+      pos = skip_partitions(data, pos)
+    else:
+      pos += ((size + 1) // 2) * 2
+    element_id = word & 0xFFE0
+    if element_id == cgm_const.BEGIN_PICTURE:
+      picture_start = start
+      if descriptor_end is None:
+        descriptor_end = start
+    elif element_id == cgm_const.END_PICTURE and picture_start is not None:
+      pictures.append((picture_start, pos))
+      picture_start = None
+  return datasz if descriptor_end is None else descriptor_end, pictures
+
+
+# Unpackers read value at pos offset of chunk (bytes or memoryview)
+# and return (value, next offset) without slicing the chunk
 
 
-def _unpack24(fmt, chunk):
-  sz = struct.calcsize(fmt)
-  res = struct.unpack(fmt, chunk[:sz])
-  return (res[0] << 16) | res[1], chunk[sz:]
+def _unpack(fmt, chunk, pos=0):
+  return fmt.unpack_from(chunk, pos)[0], pos + fmt.size
 
 
-def _unpack_fip32(fmt, chunk):
-  sz = struct.calcsize(fmt)
-  res = struct.unpack(fmt, chunk[:sz])
-  return res[0] + res[1] / 65536.0, chunk[sz:]
+def _unpack24(fmt, chunk, pos=0):
+  res = fmt.unpack_from(chunk, pos)
+  return (res[0] << 16) | res[1], pos + fmt.size
 
 
-def _unpack_fip64(fmt, chunk):
-  sz = struct.calcsize(fmt)
-  res = struct.unpack(fmt, chunk[:sz])
-  return res[0] + res[1] / (65536.0 ** 2), chunk[sz:]
+def _unpack_fip32(fmt, chunk, pos=0):
+  res = fmt.unpack_from(chunk, pos)
+  return res[0] + res[1] / 65536.0, pos + fmt.size
 
 
-CARD_F = ((">B", _unpack), (">H", _unpack), (">BH", _unpack24), (">I", _unpack))
-INT_F = ((">b", _unpack), (">h", _unpack), (">bH", _unpack24), (">i", _unpack))
-FLOAT_F = ((">f", _unpack), (">d", _unpack))
-FIXED_F = ((">hH", _unpack_fip32), (">hH", _unpack_fip64))
+def _unpack_fip64(fmt, chunk, pos=0):
+  res = fmt.unpack_from(chunk, pos)
+  return res[0] + res[1] / (65536.0 ** 2), pos + fmt.size
+
+
+CARD_F = (
+  (get_struct(">B"), _unpack),
+  (get_struct(">H"), _unpack),
+  (get_struct(">BH"), _unpack24),
+  (get_struct(">I"), _unpack),
+)
+INT_F = (
+  (get_struct(">b"), _unpack),
+  (get_struct(">h"), _unpack),
+  (get_struct(">bH"), _unpack24),
+  (get_struct(">i"), _unpack),
+)
+FLOAT_F = (
+  (get_struct(">f"), _unpack),
+  (get_struct(">d"), _unpack),
+)
+FIXED_F = (
+  (get_struct(">hH"), _unpack_fip32),
+  (get_struct(">iI"), _unpack_fip64),
+)
 REAL_F = FIXED_F + FLOAT_F
 VDC_F = (INT_F, REAL_F)
+ENUM_F = (get_struct(">h"), _unpack)
+
+# Point record formats per VDC type and precision
+POINT_FMT = (
+  (">bb", ">hh", ">bHbH", ">ii"),
+  (">hHhH", ">iIiI", ">ff", ">dd"),
+)
+# NumPy dtypes of points which do not need conversion
+POINT_DTYPE = (
+  (">i1", ">i2", None, ">i4"),
+  (None, None, ">f4", ">f8"),
+)
+# NumPy decoding pays off on large point blocks only
+NUMPY_MIN_POINTS = 64
+
+
+def _records(fmt, chunk, pos):
+  """Unpacks all whole fmt records from pos to the end of chunk"""
+  fmt = get_struct(fmt)
+  count = (len(chunk) - pos) // fmt.size
+  return fmt.iter_unpack(memoryview(chunk)[pos : pos + count * fmt.size])
+
+
+def _to_points(records, vdc_type, vdc_prec):
+  if vdc_type == 0:
+    if vdc_prec == 2:
+      return [[(a << 16) | b, (c << 16) | d] for a, b, c, d, *_flag in records]
+  elif vdc_prec < 2:
+    div = 65536.0 if vdc_prec == 0 else 65536.0 ** 2
+    return [[a + b / div, c + d / div] for a, b, c, d, *_flag in records]
+  return [[x, y] for x, y, *_flag in records]
+
+
+def unpack_points(chunk, vdc_type, vdc_prec, pos=0):
+  """Decodes all VDC points from pos to the end of chunk in single pass
+
+  :param chunk: (bytes|memoryview) element parameters
+  :param vdc_type: (int) VDC type (0 - integer, 1 - real)
+  :param vdc_prec: (int) VDC precision index
+  :return: (list) [x, y] points
+  """
+  dtype = POINT_DTYPE[vdc_type][vdc_prec]
+  if numpy is not None and dtype is not None:
+    count = (len(chunk) - pos) // (2 * numpy.dtype(dtype).itemsize)
+    if count >= NUMPY_MIN_POINTS:
+      values = numpy.frombuffer(chunk, dtype, count=2 * count, offset=pos)
+      return values.reshape(count, 2).tolist()
+  records = _records(POINT_FMT[vdc_type][vdc_prec], chunk, pos)
+  return _to_points(records, vdc_type, vdc_prec)
+
+
+def unpack_flagged_points(chunk, vdc_type, vdc_prec, pos=0):
+  """Decodes all (point, enum flag) records, e.g. of POLYGON SET
+
+  :return: (tuple) list of [x, y] points and list of flags
+  """
+  records = list(_records(POINT_FMT[vdc_type][vdc_prec] + "h", chunk, pos))
+  flags = [record[-1] for record in records]
+  return _to_points(records, vdc_type, vdc_prec), flags
+
 
 _PROCESSED = (
   cgm_const.BEGIN_METAFILE,
@@ -16,6 +16,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import time
 
 from qc3 import _, qc3const
 from qc3 import events, msgconst
@@ -147,13 +148,14 @@ class ModelPresenter(object):
       raise
 
     model_name = qc3const.FORMAT_NAMES[self.cid]
-    self.send_ok(_("<%s> document model is created") % model_name)
+    self.send_ok(_("<%s> document model is created"), model_name)
     self.update()
 
   def update(self, action=False):
     if self.model is not None:
       self.obj_num = self.model.count() + 1
       self.update_msg(0.0)
+      start = time.monotonic()
       try:
         self.model.config = self.config
         self.model.do_update(self, action)
@@ -161,11 +163,12 @@ class ModelPresenter(object):
         LOG.error(_("Error updating document model"))
         LOG.exception(e)
         raise
+      self.send_timing("update", start)
 
       model_name = qc3const.FORMAT_NAMES[self.cid]
-      msg = _("<%s> document model is updated successfully") % model_name
-      self.send_progress_message(msg, 0.99)
-      self.send_ok(msg)
+      msg = _("<%s> document model is updated successfully")
+      self.send_progress_message(msg, 0.99, model_name)
+      self.send_ok(msg, model_name)
 
   def save(self, filename=None, fileptr=None):
     if filename:
@@ -180,15 +183,15 @@ class ModelPresenter(object):
       self.send_info(_("Saving is started..."))
       self.saver.save(self, filename, fileptr)
     except Exception as e:
-      msg = _("Error while saving") + " " + filename + " %s"
-      LOG.error(msg)
+      msg = _("Error while saving") + " %s"
+      LOG.error(msg, filename or fileptr)
       LOG.exception(e)
       raise
 
     model_name = qc3const.FORMAT_NAMES[self.cid]
-    msg = _("<%s> document model is saved successfully") % model_name
-    self.send_progress_message(msg, 0.95)
-    self.send_ok(msg)
+    msg = _("<%s> document model is saved successfully")
+    self.send_progress_message(msg, 0.95, model_name)
+    self.send_ok(msg, model_name)
 
   def close(self):
     filename = self.doc_file
@@ -197,12 +200,12 @@ class ModelPresenter(object):
       self.model.destroy()
     self.model = None
     model_name = qc3const.FORMAT_NAMES[self.cid]
-    self.send_ok(_("<%s> document model is destroyed for %s") % (model_name, filename))
+    self.send_ok(_("<%s> document model is destroyed for %s"), model_name, filename)
 
     if self.doc_dir and fsutils.exists(self.doc_dir):
       try:
         fs.xremove_dir(self.doc_dir)
-        self.send_ok(_("Cache is cleared for") + " %s" % filename)
+        self.send_ok(_("Cache is cleared for") + " %s", filename)
       except Exception as e:
         msg = _("Cache clearing is unsuccessful")
         self.send_error(msg)
@@ -210,29 +213,35 @@ class ModelPresenter(object):
         LOG.exception(e)
 
   def update_msg(self, val):
-    model_name = qc3const.FORMAT_NAMES[self.cid]
-    msg = _("%s model update in progress...") % model_name
-    self.send_progress_message(msg, val)
+    if events.is_wanted(events.FILTER_INFO):
+      model_name = qc3const.FORMAT_NAMES[self.cid]
+      self.send_progress_message(_("%s model update in progress..."), val, model_name)
 
   def parsing_msg(self, val):
-    msg = _("Parsing in progress...")
-    self.send_progress_message(msg, val)
+    if events.is_wanted(events.FILTER_INFO):
+      self.send_progress_message(_("Parsing in progress..."), val)
 
   def saving_msg(self, val):
-    msg = _("Saving in progress...")
-    self.send_progress_message(msg, val)
+    if events.is_wanted(events.FILTER_INFO):
+      self.send_progress_message(_("Saving in progress..."), val)
+
+  def send_progress_message(self, msg, val, *args):
+    if events.is_wanted(events.FILTER_INFO):
+      events.emit(events.FILTER_INFO, msg % args if args else msg, val)
 
-  def send_progress_message(self, msg, val):
-    events.emit(events.FILTER_INFO, msg, val)
+  def send_ok(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.OK, msg, *args)
 
-  def send_ok(self, msg):
-    events.emit(events.MESSAGES, msgconst.OK, msg)
+  def send_info(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.INFO, msg, *args)
 
-  def send_info(self, msg):
-    events.emit(events.MESSAGES, msgconst.INFO, msg)
+  def send_error(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.ERROR, msg, *args)
 
-  def send_error(self, msg):
-    events.emit(events.MESSAGES, msgconst.ERROR, msg)
+  def send_timing(self, stage, start):
+    """Emits TIMING event for stage started at start (time.monotonic())"""
+    if events.is_wanted(events.TIMING, stage):
+      events.emit(events.TIMING, stage, self.cid, start, time.monotonic())
 
 
 class TextModelPresenter(ModelPresenter):
@@ -16,8 +16,11 @@
 # 	along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import errno
+import io
 import logging
+import mmap
 import os
+import time
 import xml.sax
 from xml.sax import handler
 from xml.sax.xmlreader import InputSource
@@ -28,6 +31,35 @@ from qc3.utils.fsutils import get_fileptr
 LOG = logging.getLogger(__name__)
 
 
+def get_source_fileptr(source, binary=True):
+  """Opens file path or in-memory bytes buffer for reading.
+  Buffer is not copied, so the call is cheap for every format check.
+  """
+  if isinstance(source, (bytes, bytearray, memoryview)):
+    fileptr = io.BytesIO(source if isinstance(source, bytes) else bytes(source))
+    if binary:
+      return fileptr
+    return io.TextIOWrapper(fileptr, encoding="utf-8", errors="replace")
+  return get_fileptr(source, binary=binary)
+
+
+def map_fileptr(fileptr):
+  """Returns read-only memoryview of whole binary file content.
+  Regular files are memory mapped (zero-copy, mapping outlives
+  fileptr closing), other streams are read into memory.
+  """
+  # noinspection PyBroadException
+  try:
+    fileno = fileptr.fileno()
+    if os.fstat(fileno).st_size:
+      return memoryview(mmap.mmap(fileno, 0, access=mmap.ACCESS_READ))
+  except Exception:
+    pass
+  if fileptr.seekable():
+    fileptr.seek(0)
+  return memoryview(fileptr.read())
+
+
 class AbstractLoader(object):
   name = "Abstract Loader"
 
@@ -53,18 +85,20 @@ class AbstractLoader(object):
       self.fileptr = get_fileptr(path)
     elif fileptr:
       self.fileptr = fileptr
-      self.fileptr.seek(-1, 1)
+      self.fileptr.seek(0, 2)
       self.file_size = self.fileptr.tell()
       self.fileptr.seek(0)
     else:
       msg = _("There is no file for reading")
       raise IOError(errno.ENODATA, msg, "")
 
+    start = time.monotonic()
     try:
       self.init_load()
     except Exception:
       LOG.error("Error loading file content")
       raise
+    self.send_timing("parse", start)
 
     self.fileptr.close()
     self.position = 0
@@ -83,7 +117,7 @@ class AbstractLoader(object):
     return line
 
   def check_loading(self):
-    if self.file_size:
+    if self.file_size and events.is_wanted(events.FILTER_INFO):
       position = float(self.fileptr.tell()) / float(self.file_size) * 0.95
       if position - self.position > 0.05:
         self.position = position
@@ -93,23 +127,33 @@ class AbstractLoader(object):
     events.emit(events.FILTER_INFO, msg, val)
 
   def parsing_msg(self, val):
-    msg = _("Parsing in progress...")
-    self.send_progress_message(msg, val)
+    if events.is_wanted(events.FILTER_INFO):
+      self.send_progress_message(_("Parsing in progress..."), val)
 
-  def send_ok(self, msg):
-    events.emit(events.MESSAGES, msgconst.OK, msg)
+  def send_ok(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.OK, msg, *args)
 
-  def send_info(self, msg):
-    events.emit(events.MESSAGES, msgconst.INFO, msg)
+  def send_info(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.INFO, msg, *args)
 
-  def send_warning(self, msg):
-    events.emit(events.MESSAGES, msgconst.WARNING, msg)
+  def send_warning(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.WARNING, msg, *args)
 
-  def send_error(self, msg):
-    events.emit(events.MESSAGES, msgconst.ERROR, msg)
+  def send_error(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.ERROR, msg, *args)
+
+  def send_timing(self, stage, start):
+    if events.is_wanted(events.TIMING, stage):
+      events.emit(events.TIMING, stage, self.presenter.cid, start, time.monotonic())
 
 
 class AbstractBinaryLoader(AbstractLoader):
+  def get_buffer(self):
+    """Returns zero-copy view of file content for parsers
+    which do not need sequential read() calls.
+    """
+    return map_fileptr(self.fileptr)
+
   def readbytes(self, size):
     return self.fileptr.read(size)
 
@@ -182,6 +226,12 @@ class AbstractSaver(object):
 
   model = None
 
+  # Encoded fragments are collected and written in blocks
+  # of at least 'block_size' bytes
+  block_size = 256 * 1024
+  buffer = None
+  buffer_size = 0
+
   def __init__(self):
     pass
 
@@ -189,6 +239,7 @@ class AbstractSaver(object):
     self.presenter = presenter
     self.config = self.presenter.config
     self.model = presenter.model
+    own_fileptr = bool(path)
     if path:
       self.fileptr = get_fileptr(path, True)
     elif fileptr:
@@ -197,25 +248,63 @@ class AbstractSaver(object):
       msg = _("There is no file for writting")
       raise IOError(errno.ENODATA, msg, "")
 
+    self.buffer = []
+    self.buffer_size = 0
     self.presenter.update()
     self.saving_msg(0.01)
+    start = time.monotonic()
     try:
       self.do_save()
+      self.flush_buffer()
     except Exception as e:
       LOG.error("Error saving file content %s", e)
       raise
+    finally:
+      self.buffer = None
+    self.send_timing("save", start)
     self.saving_msg(0.99)
-    self.fileptr.close()
+    # Caller provided stream is left open for caller
+    if own_fileptr:
+      self.fileptr.close()
+    else:
+      self.fileptr.flush()
     self.fileptr = None
 
   def do_save(self):
     pass
 
   def writeln(self, line=""):
-    self.fileptr.write(line.encode() + b"\n")
+    self.write(line + "\n")
+
+  def writelines(self, lines):
+    """Writes sequence of lines as single fragment
+
+    :param lines: (iterable) str lines without line ends
+    """
+    self.write("".join(line + "\n" for line in lines))
 
   def write(self, data):
-    self.fileptr.write(data)
+    """Appends data to output buffer. Str data is encoded as UTF-8.
+
+    :param data: (bytes|bytearray|str) data to write
+    """
+    if isinstance(data, str):
+      data = data.encode()
+    if self.buffer is None:
+      self.fileptr.write(data)
+      return
+    self.buffer.append(data)
+    self.buffer_size += len(data)
+    if self.buffer_size >= self.block_size:
+      self.flush_buffer()
+
+  def flush_buffer(self):
+    """Writes buffered fragments into file by single call"""
+    if self.buffer:
+      data = self.buffer[0] if len(self.buffer) == 1 else b"".join(self.buffer)
+      self.fileptr.write(data)
+      self.buffer = []
+      self.buffer_size = 0
 
   def field_to_str(self, val):
     val_str = val.__str__()
@@ -228,17 +317,21 @@ class AbstractSaver(object):
     events.emit(events.FILTER_INFO, msg, val)
 
   def saving_msg(self, val):
-    msg = _("Saving in progress...")
-    self.send_progress_message(msg, val)
+    if events.is_wanted(events.FILTER_INFO):
+      self.send_progress_message(_("Saving in progress..."), val)
+
+  def send_ok(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.OK, msg, *args)
 
-  def send_ok(self, msg):
-    events.emit(events.MESSAGES, msgconst.OK, msg)
+  def send_info(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.INFO, msg, *args)
 
-  def send_info(self, msg):
-    events.emit(events.MESSAGES, msgconst.INFO, msg)
+  def send_warning(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.WARNING, msg, *args)
 
-  def send_warning(self, msg):
-    events.emit(events.MESSAGES, msgconst.WARNING, msg)
+  def send_error(self, msg, *args):
+    events.emit_msg(events.MESSAGES, msgconst.ERROR, msg, *args)
 
-  def send_error(self, msg):
-    events.emit(events.MESSAGES, msgconst.ERROR, msg)
+  def send_timing(self, stage, start):
+    if events.is_wanted(events.TIMING, stage):
+      events.emit(events.TIMING, stage, self.presenter.cid, start, time.monotonic())
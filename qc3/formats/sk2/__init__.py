@@ -18,7 +18,7 @@
 from qc3 import _
 from qc3.formats.sk2.sk2_presenter import SK2_Presenter
 from qc3.sk2const import SK2DOC_ID, SK2XML_ID, SK2VER
-from qc3.utils.fsutils import get_fileptr
+from qc3.formats.generic_filters import get_source_fileptr
 from qc3.utils.mixutils import merge_cnf
 
 
@@ -36,7 +36,7 @@ def sk2_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None, **
 
 def check_sk2(path):
   ret = False
-  fileptr = get_fileptr(path)
+  fileptr = get_source_fileptr(path)
   ln = fileptr.readline()
   if ln[: len(SK2DOC_ID)] == SK2DOC_ID:
     if int(ln[len(SK2DOC_ID) :]) <= int(SK2VER):
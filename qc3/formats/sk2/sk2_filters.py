@@ -17,10 +17,9 @@
 
 import logging
 
-from qc3 import libimg, sk2const
+from qc3 import sk2const
 from qc3.formats.generic_filters import AbstractLoader, AbstractSaver
 from qc3.formats.sk2 import sk2_model
-from qc3.formats.sk2.crenderer import CairoRenderer
 
 LOG = logging.getLogger(__name__)
 
@@ -122,7 +121,7 @@ class SK2_Saver(AbstractSaver):
       self.writeln("-->\n</svg>")
 
   def save_obj(self, obj):
-    self.writeln("obj('%s')" % sk2_model.CID_TO_TAGNAME[obj.cid])
+    lines = ["obj('%s')" % sk2_model.CID_TO_TAGNAME[obj.cid]]
     props = obj.__dict__
     keys = (
       props.keys() if not obj.is_pixmap else props.keys() + ["bitmap", "alpha_channel"]
@@ -142,12 +141,20 @@ class SK2_Saver(AbstractSaver):
         else:
           item_str = self.field_to_str(props[item])
         if item_str is not None:
-          self.writeln("set('%s',%s)" % (item, item_str))
-    for child in obj.childs:
-      self.save_obj(child)
-    self.writeln("end()")
+          lines.append("set('%s',%s)" % (item, item_str))
+    if obj.childs:
+      self.writelines(lines)
+      for child in obj.childs:
+        self.save_obj(child)
+      self.writeln("end()")
+    else:
+      lines.append("end()")
+      self.writelines(lines)
 
   def generate_preview(self):
+    from qc3 import libimg
+    from qc3.formats.sk2.crenderer import CairoRenderer
+
     return libimg.generate_preview(
       self.presenter,
       CairoRenderer,
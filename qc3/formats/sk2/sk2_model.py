@@ -23,7 +23,6 @@ from copy import deepcopy
 from .sk2_cids import *
 from qc3 import _, cms, qc3const, libgeom, sk2const
 from qc3.formats.generic import TextModelObject
-from qc3.libimg.handlers import EditableImageHandler
 from . import arrows
 
 GENERIC_FIELDS = ["cid", "childs", "parent", "config", "handler"]
@@ -1238,6 +1237,8 @@ class Pixmap(PrimitiveObject):
     trafo=[] + sk2const.NORMAL_TRAFO,
     style=[] + sk2const.EMPTY_STYLE,
   ):
+    from qc3.libimg.handlers import EditableImageHandler
+
     self.cid = PIXMAP
     self.config = config
     self.parent = parent
@@ -17,7 +17,7 @@
 
 from qc3.formats.skp.skp_const import SKP_ID
 from qc3.formats.skp.skp_presenter import SKP_Presenter
-from qc3.utils.fsutils import get_fileptr
+from qc3.formats.generic_filters import get_source_fileptr
 from qc3.utils.mixutils import merge_cnf
 
 
@@ -37,7 +37,7 @@ def skp_saver(
 
 
 def check_skp(path):
-  fileptr = get_fileptr(path, binary=False)
+  fileptr = get_source_fileptr(path, binary=False)
   string = fileptr.read(len(SKP_ID))
   fileptr.close()
   return string == SKP_ID
@@ -85,13 +85,16 @@ class SKP_Saver(AbstractSaver):
   name = "SKP_Saver"
 
   def do_save(self):
-    self.writeln(SKP_ID)
-    self.writeln("palette()")
-    self.writeln("set_name(%s)" % self.field_to_str(self.model.name))
-    self.writeln("set_source(%s)" % self.field_to_str(self.model.source))
+    lines = [
+      SKP_ID,
+      "palette()",
+      "set_name(%s)" % self.field_to_str(self.model.name),
+      "set_source(%s)" % self.field_to_str(self.model.source),
+    ]
     for item in self.model.comments.splitlines():
-      self.writeln("add_comments(%s)" % self.field_to_str(item))
-    self.writeln("set_columns(%s)" % self.field_to_str(self.model.columns))
+      lines.append("add_comments(%s)" % self.field_to_str(item))
+    lines.append("set_columns(%s)" % self.field_to_str(self.model.columns))
     for item in self.model.colors:
-      self.writeln("color(%s)" % self.field_to_str(item))
-    self.writeln("palette_end()")
+      lines.append("color(%s)" % self.field_to_str(item))
+    lines.append("palette_end()")
+    self.writelines(lines)
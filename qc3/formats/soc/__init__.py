@@ -18,7 +18,7 @@
 from qc3.formats.skp.skp_presenter import SKP_Presenter
 from qc3.formats.soc.soc_const import SOC_PAL_TAG, SOC_PAL_OO_TAG
 from qc3.formats.soc.soc_presenter import SOC_Presenter
-from qc3.utils.fsutils import get_fileptr
+from qc3.formats.generic_filters import get_source_fileptr
 from qc3.utils.mixutils import merge_cnf
 
 
@@ -51,7 +51,7 @@ def soc_saver(
 
 
 def check_soc(path):
-  fileptr = get_fileptr(path, binary=False)
+  fileptr = get_source_fileptr(path, binary=False)
   ret = False
   i = 0
   while i < 20:
@@ -61,15 +61,14 @@ class SOC_Saver(AbstractSaver):
       pal_tag = SOC_PAL_OO_TAG
       pal_attr = SOC_PAL_OO_ATTRS
 
-    line = "<%s" % pal_tag
-    for item in pal_attr.keys():
-      line += ' %s="%s"' % (item, pal_attr[item])
-    self.writeln(line + ">")
+    attrs = "".join(' %s="%s"' % item for item in pal_attr.items())
+    self.writeln("<%s%s>" % (pal_tag, attrs))
 
-    for item in self.model.colors:
-      self.writeln(
-        ' <%s %s="%s" %s="%s"/>'
-        % (SOC_COLOR_TAG, SOC_COLOR_NAME_ATTR, item[1], SOC_COLOR_VAL_ATTR, item[0])
-      )
+    color_tag = ' <%s %s="%%s" %s="%%s"/>' % (
+      SOC_COLOR_TAG,
+      SOC_COLOR_NAME_ATTR,
+      SOC_COLOR_VAL_ATTR,
+    )
+    self.writelines(color_tag % (item[1], item[0]) for item in self.model.colors)
 
     self.writeln("</%s>" % pal_tag)
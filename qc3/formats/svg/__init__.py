@@ -21,7 +21,7 @@ from qc3 import qc3const
 from qc3.formats.sk2.sk2_presenter import SK2_Presenter
 from qc3.formats.svg.svg_presenter import SVG_Presenter
 from qc3.utils.mixutils import merge_cnf
-from qc3.utils.fsutils import get_fileptr
+from qc3.formats.generic_filters import get_source_fileptr
 
 
 def svg_loader(appdata, filename=None, fileptr=None, translate=True, cnf=None, **kw):
@@ -44,8 +44,8 @@ def svg_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None, **
     translate = False
   if translate:
     svg_doc = SVG_Presenter(sk2_doc.appdata, cnf)
-    svg_doc.translate_from_sk2(sk2_doc)
-    svg_doc.save(filename, fileptr)
+    # SVG is serialized while translation, SVG model is not built
+    svg_doc.stream_from_sk2(sk2_doc, filename, fileptr)
     svg_doc.close()
   else:
     sk2_doc.save(filename, fileptr)
@@ -53,7 +53,7 @@ def svg_saver(sk2_doc, filename=None, fileptr=None, translate=True, cnf=None, **
 
 def check_svg(path):
   tag = None
-  fileptr = get_fileptr(path)
+  fileptr = get_source_fileptr(path)
   try:
     for event, el in cElementTree.iterparse(fileptr, ("start",)):
       tag = el.tag
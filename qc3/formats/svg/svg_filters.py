@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020 by Ihor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from qc3.formats.svg.svg_translators import SK2_to_SVG_Writer
+from qc3.formats.xml_.xml_filters import Advanced_XML_Saver
+
+
+class SVG_Stream_Saver(Advanced_XML_Saver):
+  """Saves SK2 document as SVG file translating it on the fly"""
+
+  name = "SVG_Stream_Saver"
+  sk2_doc = None
+
+  def __init__(self, sk2_doc):
+    Advanced_XML_Saver.__init__(self)
+    self.sk2_doc = sk2_doc
+
+  def do_save(self):
+    self.write_header()
+    SK2_to_SVG_Writer().write(self.sk2_doc, self.presenter, self)
+    self.sk2_doc = None
@@ -16,10 +16,12 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
+import time
 
 from qc3 import qc3const
 from qc3.formats.generic import TaggedModelPresenter
 from qc3.formats.svg.svg_config import SVG_Config
+from qc3.formats.svg.svg_filters import SVG_Stream_Saver
 from qc3.formats.svg.svg_methods import SVG_Methods, create_new_svg
 from qc3.formats.svg.svg_translators import SK2_to_SVG_Translator
 from qc3.formats.svg.svg_translators import SVG_to_SK2_Translator
@@ -59,9 +61,21 @@ class SVG_Presenter(TaggedModelPresenter):
     self.methods.update()
 
   def translate_from_sk2(self, sk2_doc):
+    start = time.monotonic()
     translator = SK2_to_SVG_Translator()
     translator.translate(sk2_doc, self)
+    self.send_timing("from_sk2", start)
+
+  def stream_from_sk2(self, sk2_doc, filename=None, fileptr=None):
+    """Translates SK2 document and writes SVG file at once,
+    SVG model is not built.
+    """
+    start = time.monotonic()
+    SVG_Stream_Saver(sk2_doc).save(self, filename, fileptr)
+    self.send_timing("from_sk2", start)
 
   def translate_to_sk2(self, sk2_doc):
+    start = time.monotonic()
     translator = SVG_to_SK2_Translator()
     translator.translate(self, sk2_doc)
+    self.send_timing("to_sk2", start)
@@ -21,9 +21,7 @@ from base64 import b64decode, b64encode
 from io import StringIO
 from copy import deepcopy
 
-from PIL import Image
-
-from qc3 import qc3const, libgeom, libpango, cms, sk2const, utils
+from qc3 import qc3const, libgeom, cms, sk2const, utils
 from qc3.utils import fsutils
 from qc3.formats.sk2 import sk2_model
 from qc3.formats.svg import svg_const, svg_utils
@@ -461,6 +459,8 @@ class SVG_to_SK2_Translator(object):
           ]
 
     if text_style:
+      from qc3 import libpango
+
       # font family
       font_family = "Sans"
       if style["font-family"] in libpango.get_fonts()[0]:
@@ -509,6 +509,8 @@ class SVG_to_SK2_Translator(object):
     return sk2_style
 
   def get_image(self, svg_obj):
+    from PIL import Image
+
     if "xlink:href" not in svg_obj.attrs:
       return None
     link = svg_obj.attrs["xlink:href"]
@@ -1164,6 +1166,26 @@ class SK2_to_SVG_Translator(object):
   svg_mtds = None
 
   def translate(self, sk2_doc, svg_doc):
+    pages = self.begin(sk2_doc, svg_doc)
+    for item in self.svg_mt.childs:
+      if item.tag == "defs":
+        self.defs = item
+        break
+    for page in pages:
+      self.translate_page(self.svg_mt, page)
+    self.indent_level = 0
+    if self.defs.childs:
+      self.add_spacer(self.defs)
+    else:
+      self.svg_mt.childs.remove(self.defs)
+    self.add_spacer(self.svg_mt)
+    self.end()
+
+  def begin(self, sk2_doc, svg_doc):
+    """Sets document size attributes of SVG root element
+
+    :return: (list) SK2 pages to translate
+    """
     self.svg_doc = svg_doc
     self.sk2_doc = sk2_doc
     self.svg_mt = svg_doc.model
@@ -1180,10 +1202,7 @@ class SK2_to_SVG_Translator(object):
       if self.sk2_mt.doc_units == qc3const.UNIT_PX
       else svg_const.SVG_PT
     )
-    for item in self.svg_mt.childs:
-      if item.tag == "defs":
-        self.defs = item
-        break
+    pages = []
     for item in self.sk2_mt.childs:
       if item.cid == sk2_model.PAGES:
         page = item.childs[0]
@@ -1197,14 +1216,11 @@ class SK2_to_SVG_Translator(object):
         self.trafo[4] = self.dx
         self.trafo[5] = self.dy
         self.page_dx = 0.0
-        for page in item.childs:
-          self.translate_page(self.svg_mt, page)
-    self.indent_level = 0
-    if self.defs.childs:
-      self.add_spacer(self.defs)
-    else:
-      self.svg_mt.childs.remove(self.defs)
-    self.add_spacer(self.svg_mt)
+        pages = item.childs
+    return pages
+
+  def end(self):
+    self.defs = None
     self.svg_doc = None
     self.sk2_doc = None
     self.svg_mt = None
@@ -1220,14 +1236,25 @@ class SK2_to_SVG_Translator(object):
     self.add_spacer(parent)
     parent.childs.append(obj)
 
+  def open_element(self, parent, tag, attrs=None):
+    """Appends container element, its children should be translated
+    into returned element and closed by close_element() call
+    """
+    obj = svg_utils.create_xmlobj(tag, attrs or {})
+    self.append_obj(parent, obj)
+    return obj
+
+  def close_element(self, obj):
+    self.add_spacer(obj)
+
   def translate_page(self, dest_parent, source_obj):
     w, h = source_obj.page_format[1]
     self.trafo[4] = w / 2.0 + self.page_dx
     if self.page_dx:
       rect = svg_utils.create_rect(self.page_dx, self.dy - h / 2.0, w, h)
       rect.attrs["style"] = "fill:none;stroke:black;"
-      self.append_obj(self.svg_mt, rect)
-    self.translate_objs(self.svg_mt, source_obj.childs)
+      self.append_obj(dest_parent, rect)
+    self.translate_objs(dest_parent, source_obj.childs)
     self.page_dx += w + 30.0
 
   def translate_objs(self, dest_parent, source_objs):
@@ -1255,12 +1282,12 @@ class SK2_to_SVG_Translator(object):
     self.indent_level -= 1
 
   def translate_layer(self, dest_parent, source_obj):
-    group = svg_utils.create_xmlobj("g")
+    attrs = {}
     if not source_obj.properties[0]:
-      group.attrs["style"] = "display:none;"
+      attrs["style"] = "display:none;"
+    group = self.open_element(dest_parent, "g", attrs)
     self.translate_objs(group, source_obj.childs)
-    self.add_spacer(group)
-    self.append_obj(dest_parent, group)
+    self.close_element(group)
 
   def translate_group(self, dest_parent, source_obj):
     if source_obj.is_container:
@@ -1278,11 +1305,10 @@ class SK2_to_SVG_Translator(object):
         fill_obj.style[1] = []
         self.translate_primitive(dest_parent, fill_obj)
 
-      group = svg_utils.create_xmlobj("g")
-      group.attrs["clip-path"] = "url(#%s)" % clip_id
+      attrs = {"clip-path": "url(#%s)" % clip_id}
+      group = self.open_element(dest_parent, "g", attrs)
       self.translate_objs(group, source_obj.childs[1:])
-      self.add_spacer(group)
-      self.append_obj(dest_parent, group)
+      self.close_element(group)
 
       if clip.style[1] and not clip.style[1][7]:
         stroke_obj = clip.copy()
@@ -1290,24 +1316,24 @@ class SK2_to_SVG_Translator(object):
         stroke_obj.style[0] = []
         self.translate_primitive(dest_parent, stroke_obj)
     else:
-      group = svg_utils.create_xmlobj("g")
+      group = self.open_element(dest_parent, "g")
       self.translate_objs(group, source_obj.childs)
-      self.add_spacer(group)
-      self.append_obj(dest_parent, group)
+      self.close_element(group)
 
   def make_clippath(self, source_obj):
-    clippath = svg_utils.create_xmlobj("clipPath")
-    clippath.attrs["clipPathUnits"] = "userSpaceOnUse"
-    clippath.attrs["id"] = "clipPath" + str(self.defs_count + 1)
+    clip_id = "clipPath" + str(self.defs_count + 1)
     self.defs_count += 1
+    attrs = {"clipPathUnits": "userSpaceOnUse", "id": clip_id}
 
     lvl = self.indent_level
     self.indent_level = 1
-    self.append_obj(self.defs, clippath)
+    clippath = self.open_element(self.defs, "clipPath", attrs)
     self.indent_level += 1
     self.translate_primitive(clippath, source_obj)
+    self.indent_level -= 1
+    self.close_element(clippath)
     self.indent_level = lvl
-    return clippath.attrs["id"]
+    return clip_id
 
   def translate_primitive(self, dest_parent, source_obj):
     curve = source_obj.to_curve()
@@ -1317,10 +1343,9 @@ class SK2_to_SVG_Translator(object):
     curve.update()
     style = self.translate_style(source_obj)
     trafo = libgeom.multiply_trafo(curve.trafo, self.trafo)
-    paths = libgeom.apply_trafo_to_paths(curve.paths, trafo)
     pth = svg_utils.create_xmlobj("path")
     pth.attrs["style"] = style
-    pth.attrs["d"] = svg_utils.translate_paths_to_d(paths)
+    pth.attrs["d"] = svg_utils.translate_paths_to_d(curve.paths, trafo)
     self.append_obj(dest_parent, pth)
     arrows = curve.arrows_to_curve()
     if arrows:
@@ -1437,10 +1462,9 @@ class SK2_to_SVG_Translator(object):
       attrs["y1"] = str(y1)
       attrs["x2"] = str(x2)
       attrs["y2"] = str(y2)
-    grad_obj = svg_utils.create_xmlobj(tag, attrs)
     lvl = self.indent_level
     self.indent_level = 1
-    self.append_obj(self.defs, grad_obj)
+    grad_obj = self.open_element(self.defs, tag, attrs)
     self.indent_level += 1
     self.translate_stops(grad_obj, gradient[2])
     self.indent_level = lvl
@@ -1458,4 +1482,71 @@ class SK2_to_SVG_Translator(object):
       stop_obj = svg_utils.create_xmlobj("stop", attrs)
       self.append_obj(parent, stop_obj)
     self.indent_level -= 1
-    self.add_spacer(parent)
+    self.close_element(parent)
+
+
+class SVGStreamElement(object):
+  """Open element of streaming SVG writer.
+  Element content is passed into 'write' callable.
+  """
+
+  def __init__(self, tag, write):
+    self.tag = tag
+    self.write = write
+
+
+class SK2_to_SVG_Writer(SK2_to_SVG_Translator):
+  """Serializes SK2 document into SVG while translating it,
+  SVG model tree is not built. Document body is written through
+  saver (which buffers output in large blocks), <defs> content
+  (gradients, clip paths) is collected into side buffer and spliced
+  in before closing </svg> tag (SVG references may point forward).
+  """
+
+  saver = None
+  encoding = "utf-8"
+
+  def write(self, sk2_doc, svg_doc, saver):
+    """
+    :param saver: (AbstractSaver) saver with opened file
+    """
+    self.saver = saver
+    self.encoding = svg_doc.config.encoding
+    pages = self.begin(sk2_doc, svg_doc)
+    defs_content = []
+    self.defs = SVGStreamElement("defs", defs_content.append)
+    root = SVGStreamElement("svg", self.write_body)
+    self.write_body("<svg%s>" % saver.get_obj_attrs(self.svg_mt))
+    for page in pages:
+      self.translate_page(root, page)
+    self.indent_level = 0
+    if defs_content:
+      defs = [item for item in self.svg_mt.childs if item.tag == "defs"]
+      attrs = saver.get_obj_attrs(defs[0]) if defs else ""
+      self.add_spacer(root)
+      self.write_body("<defs%s>%s" % (attrs, "".join(defs_content)))
+      self.add_spacer(root)
+      self.write_body("</defs>")
+    self.add_spacer(root)
+    self.write_body("</svg>")
+    self.saver = None
+    self.end()
+
+  def write_body(self, text):
+    self.saver.write(text.encode(self.encoding))
+
+  def add_spacer(self, parent):
+    parent.write("\n" + "\t" * self.indent_level)
+
+  def append_obj(self, parent, obj):
+    attrs = self.saver.get_obj_attrs(obj)
+    parent.write("\n%s<%s%s />" % ("\t" * self.indent_level, obj.tag, attrs))
+
+  def open_element(self, parent, tag, attrs=None):
+    obj = svg_utils.create_xmlobj(tag, attrs or {})
+    attrs = self.saver.get_obj_attrs(obj)
+    parent.write("\n%s<%s%s>" % ("\t" * self.indent_level, tag, attrs))
+    return SVGStreamElement(tag, parent.write)
+
+  def close_element(self, obj):
+    obj.write("\n%s</%s>" % ("\t" * self.indent_level, obj.tag))
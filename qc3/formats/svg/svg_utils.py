@@ -28,6 +28,9 @@ from qc3.libgeom import add_points, sub_points, mult_point
 PATH_STUB = [[], [], sk2const.CURVE_OPENED]
 F13 = 1.0 / 3.0
 F23 = 2.0 / 3.0
+# Path data is rounded to PATH_PRECISION decimal digits
+PATH_PRECISION = 4
+PATH_SCALE = 10**PATH_PRECISION
 LOG = logging.getLogger(__name__)
 
 
@@ -532,34 +535,110 @@ def create_rect(x, y, w, h):
 
 
 def translate_style_dict(style):
-  ret = ""
-  for item in style.keys():
-    ret += "%s:%s;" % (item, style[item])
-  return ret
+  return "".join("%s:%s;" % item for item in style.items())
 
 
 def point_to_str(point):
   return " %s,%s" % (str(round(point[0], 4)), str(round(point[1], 4)))
 
 
-def translate_paths_to_d(paths):
-  ret = ""
+def fixed_to_str(val):
+  """Formats fixed point value in shortest form, i.e. 0.5 as '.5'
+
+  :param val: (int) value in 1/PATH_SCALE units
+  :return: (str) formatted number
+  """
+  if not val % PATH_SCALE:
+    return str(val // PATH_SCALE)
+  ipart, fpart = divmod(abs(val), PATH_SCALE)
+  fpart = ("%0*d" % (PATH_PRECISION, fpart)).rstrip("0")
+  return "%s%s.%s" % ("-" if val < 0 else "", ipart or "", fpart)
+
+
+def join_nums(nums, prev=""):
+  """Joins formatted numbers omitting separators where sign or
+  decimal point already delimits the number.
+
+  :param nums: (list) formatted numbers
+  :param prev: (str) previous number in path data, if any
+  :return: (str) joined numbers
+  """
+  ret = []
+  for num in nums:
+    if prev and not (num[0] == "-" or (num[0] == "." and "." in prev)):
+      ret.append(" ")
+    ret.append(num)
+    prev = num
+  return "".join(ret)
+
+
+def translate_paths_to_d(paths, trafo=None):
+  """Serializes SK2 paths into compact SVG path data.
+  Points are transformed and rounded to fixed point in single pass,
+  so relative coordinates are exact differences of absolute ones.
+  Shorter of absolute and relative forms is used for every segment,
+  repeated command letters are omitted, horizontal and vertical
+  lines are written as H/V commands.
+
+  :param paths: (list) SK2 paths
+  :param trafo: (list|None) transformation applied to path points
+  :return: (str) path data
+  """
+  m11, m21, m12, m22, dx, dy = trafo or libgeom.NORMAL_TRAFO
+  scale = PATH_SCALE
+  ret = []
+  # last command letter, last number, current point
+  state = ["", "", 0, 0]
+
+  def emit(cmd, abs_vals, rel_vals):
+    last, prev = state[0], state[1]
+    nums = [fixed_to_str(val) for val in abs_vals]
+    data = join_nums(nums, prev if cmd == last else "")
+    if rel_vals is not None:
+      rel_cmd = cmd.lower()
+      rel_nums = [fixed_to_str(val) for val in rel_vals]
+      rel_data = join_nums(rel_nums, prev if rel_cmd == last else "")
+      if len(rel_data) + (rel_cmd != last) < len(data) + (cmd != last):
+        cmd, nums, data = rel_cmd, rel_nums, rel_data
+    if cmd != last:
+      ret.append(cmd)
+    ret.append(data)
+    # Coordinates after moveto are implicit linetos
+    state[0] = {"M": "L", "m": "l"}.get(cmd, cmd)
+    state[1] = nums[-1]
+
   for path in paths:
-    cmd = "M"
-    ret += " M" + point_to_str(path[0])
-    for item in path[1]:
-      if len(item) == 2:
-        if not cmd == "L":
-          cmd = "L"
-          ret += " L"
-        ret += point_to_str(item)
+    px, py = path[0]
+    x = round((m11 * px + m12 * py + dx) * scale)
+    y = round((m21 * px + m22 * py + dy) * scale)
+    cx, cy = state[2], state[3]
+    start = (x, y)
+    # First moveto is absolute in any case
+    emit("M", (x, y), (x - cx, y - cy) if ret else None)
+    cx, cy = x, y
+    for point in path[1]:
+      if len(point) == 2:
+        px, py = point
+        x = round((m11 * px + m12 * py + dx) * scale)
+        y = round((m21 * px + m22 * py + dy) * scale)
+        if x == cx and y != cy:
+          emit("V", (y,), (y - cy,))
+        elif y == cy and x != cx:
+          emit("H", (x,), (x - cx,))
+        else:
+          emit("L", (x, y), (x - cx, y - cy))
       else:
-        if not cmd == "C":
-          cmd = "C"
-          ret += " C"
-        ret += point_to_str(item[0])
-        ret += point_to_str(item[1])
-        ret += point_to_str(item[2])
+        vals = []
+        for px, py in point[:3]:
+          vals.append(round((m11 * px + m12 * py + dx) * scale))
+          vals.append(round((m21 * px + m22 * py + dy) * scale))
+        rel_vals = [val - (cy if index % 2 else cx) for index, val in enumerate(vals)]
+        emit("C", vals, rel_vals)
+        x, y = vals[4], vals[5]
+      cx, cy = x, y
     if path[2] == sk2const.CURVE_CLOSED:
-      ret += " Z"
-  return ret.strip()
+      ret.append("Z")
+      state[0] = "Z"
+      cx, cy = start
+    state[2], state[3] = cx, cy
+  return "".join(ret)
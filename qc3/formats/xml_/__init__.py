@@ -16,7 +16,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 from qc3.formats.xml_.xml_presenter import XML_Presenter
-from qc3.utils.fsutils import get_fileptr
+from qc3.formats.generic_filters import get_source_fileptr
 from qc3.utils.mixutils import merge_cnf
 
 
@@ -37,7 +37,7 @@ def xml__saver(
 
 
 def check_xml_(path):
-  fileptr = get_fileptr(path)
+  fileptr = get_source_fileptr(path)
   ret = False
   i = 0
   while i < 20:
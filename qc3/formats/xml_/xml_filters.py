@@ -75,6 +75,10 @@ class XML_Saver(AbstractSaver):
 
   def do_save(self):
     self.indent = 0
+    self.write_header()
+    self.write_obj(self.model)
+
+  def write_header(self):
     cfg = self.model.config.encoding
     self.writeln('<?xml version="1.0" encoding="%s"?>' % cfg)
     appdata = self.presenter.appdata
@@ -82,7 +86,6 @@ class XML_Saver(AbstractSaver):
     ver = "%s%s" % (appdata.version, appdata.revision)
     link = "(https://%s/)" % appdata.app_domain
     self.writeln("<!-- %s %s %s -->" % (name, ver, link))
-    self.write_obj(self.model)
 
   def write_obj(self, obj):
     ind = self.indent * self.model.config.indent
@@ -107,12 +110,9 @@ class XML_Saver(AbstractSaver):
       self.writeln(ind + "<%s%s />" % (obj.tag, attrs))
 
   def get_obj_attrs(self, obj):
-    line = ""
     if not obj.attrs:
-      return line
-    for item in obj.attrs.keys():
-      line += ' %s="%s"' % (item, obj.attrs[item])
-    return line
+      return ""
+    return "".join(' %s="%s"' % item for item in obj.attrs.items())
 
 
 class Advanced_XML_Saver(XML_Saver):
@@ -20,6 +20,7 @@ from .bezier_ops import *
 from .contour import stroke_to_curve
 from .cwrap import *
 from .flattering import get_flattened_paths, flat_paths, flat_path
+from .flattering import get_simplified_paths, simplify_points
 from .objs import *
 from .points import *
 from .shaping import intersect_paths, fuse_paths, trim_paths, excluse_paths
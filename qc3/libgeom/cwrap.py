@@ -15,40 +15,60 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import qc3.libcairo as libcairo
+import time
+
+from qc3 import events
+
+# qc3.libcairo (and pycairo) is imported on first use to keep
+# it off CLI startup path, see get_libcairo()
+_LIBCAIRO = None
+
+
+def get_libcairo():
+  """Returns qc3.libcairo module importing it on first call."""
+  global _LIBCAIRO
+  if _LIBCAIRO is None:
+    from qc3 import libcairo
+
+    _LIBCAIRO = libcairo
+  return _LIBCAIRO
 
 
 def create_cpath(cache_paths):
-  return libcairo.create_cpath(cache_paths)
+  libcairo = _LIBCAIRO or get_libcairo()
+  if not events.is_wanted(events.TIMING, "cpath"):
+    return libcairo.create_cpath(cache_paths)
+  start = time.monotonic()
+  cpath = libcairo.create_cpath(cache_paths)
+  events.emit(events.TIMING, "cpath", None, start, time.monotonic())
+  return cpath
 
 
 def copy_cpath(cache_cpath):
-  return libcairo.copy_cpath(cache_cpath)
+  return (_LIBCAIRO or get_libcairo()).copy_cpath(cache_cpath)
 
 
 def get_cpath_bbox(cache_cpath):
-  return libcairo.get_cpath_bbox(cache_cpath)
+  return (_LIBCAIRO or get_libcairo()).get_cpath_bbox(cache_cpath)
 
 
 def apply_trafo(cache_cpath, trafo, copy=False):
-  return libcairo.apply_trafo(cache_cpath, trafo, copy)
+  return (_LIBCAIRO or get_libcairo()).apply_trafo(cache_cpath, trafo, copy)
 
 
 def multiply_trafo(trafo1, trafo2):
-  return libcairo.multiply_trafo(trafo1, trafo2)
+  return (_LIBCAIRO or get_libcairo()).multiply_trafo(trafo1, trafo2)
 
 
 def invert_trafo(trafo):
-  return libcairo.invert_trafo(trafo)
+  return (_LIBCAIRO or get_libcairo()).invert_trafo(trafo)
 
 
 def get_transformed_path(obj):
   if obj.cache_cpath is None:
     obj.update()
-  return (
-    None if obj.cache_cpath is None else libcairo.get_path_from_cpath(obj.cache_cpath)
-  )
+  return None if obj.cache_cpath is None else get_path_from_cpath(obj.cache_cpath)
 
 
 def get_path_from_cpath(cpath):
-  return libcairo.get_path_from_cpath(cpath)
+  return (_LIBCAIRO or get_libcairo()).get_path_from_cpath(cpath)
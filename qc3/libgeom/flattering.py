@@ -15,9 +15,10 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import math
 from copy import deepcopy
 
-from .points import add_points, mult_point, get_point_angle
+from .points import add_points, mult_point, get_point_angle, distance
 from .trafo import apply_trafo_to_paths, NORMAL_TRAFO
 
 
@@ -89,3 +90,97 @@ def get_flattened_paths(curve_obj, trafo=NORMAL_TRAFO, tolerance=0.1):
   if trafo != NORMAL_TRAFO:
     paths = apply_trafo_to_paths(paths, trafo)
   return paths
+
+
+# ------------- Distance based flattering -------------
+
+# Max depth of bezier segment subdivision
+MAX_DEPTH = 16
+
+
+def segment_distance(point, start, end):
+  """Returns distance from point to line segment between start and end"""
+  dx = end[0] - start[0]
+  dy = end[1] - start[1]
+  length2 = dx * dx + dy * dy
+  if not length2:
+    return distance(point, start)
+  t = ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / length2
+  t = min(1.0, max(0.0, t))
+  return math.hypot(point[0] - start[0] - t * dx, point[1] - start[1] - t * dy)
+
+
+def flat_segment_by_distance(start_point, end_point, tolerance, depth=MAX_DEPTH):
+  """Flattens bezier segment until its control points deviate
+  from chord less than tolerance. As the segment lies in convex hull
+  of control points, the curve deviates from chord less than tolerance
+  too. Start point is not included.
+  """
+  p0 = base_point(start_point)
+  p1, p2, p3 = end_point[:3]
+  deviation = max(segment_distance(p1, p0, p3), segment_distance(p2, p0, p3))
+  if not depth or deviation <= tolerance:
+    return [[] + p3]
+  first, second = split_segment(start_point, end_point)
+  points = flat_segment_by_distance(start_point, first, tolerance, depth - 1)
+  return points + flat_segment_by_distance(first, second, tolerance, depth - 1)
+
+
+def flat_path_by_distance(path, tolerance):
+  ret_points = []
+  start = path[0]
+  for point in path[1]:
+    if len(point) == 2:
+      ret_points.append([] + point)
+    else:
+      ret_points += flat_segment_by_distance(start, point, tolerance)
+    start = point
+  if path[2] and path[0] != ret_points[-1]:
+    ret_points.append([] + path[0])
+  return [[] + path[0], ret_points, path[2]]
+
+
+def simplify_points(points, tolerance):
+  """Douglas-Peucker polyline simplification. Points which deviate
+  from simplified polyline less than tolerance are dropped,
+  end points are always kept.
+  """
+  if len(points) < 3:
+    return points
+  keep = [False] * len(points)
+  keep[0] = keep[-1] = True
+  stack = [(0, len(points) - 1)]
+  while stack:
+    first, last = stack.pop()
+    start, end = points[first], points[last]
+    max_dist, index = 0.0, 0
+    for i in range(first + 1, last):
+      dist = segment_distance(points[i], start, end)
+      if dist > max_dist:
+        max_dist, index = dist, i
+    if max_dist > tolerance:
+      keep[index] = True
+      stack.append((first, index))
+      stack.append((index, last))
+  return [point for point, flag in zip(points, keep) if flag]
+
+
+def get_simplified_paths(curve_obj, tolerance, trafo=NORMAL_TRAFO):
+  """Returns flattened and simplified paths of curve object.
+  Unlike get_flattened_paths() tolerance is a distance in target
+  coordinates (after trafo), so it can be derived from output resolution.
+  Flattening and simplification get half of tolerance each, so result
+  deviates from the curve less than tolerance.
+  """
+  paths = apply_trafo_to_paths(curve_obj.paths, curve_obj.trafo)
+  if trafo != NORMAL_TRAFO:
+    paths = apply_trafo_to_paths(paths, trafo)
+  tolerance /= 2.0
+  ret = []
+  for path in paths:
+    if not path[1]:
+      continue
+    start, points, closed = flat_path_by_distance(path, tolerance)
+    points = simplify_points([start] + points, tolerance)
+    ret.append([points[0], points[1:], closed])
+  return ret
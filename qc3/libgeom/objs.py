@@ -16,11 +16,13 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import math
+import time
 from copy import deepcopy
 
 from .bezier_ops import split_bezier_curve, bezier_base_point
+from .cwrap import get_path_from_cpath
 from .points import rotate_point
-from qc3 import libpango, libcairo, sk2const
+from qc3 import events, sk2const
 
 
 # ------------- Object specific routines -------------
@@ -322,9 +324,16 @@ def get_polygon_paths(corners_num, angle1, angle2, coef1, coef2):
 
 
 def get_text_glyphs(text, width, text_style, markup):
-  return libpango.get_text_paths(text, width, text_style, markup)
+  from qc3 import libpango
+
+  if not events.is_wanted(events.TIMING, "text_layout"):
+    return libpango.get_text_paths(text, width, text_style, markup)
+  start = time.monotonic()
+  glyphs = libpango.get_text_paths(text, width, text_style, markup)
+  events.emit(events.TIMING, "text_layout", None, start, time.monotonic())
+  return glyphs
 
 
 def get_paths_from_glyph(glyph):
-  ret = [item for item in libcairo.get_path_from_cpath(glyph) if item and item[1]]
+  ret = [item for item in get_path_from_cpath(glyph) if item and item[1]]
   return ret if ret else None
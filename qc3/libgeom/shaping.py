@@ -16,27 +16,19 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
-import cairo
 import math
 from copy import deepcopy
 
 from .bbox import is_bbox_overlap, sum_bbox
 from .bezier_ops import bezier_base_point, get_paths_bbox
-from .cwrap import create_cpath
+from .cwrap import create_cpath, get_libcairo
 from .points import mult_point, add_points, distance, midpoint
-from qc3 import libcairo, sk2const
+from qc3 import sk2const
 
-CAPS = {
-  sk2const.CAP_BUTT: cairo.LINE_CAP_BUTT,
-  sk2const.CAP_ROUND: cairo.LINE_CAP_ROUND,
-  sk2const.CAP_SQUARE: cairo.LINE_CAP_SQUARE,
-}
-
-JOINS = {
-  sk2const.JOIN_BEVEL: cairo.LINE_JOIN_BEVEL,
-  sk2const.JOIN_MITER: cairo.LINE_JOIN_MITER,
-  sk2const.JOIN_ROUND: cairo.LINE_JOIN_ROUND,
-}
+# pycairo is imported with first hit surface, see _import_cairo()
+cairo = None
+CAPS = {}
+JOINS = {}
 
 PRECISION = 8
 ZOOM = 100.0
@@ -64,15 +56,35 @@ def equal_points(p0, p1):
   ) == round(p1[1], PRECISION)
 
 
+def _import_cairo():
+  global cairo
+  if cairo is not None:
+    return
+  import cairo
+
+  CAPS.update({
+    sk2const.CAP_BUTT: cairo.LINE_CAP_BUTT,
+    sk2const.CAP_ROUND: cairo.LINE_CAP_ROUND,
+    sk2const.CAP_SQUARE: cairo.LINE_CAP_SQUARE,
+  })
+  JOINS.update({
+    sk2const.JOIN_BEVEL: cairo.LINE_JOIN_BEVEL,
+    sk2const.JOIN_MITER: cairo.LINE_JOIN_MITER,
+    sk2const.JOIN_ROUND: cairo.LINE_JOIN_ROUND,
+  })
+
+
 class ObjHitSurface:
   surface = None
   ctx = None
   canvas = None
   cpaths = None
-  fill_rule = cairo.FILL_RULE_EVEN_ODD
+  fill_rule = None
 
   def __init__(self, obj):
+    _import_cairo()
     self.obj = obj
+    self.fill_rule = cairo.FILL_RULE_EVEN_ODD
     self.surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 1, 1)
     self.ctx = cairo.Context(self.surface)
 
@@ -85,12 +97,12 @@ class ObjHitSurface:
     self.ctx.paint()
     self.ctx.set_source_rgb(0, 0, 0)
 
-  def set_fill_rule(self, rule=cairo.FILL_RULE_WINDING):
-    self.fill_rule = rule
+  def set_fill_rule(self, rule=None):
+    self.fill_rule = cairo.FILL_RULE_WINDING if rule is None else rule
 
   def set_trafo(self, point):
     trafo = [ZOOM, 0.0, 0.0, ZOOM, -point[0] * ZOOM, -point[1] * ZOOM]
-    self.ctx.set_matrix(libcairo.get_matrix_from_trafo(trafo))
+    self.ctx.set_matrix(get_libcairo().get_matrix_from_trafo(trafo))
 
   def check_point(self, point):
     self.clear()
@@ -105,7 +117,7 @@ class ObjHitSurface:
     self.ctx.new_path()
     self.ctx.append_path(self.cpaths)
     self.ctx.stroke()
-    return not libcairo.check_surface_whiteness(self.surface)
+    return not get_libcairo().check_surface_whiteness(self.surface)
 
 
 class StrokeHitSurface:
@@ -115,6 +127,7 @@ class StrokeHitSurface:
   cpaths = None
 
   def __init__(self, obj, stroke_style):
+    _import_cairo()
     self.obj = obj
     self.stroke_style = stroke_style
     self.surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 1, 1)
@@ -131,7 +144,7 @@ class StrokeHitSurface:
 
   def set_trafo(self, point):
     trafo = [ZOOM, 0.0, 0.0, ZOOM, -point[0] * ZOOM, -point[1] * ZOOM]
-    self.ctx.set_matrix(libcairo.get_matrix_from_trafo(trafo))
+    self.ctx.set_matrix(get_libcairo().get_matrix_from_trafo(trafo))
 
   def check_point(self, point):
     self.clear()
@@ -150,7 +163,7 @@ class StrokeHitSurface:
     self.ctx.new_path()
     self.ctx.append_path(self.cpaths)
     self.ctx.stroke()
-    return not libcairo.check_surface_whiteness(self.surface)
+    return not get_libcairo().check_surface_whiteness(self.surface)
 
 
 # --- HASHABLE CONTAINERS
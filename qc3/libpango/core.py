@@ -19,22 +19,45 @@ from copy import deepcopy
 import typing as tp
 import os
 
-import cairo
-
 from qc3 import qc3const
 from . import _libpango
 from .markup import apply_markup, apply_glyph_markup
 
-PANGO_UNITS = 1024
+if tp.TYPE_CHECKING:
+  import cairo
 
-SURFACE = cairo.ImageSurface(cairo.FORMAT_RGB24, 1, 1)
-CTX = cairo.Context(SURFACE)
-DIRECT_MATRIX = cairo.Matrix()
+PANGO_UNITS = 1024
 
-PANGO_MATRIX = cairo.Matrix(1.0, 0.0, 0.0, -1.0, 0.0, 0.0)
-PANGO_LAYOUT = _libpango.create_layout(CTX)
 NONPRINTING_CHARS = " \n\t "
 
+# Cairo matrices, default cairo surface, context and Pango layout are
+# created on first use (DIRECT_MATRIX, PANGO_MATRIX, SURFACE, CTX and
+# PANGO_LAYOUT module attributes), so pycairo is imported there too
+_DEFAULTS = {}
+_DEFAULT_NAMES = ("DIRECT_MATRIX", "PANGO_MATRIX", "SURFACE", "CTX", "PANGO_LAYOUT")
+
+
+def _get_default(name: str) -> tp.Any:
+  if not _DEFAULTS:
+    import cairo
+
+    surface = cairo.ImageSurface(cairo.FORMAT_RGB24, 1, 1)
+    ctx = cairo.Context(surface)
+    _DEFAULTS.update(
+      DIRECT_MATRIX=cairo.Matrix(),
+      PANGO_MATRIX=cairo.Matrix(1.0, 0.0, 0.0, -1.0, 0.0, 0.0),
+      SURFACE=surface,
+      CTX=ctx,
+      PANGO_LAYOUT=_libpango.create_layout(ctx),
+    )
+  return _DEFAULTS[name]
+
+
+def __getattr__(name: str) -> tp.Any:
+  if name in _DEFAULT_NAMES:
+    return _get_default(name)
+  raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 
 def get_version() -> str:
   """Returns Pango version like '1.2.3' string
@@ -74,13 +97,13 @@ def set_glyph_cache(font_name: str, char: str, glyph: qc3const.PathsType):
 # --- Pango context functionality
 
 
-def create_layout(ctx: cairo.Context = CTX) -> qc3const.PyCapsule:
+def create_layout(ctx: tp.Optional["cairo.Context"] = None) -> qc3const.PyCapsule:
   """Creates Pango layout
 
   :param ctx: (cairo.Context|None) Cairo context
   :return: (PyCapsule) Pango layout
   """
-  return _libpango.create_layout(ctx)
+  return _libpango.create_layout(ctx or _get_default("CTX"))
 
 
 def get_font_description(
@@ -102,7 +125,7 @@ def set_layout(
   width: int,
   text_style: list,
   markup: tp.Optional[list] = None,
-  layout: qc3const.PyCapsule = PANGO_LAYOUT,
+  layout: tp.Optional[qc3const.PyCapsule] = None,
 ) -> None:
   """Sets layout markup
 
@@ -112,6 +135,7 @@ def set_layout(
   :param markup: (list|None) markup description list
   :param layout: (PyCapsule) Pango layout
   """
+  layout = layout or _get_default("PANGO_LAYOUT")
   width *= PANGO_UNITS if not width == -1 else 1
   _libpango.set_layout_width(layout, width)
   fnt_descr = get_font_description(text_style)
@@ -128,7 +152,7 @@ def set_glyph_layout(
   markup: tp.Optional[list] = None,
   text_range: tp.Optional[list] = None,
   check_nt: bool = False,
-  layout: qc3const.PyCapsule = PANGO_LAYOUT,
+  layout: tp.Optional[qc3const.PyCapsule] = None,
 ) -> float:
   """Sets glyph layout markup
 
@@ -140,6 +164,7 @@ def set_glyph_layout(
   :param check_nt: (bool) MSW platform check flag
   :param layout: (PyCapsule) Pango layout
   """
+  layout = layout or _get_default("PANGO_LAYOUT")
   text_range = text_range or []
   width *= PANGO_UNITS if not width == -1 else 1
   _libpango.set_layout_width(layout, width)
@@ -152,29 +177,32 @@ def set_glyph_layout(
 
 
 def layout_path(
-  ctx: cairo.Context = CTX, layout: qc3const.PyCapsule = PANGO_LAYOUT
+  ctx: tp.Optional["cairo.Context"] = None,
+  layout: tp.Optional[qc3const.PyCapsule] = None,
 ) -> None:
   """Layouts paths on cairo context
 
   :param ctx: (cairo.Context) The context on which to draw
   :param layout: (PyCapsule) Pango source layout
   """
-  _libpango.layout_path(ctx, layout)
+  ctx = ctx or _get_default("CTX")
+  _libpango.layout_path(ctx, layout or _get_default("PANGO_LAYOUT"))
 
 
 def get_line_positions(
-  layout: qc3const.PyCapsule = PANGO_LAYOUT,
+  layout: tp.Optional[qc3const.PyCapsule] = None,
 ) -> tp.Tuple[float, ...]:
   """Returns line positions
 
   :param layout: (PyCapsule) Pango source layout
   :return: (tuple) line positions
   """
+  layout = layout or _get_default("PANGO_LAYOUT")
   return _libpango.get_layout_line_positions(layout)
 
 
 def get_char_positions(
-  size: int, layout: qc3const.PyCapsule = PANGO_LAYOUT
+  size: int, layout: tp.Optional[qc3const.PyCapsule] = None
 ) -> tp.Tuple[tp.Tuple[float, float, float, float, float], ...]:
   """Returns char positions
 
@@ -182,11 +210,12 @@ def get_char_positions(
   :param layout: (PyCapsule) Pango source layout
   :return: (tuple) char positions
   """
+  layout = layout or _get_default("PANGO_LAYOUT")
   return _libpango.get_layout_char_positions(layout, size)
 
 
 def get_cluster_positions(
-  size: int, layout: qc3const.PyCapsule = PANGO_LAYOUT
+  size: int, layout: tp.Optional[qc3const.PyCapsule] = None
 ) -> tp.Tuple[tp.List[float], tp.List[float], tp.List[float], bool, bool]:
   """Returns cluster positions
 
@@ -194,23 +223,26 @@ def get_cluster_positions(
   :param layout: (PyCapsule) Pango source layout
   :return: (tuple) cluster positions
   """
+  layout = layout or _get_default("PANGO_LAYOUT")
   return _libpango.get_layout_cluster_positions(layout, size)
 
 
-def get_layout_size(layout: qc3const.PyCapsule = PANGO_LAYOUT) -> tp.Tuple[int, int]:
+def get_layout_size(layout: tp.Optional[qc3const.PyCapsule] = None) -> tp.Tuple[int, int]:
   """Returns text layout size
 
   :param layout: (PyCapsule) Pango source layout
   :return: (tuple) text layout size
   """
+  layout = layout or _get_default("PANGO_LAYOUT")
   return _libpango.get_layout_pixel_size(layout)
 
 
-def get_layout_bbox(layout: qc3const.PyCapsule = PANGO_LAYOUT) -> tp.List[float]:
+def get_layout_bbox(layout: tp.Optional[qc3const.PyCapsule] = None) -> tp.List[float]:
   """Returns text layout size
 
   :param layout: (PyCapsule) Pango source layout
   :return: (list) text layout bbox
   """
+  layout = layout or _get_default("PANGO_LAYOUT")
   w, h = get_layout_size(layout)
   return [0.0, 0.0, float(w), float(-h)]
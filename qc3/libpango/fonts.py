@@ -15,14 +15,16 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import cairo
 import html
 import string
 import typing as tp
 
 from qc3 import qc3const
 from . import _libpango
-from .core import PANGO_LAYOUT
+from . import core
+
+if tp.TYPE_CHECKING:
+  import cairo
 
 FAMILIES_LIST = []
 FAMILIES_DICT = {}
@@ -134,12 +136,13 @@ def get_sample_size(
   :param fontsize: (float|int) font
   :return: (tuple) sample size in pixels
   """
-  _set_sample_layout(PANGO_LAYOUT, text, family, fontsize)
-  return _libpango.get_layout_pixel_size(PANGO_LAYOUT)
+  layout = core.PANGO_LAYOUT
+  _set_sample_layout(layout, text, family, fontsize)
+  return _libpango.get_layout_pixel_size(layout)
 
 
 def render_sample(
-  ctx: cairo.Context, text: str, family: str, fontsize: tp.Union[float, int]
+  ctx: "cairo.Context", text: str, family: str, fontsize: tp.Union[float, int]
 ) -> None:
   """Renders sample text on provided Cairo context
 
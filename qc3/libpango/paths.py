@@ -17,10 +17,8 @@
 
 
 import os
-import cairo
 from copy import deepcopy
 
-from qc3 import libcairo
 
 # import core
 from .core import NONPRINTING_CHARS
@@ -206,6 +204,9 @@ def get_log_layout_data(layout_data, byte_dict, rtl_regs):
 
 
 def get_glyphs(ctx, layout_data, text, width, text_style, markup):
+  import cairo
+  from qc3 import libcairo
+
   glyphs = []
   i = -1
   for item in text:
@@ -259,6 +260,9 @@ def get_rtl_glyphs(
   text_style,
   markup,
 ):
+  import cairo
+  from qc3 import libcairo
+
   glyphs = []
   for item in layout_data:
     try:
@@ -301,6 +305,10 @@ def get_rtl_glyphs(
 
 
 def get_text_paths(orig_text, width, text_style, markup):
+  # pycairo is imported on first text layout, not with qc3.libpango
+  import cairo
+  from qc3 import libcairo
+
   if not orig_text:
     orig_text = NONPRINTING_CHARS[0]
     markup = []
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020 by Ihor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Content-hash manifest for incremental bulk translation.
+
+Manifest is stored in output directory and maps output file
+(relative to the directory) to the record of its source:
+input path, input content hash, output format, application
+version and config fingerprint.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import typing as tp
+
+from qc3 import qc3const
+
+LOG = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".qc3-manifest.json"
+MANIFEST_VERSION = 1
+BLOCK_SIZE = 1024 * 1024
+
+# Options which do not affect translation result
+RUNTIME_OPTIONS = (
+  "dry-run",
+  "verbose",
+  "verbose-short",
+  "recursive",
+  "jobs",
+  "incremental",
+  "profile",
+  "split-pictures",
+)
+
+
+def file_hash(path: str) -> str:
+  """Returns SHA-256 hex digest of file content"""
+  digest = hashlib.sha256()
+  with open(path, "rb") as fileptr:
+    for block in iter(lambda: fileptr.read(BLOCK_SIZE), b""):
+      digest.update(block)
+  return digest.hexdigest()
+
+
+def config_fingerprint(config, options: tp.Dict) -> str:
+  """Returns digest of translation options and application config values
+
+  :param config: (QCConfig|None) application config
+  :param options: (dict) translation options
+  """
+  values = {}
+  if config is not None:
+    for key in config.get_defaults():
+      if key.startswith("_") or not hasattr(config, key):
+        continue
+      value = getattr(config, key)
+      if not callable(value):
+        values[key] = value
+  opts = {key: val for key, val in options.items() if key not in RUNTIME_OPTIONS}
+  data = json.dumps([values, opts], sort_keys=True, default=str)
+  return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class ConversionManifest:
+  """Represents manifest of already translated files"""
+
+  path: str
+  dir_path: str
+  entries: tp.Dict[str, tp.Dict]
+  fingerprint: str
+  format: str
+
+  def __init__(self, dir_path: str, saver_id: str, fingerprint: str) -> None:
+    """Loads manifest from output directory (if exists)
+
+    :param dir_path: (str) output directory
+    :param saver_id: (str) output format id
+    :param fingerprint: (str) config fingerprint
+    """
+    self.dir_path = dir_path
+    self.path = os.path.join(dir_path, MANIFEST_FILENAME)
+    self.format = saver_id
+    self.fingerprint = fingerprint
+    self.entries = {}
+    if os.path.isfile(self.path):
+      # noinspection PyBroadException
+      try:
+        with open(self.path, "r") as fileptr:
+          data = json.load(fileptr)
+        if data.get("manifest") == MANIFEST_VERSION:
+          self.entries = data.get("files", {})
+      except Exception:
+        LOG.warning("Manifest %s is corrupted and will be rebuilt", self.path)
+
+  def _key(self, out_filepath: str) -> str:
+    return os.path.relpath(out_filepath, self.dir_path)
+
+  def make_record(self, filepath: str, content_hash: str) -> tp.Dict:
+    return {
+      "input": filepath,
+      "hash": content_hash,
+      "format": self.format,
+      "version": qc3const.VERSION + qc3const.REVISION,
+      "config": self.fingerprint,
+    }
+
+  def is_current(self, out_filepath: str, record: tp.Dict) -> bool:
+    """Checks that output file exists and was created from the same source"""
+    entry = self.entries.get(self._key(out_filepath))
+    return entry == record and os.path.exists(out_filepath)
+
+  def update(self, out_filepath: str, record: tp.Optional[tp.Dict]) -> None:
+    key = self._key(out_filepath)
+    if record is None:
+      self.entries.pop(key, None)
+    else:
+      self.entries[key] = record
+
+  def save(self) -> None:
+    """Writes manifest atomically"""
+    tmp_path = self.path + ".tmp"
+    data = {"manifest": MANIFEST_VERSION, "files": self.entries}
+    with open(tmp_path, "w") as fileptr:
+      json.dump(data, fileptr, indent=1, sort_keys=True)
+    os.replace(tmp_path, self.path)
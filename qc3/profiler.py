@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020 by Ihor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Per-stage timing profiler for '--profile' report.
+
+Profiler collects events.TIMING signals emitted by loaders
+('parse'), presenters ('update', 'to_sk2', 'from_sk2'), savers
+('save') and geometry helpers ('text_layout', 'cpath').
+Stage key is '<format id>.<stage>' or just '<stage>' for
+format independent stages. Note that 'text_layout' and 'cpath'
+are nested into 'update' stage, and 'update' itself may be nested
+into 'save' for translated models, so stage times are not additive.
+
+Report structure:
+  {"files": [{"input": ..., "output": ..., "status": "ok",
+              "wall": 0.52, "stages": {"cgm.parse": {"time": 0.1,
+              "count": 1}, ...}}, ...],
+   "batch": {"files": 10, "failed": 0, "wall": 4.8, "stages": {...}}}
+"""
+
+import json
+import time
+import typing as tp
+
+from qc3 import events
+
+
+class TimingProfiler:
+  """Aggregates TIMING events of single file translation"""
+
+  stages: tp.Dict[str, tp.Dict]
+  start: float
+
+  def __init__(self) -> None:
+    self.stages = {}
+    self.start = 0.0
+
+  def __enter__(self) -> "TimingProfiler":
+    self.start = time.monotonic()
+    events.connect(events.TIMING, self.receiver)
+    return self
+
+  def __exit__(self, *args) -> None:
+    events.disconnect(events.TIMING, self.receiver)
+
+  def receiver(self, stage: str, doc_id: tp.Optional[str], start: float, end: float) -> None:
+    key = "%s.%s" % (doc_id, stage) if doc_id else stage
+    item = self.stages.get(key)
+    if item is None:
+      item = self.stages[key] = {"time": 0.0, "count": 0}
+    item["time"] += end - start
+    item["count"] += 1
+
+  def make_record(self, job: tp.Tuple[str, str], ok: bool) -> tp.Dict:
+    """Returns file record of profiling report
+
+    :param job: (tuple) input and output file paths
+    :param ok: (bool) translation status
+    """
+    return {
+      "input": job[0],
+      "output": job[1],
+      "status": "ok" if ok else "fail",
+      "wall": time.monotonic() - self.start,
+      "stages": self.stages,
+    }
+
+
+class ProfileReport:
+  """Collects file records and aggregates them per batch"""
+
+  records: tp.List[tp.Dict]
+  start: float
+
+  def __init__(self) -> None:
+    self.records = []
+    self.start = time.monotonic()
+
+  def add(self, record: tp.Optional[tp.Dict]) -> None:
+    if record is not None:
+      self.records.append(record)
+
+  def get_report(self) -> tp.Dict:
+    stages = {}
+    for record in self.records:
+      for key, item in record["stages"].items():
+        total = stages.setdefault(key, {"time": 0.0, "count": 0})
+        total["time"] += item["time"]
+        total["count"] += item["count"]
+    return {
+      "files": self.records,
+      "batch": {
+        "files": len(self.records),
+        "failed": sum(record["status"] != "ok" for record in self.records),
+        "wall": time.monotonic() - self.start,
+        "stages": stages,
+      },
+    }
+
+  def save(self, path: str) -> None:
+    with open(path, "w") as fileptr:
+      json.dump(self.get_report(), fileptr, indent=1, sort_keys=True)
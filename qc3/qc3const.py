@@ -326,7 +326,7 @@ BITMAP_LOADERS = [] # [PNG, JPG, PSD, XCF, JP2, TIF, GIF, BMP, PCX, PPM, XBM, XP
 PALETTE_LOADERS = [SOC] # [SKP, GPL, SCRIBUS_PAL, CPL, COREL_PAL, ASE, ACO, JCW]
 EXPERIMENTAL_LOADERS = [] # [MD, RIFF, XML ]
 
-MODEL_SAVERS = [SVG, SK2] # [SVGZ, PLT, PDF, CDR, CMX, CCX, SK1, SK, CGM, FIG, DST]
+MODEL_SAVERS = [SVG, SK2, CGM] # [SVGZ, PLT, PDF, CDR, CMX, CCX, SK1, SK, FIG, DST]
 BITMAP_SAVERS = [] # [PNG]
 PALETTE_SAVERS = [SOC] # [SKP, GPL, SCRIBUS_PAL, CPL, COREL_PAL, ASE, ACO, JCW]
 EXPERIMENTAL_SAVERS = [] # [MD, RIFF, XML, WMF, DST ]
@@ -15,17 +15,25 @@
 #  You should have received a copy of the GNU Affero General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import collections
 import copy
-import glob
+import fnmatch
+import io
+import itertools
 import logging
 import os
+import time
 
-from qc3 import events, qc3const, msgconst
-from qc3.formats import get_loader, get_saver, get_saver_by_id
+from qc3 import events, manifest, profiler, qc3const, msgconst
+from qc3.formats import get_loader, get_loader_by_data, get_loader_by_id
+from qc3.formats import get_saver, get_saver_by_id
+from qc3.utils import workers
 from qc3.utils.mixutils import echo
 
 LOG = logging.getLogger(__name__)
 SAVER_IDS = qc3const.PALETTE_SAVERS + qc3const.MODEL_SAVERS + qc3const.BITMAP_SAVERS
+# In-flight job queue size factor for process pool
+JOBS_PER_WORKER = 4
 
 
 # def normalize_options(options):
@@ -39,12 +47,19 @@ SAVER_IDS = qc3const.PALETTE_SAVERS + qc3const.MODEL_SAVERS + qc3const.BITMAP_SA
 #       options.pop(key)
 
 
-def convert(appdata, files, options):
+def convert(appdata, files, options, timings=None):
+  """Translates files[0] into files[1].
+
+  :param timings: (dict|None) collects wall time (seconds)
+  of translation stages: 'detect', 'load', 'save' and 'total'
+  """
+  timings = {} if timings is None else timings
+  start = stage_start = time.monotonic()
   dry_run = bool(options.get('dry-run'))
   # normalize_options(options)
 
-  msg = 'Translation of "%s" into "%s"' % (files[0], files[1])
-  events.emit(events.MESSAGES, msgconst.JOB, msg)
+  msg = 'Translation of "%s" into "%s"'
+  events.emit_msg(events.MESSAGES, msgconst.JOB, msg, files[0], files[1])
 
   # Define saver -----------------------------------------
   sid = options.get('format', '').lower()
@@ -71,7 +86,9 @@ def convert(appdata, files, options):
     events.emit(events.MESSAGES, msgconst.STOP, msg2)
     raise Exception(msg)
 
+  stage_start = _stage_done(timings, "detect", stage_start)
   if dry_run:
+    timings["total"] = time.monotonic() - start
     return
 
   # File loading -----------------------------------------
@@ -90,6 +107,8 @@ def convert(appdata, files, options):
     events.emit(events.MESSAGES, msgconst.STOP, msg)
     raise
 
+  stage_start = _stage_done(timings, "load", stage_start)
+
   # File saving -----------------------------------------
   if doc is not None:
     try:
@@ -114,10 +133,84 @@ def convert(appdata, files, options):
     raise Exception(msg)
 
   doc.close()
+  _stage_done(timings, "save", stage_start)
+  timings["total"] = time.monotonic() - start
   msg = "Translation is successful"
   events.emit(events.MESSAGES, msgconst.OK, msg)
 
 
+def single_convert(appdata, files, options):
+  """Translates files[0] into files[1] writing timing report
+  into options['profile'] file (if provided).
+  """
+  if not options.get("profile"):
+    return convert(appdata, files, options)
+  report = profiler.ProfileReport()
+  prof = profiler.TimingProfiler()
+  ok = False
+  try:
+    with prof:
+      convert(appdata, files, options)
+      ok = True
+  finally:
+    report.add(prof.make_record(files, ok))
+    report.save(options["profile"])
+
+
+def convert_data(appdata, data, out_format, in_format=None, options=None):
+  """Translates in-memory file content. Input format is detected
+  from content if not provided.
+
+  :param data: (bytes|file object) input file content
+  :param out_format: (str) output format id, e.g. 'svg'
+  :param in_format: (str|None) input format id
+  :param options: (dict|None) translation options
+  :return: (bytes) output file content
+  """
+  options = options or {}
+  if hasattr(data, "read"):
+    data = data.read()
+  data = bytes(data)
+
+  saver_id = out_format.lower()
+  saver = get_saver_by_id(saver_id) if saver_id in SAVER_IDS else None
+  if saver is None:
+    raise ValueError('Output file format "%s" is unsupported.' % out_format)
+
+  if in_format:
+    loader_id = in_format.lower()
+    loader = get_loader_by_id(loader_id)
+  else:
+    loader, loader_id = get_loader_by_data(data, return_id=True)
+  if loader is None:
+    raise ValueError("Input data format is unsupported.")
+
+  palette = loader_id in qc3const.PALETTE_LOADERS and saver_id in qc3const.PALETTE_SAVERS
+  kw = copy.deepcopy(options)
+  if palette:
+    doc = loader(appdata, None, io.BytesIO(data), convert=True, **kw)
+  else:
+    doc = loader(appdata, None, io.BytesIO(data), **kw)
+  if doc is None:
+    raise Exception("Error creating model for in-memory data")
+
+  output = io.BytesIO()
+  try:
+    if palette:
+      saver(doc, None, output, translate=False, convert=True, **kw)
+    else:
+      saver(doc, None, output, **kw)
+  finally:
+    doc.close()
+  return output.getvalue()
+
+
+def _stage_done(timings, stage, stage_start):
+  now = time.monotonic()
+  timings[stage] = now - stage_start
+  return now
+
+
 def _get_saver_extension(options):
   if "format" not in options:
     msg = "Output file format is not defined."
@@ -138,33 +231,192 @@ def _get_saver_extension(options):
   return qc3const.FORMAT_EXTENSION[sid][0]
 
 
-def _get_filelist(path, subpath, wildcard, recursive=False):
-  dir_path = os.path.join(path, subpath)
-  wildcard_path = os.path.join(dir_path, wildcard)
-  filelist = [
-    (item, subpath, os.path.basename(item).split(".", 1)[0])
-    for item in glob.glob(wildcard_path)
-    if os.path.isfile(item)
-  ]
+def _iter_filelist(path, subpath, wildcard, recursive=False):
+  """Walks directory tree and yields (filepath, subpath, filename)
+  tuples for matched files as soon as they are found.
+  Like glob, hidden files are matched by explicit '.' prefix only.
+  """
+  hidden = wildcard.startswith(".")
+  pending = [subpath]
+  while pending:
+    subpath = pending.pop()
+    dir_path = os.path.join(path, subpath)
+    subdirs = []
+    try:
+      with os.scandir(dir_path or os.curdir) as it:
+        for entry in it:
+          name = entry.name
+          if recursive and entry.is_dir():
+            subdirs.append(os.path.join(subpath, name))
+          elif (hidden or not name.startswith(".")) and \
+              fnmatch.fnmatch(name, wildcard) and entry.is_file():
+            yield os.path.join(dir_path, name), subpath, name.split(".", 1)[0]
+    except OSError as e:
+      LOG.warning("Cannot scan directory %s: %s", dir_path, e)
+    pending.extend(reversed(subdirs))
+
+
+def _report(verbose, verbose_short, filepath, out_filepath, ok):
+  if ok and verbose:
+    echo()
+  elif verbose_short:
+    echo('Translation of "%s"' % filepath)
+    echo('into "%s" ...[%s]\n' % (out_filepath, "  OK  " if ok else " FAIL "))
+
+
+def _try_convert(appdata, job, options):
+  # noinspection PyBroadException
+  try:
+    convert(appdata, job, options)
+  except Exception:
+    return False
+  return True
 
-  if recursive:
-    dirs = [
-      item
-      for item in os.listdir(dir_path)
-      if os.path.isdir(os.path.join(dir_path, item))
-    ]
-    for item in dirs:
-      filelist += _get_filelist(path, os.path.join(subpath, item), wildcard, recursive)
-  return filelist
 
+def _convert_job(appdata, job, options):
+  """Translates single (filepath, out_filepath) job
 
-def multiple_convert(appdata, files, options):
-  saver_ext = _get_saver_extension(options)
+  :return: (tuple) translation status and timing record
+  (None if profiling is not requested)
+  """
+  kw = copy.deepcopy(options)
+  if not options.get("profile"):
+    return _try_convert(appdata, job, kw), None
+  with profiler.TimingProfiler() as prof:
+    ok = _try_convert(appdata, job, kw)
+  return ok, prof.make_record(job, ok)
+
+
+def _worker_convert(job, options):
+  return _convert_job(workers.get_worker_appdata(), job, options)
+
+
+def _batch_convert(appdata, jobs, options, on_done=None):
+  """Converts (filepath, out_filepath) jobs either in current process
+  or in process pool depending on 'jobs' option. Jobs are consumed
+  lazily so translation starts before the job source is exhausted.
+
+  :param on_done: (callable|None) called as on_done(job, status)
+  :return: (int) number of failed translations
+  """
   verbose = bool(options.get("verbose"))
   verbose_short = bool(options.get("verbose-short"))
+  pool_size = max(1, int(options.get("jobs") or 1))
+  jobs = iter(jobs)
+  head = list(itertools.islice(jobs, 2))
+  jobs = itertools.chain(head, jobs)
+  report = profiler.ProfileReport() if options.get("profile") else None
+  failed = 0
+
+  def done(job, result):
+    nonlocal failed
+    ok, record = result
+    failed += not ok
+    if report is not None:
+      report.add(record)
+    _report(verbose, verbose_short, job[0], job[1], ok)
+    if on_done is not None:
+      on_done(job, ok)
+
+  if pool_size == 1 or len(head) < 2:
+    for job in jobs:
+      done(job, _convert_job(appdata, job, options))
+    return _batch_done(report, options, failed)
+
+  executor = workers.get_executor(appdata, pool_size)
+  # Bounded queue of in-flight jobs keeps memory flat
+  # and reports results in submission order
+  queue = collections.deque()
+  with executor:
+    for job in jobs:
+      queue.append((job, executor.submit(_worker_convert, job, options)))
+      while len(queue) >= pool_size * JOBS_PER_WORKER or queue[0][1].done():
+        job, future = queue.popleft()
+        done(job, future.result())
+        if not queue:
+          break
+    while queue:
+      job, future = queue.popleft()
+      done(job, future.result())
+  return _batch_done(report, options, failed)
+
+
+def _batch_done(report, options, failed):
+  if report is not None:
+    report.save(options["profile"])
+  return failed
+
+
+def _skip_collisions(jobs, skipped):
+  """Yields jobs which output file is not produced by previous job.
+  Several inputs may map to the same output name, e.g. 'a.rev1.cgm'
+  and 'a.rev2.cgm', only first one is translated, so pool workers
+  never write the same file.
+
+  :param skipped: (list) collects skipped jobs
+  """
+  outputs = {}
+  for filepath, out_filepath in jobs:
+    if out_filepath in outputs:
+      msg = 'File "%s" is skipped, output "%s" is produced from "%s"'
+      events.emit_msg(
+        events.MESSAGES, msgconst.ERROR, msg, filepath, out_filepath, outputs[out_filepath]
+      )
+      skipped.append((filepath, out_filepath))
+      continue
+    outputs[out_filepath] = filepath
+    yield filepath, out_filepath
+
+
+def _incremental_convert(appdata, jobs, options, dir_path):
+  """Skips jobs which are up to date according to output directory
+  manifest, translates the rest and updates the manifest.
+  """
+  saver_id = options.get("format", "").lower()
+  fingerprint = manifest.config_fingerprint(appdata.app.config, options)
+  mft = manifest.ConversionManifest(dir_path, saver_id, fingerprint)
+  records = {}
+
+  def pending():
+    for filepath, out_filepath in jobs:
+      record = mft.make_record(filepath, manifest.file_hash(filepath))
+      if mft.is_current(out_filepath, record):
+        msg = 'File "%s" is up to date, skipped'
+        events.emit_msg(events.MESSAGES, msgconst.INFO, msg, filepath)
+        continue
+      records[filepath] = record
+      yield filepath, out_filepath
+
+  def on_done(job, ok):
+    record = records.pop(job[0], None)
+    mft.update(job[1], record if ok else None)
+
+  failed = _batch_convert(appdata, pending(), options, on_done)
+  if not options.get("dry-run"):
+    mft.save()
+  return failed
+
+
+def _run_jobs(appdata, jobs, options, dir_path):
+  """Translates (filepath, out_filepath) jobs
+
+  :return: (int) number of failed and skipped by output collision jobs
+  """
+  collisions = []
+  jobs = _skip_collisions(jobs, collisions)
+  if options.get("incremental"):
+    failed = _incremental_convert(appdata, jobs, options, dir_path)
+  else:
+    failed = _batch_convert(appdata, jobs, options)
+  return failed + len(collisions)
+
+
+def multiple_convert(appdata, files, options):
+  saver_ext = _get_saver_extension(options)
 
   filelist = files[:-1]
   dir_path = files[-1]
+  jobs = []
   for filepath in filelist:
     if not os.path.exists(filepath):
       msg = 'File "%s" is not found' % filepath
@@ -172,50 +424,30 @@ def multiple_convert(appdata, files, options):
       continue
     filename = os.path.basename(filepath).split(".", 1)[0]
     out_filepath = os.path.join(dir_path, "%s.%s" % (filename, saver_ext))
-    kw = copy.deepcopy(options)
-    # noinspection PyBroadException
-    try:
-      convert(appdata, (filepath, out_filepath), kw)
-      if verbose:
-        echo()
-      elif verbose_short:
-        echo('Translation of "%s"' % filepath)
-        echo('into "%s" ...[  OK  ]\n' % out_filepath)
-    except Exception:
-      if verbose_short:
-        echo('Translation of "%s"' % filepath)
-        echo('into "%s" ...[ FAIL ]\n' % out_filepath)
+    jobs.append((filepath, out_filepath))
+  return _run_jobs(appdata, jobs, options, dir_path)
 
 
 def wildcard_convert(appdata, files, options):
   saver_ext = _get_saver_extension(options)
-  verbose = bool(options.get("verbose"))
-  verbose_short = bool(options.get("verbose-short"))
 
   path = os.path.dirname(files[0])
   wildcard = os.path.basename(files[0])
 
-  filelist = _get_filelist(path, "", wildcard, bool(options.get("recursive")))
-  if not filelist:
+  filelist = _iter_filelist(path, "", wildcard, bool(options.get("recursive")))
+  first = next(filelist, None)
+  if first is None:
     msg = 'There are not files for requested wildcard "%s"' % wildcard
     events.emit(events.MESSAGES, msgconst.STOP, msg)
-    return
-
-  for filepath, subpath, filename in filelist:
-    dir_path = os.path.join(files[1], subpath)
-    if not os.path.exists(dir_path):
-      os.makedirs(dir_path)
-    out_filepath = os.path.join(dir_path, "%s.%s" % (filename, saver_ext))
-    kw = copy.deepcopy(options)
-    # noinspection PyBroadException
-    try:
-      convert(appdata, (filepath, out_filepath), kw)
-      if verbose:
-        echo()
-      elif verbose_short:
-        echo('Translation of "%s"' % filepath)
-        echo('into "%s" ...[  OK  ]\n' % out_filepath)
-    except Exception:
-      if verbose_short:
-        echo('Translation of "%s"' % filepath)
-        echo('into "%s" ...[ FAIL ]\n' % out_filepath)
+    return 0
+
+  def jobs():
+    created = set()
+    for filepath, subpath, filename in itertools.chain((first,), filelist):
+      dir_path = os.path.join(files[1], subpath)
+      if dir_path not in created:
+        os.makedirs(dir_path, exist_ok=True)
+        created.add(dir_path)
+      yield filepath, os.path.join(dir_path, "%s.%s" % (filename, saver_ext))
+
+  return _run_jobs(appdata, jobs(), options, files[1])
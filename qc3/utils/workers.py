@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+#  Copyright (C) 2020 by Ihor E. Novikov
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Affero General Public License
+#  as published by the Free Software Foundation, either version 3
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Affero General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Process pool shared by bulk translation and format translators.
+
+Every pool worker builds own application instance like the current
+one, see get_worker_appdata().
+"""
+
+import concurrent.futures
+import logging
+
+from qc3 import events
+
+_WORKER_APPDATA = None
+
+
+def _init_worker(app_path, do_verbose, log_level):
+  """Builds process-local application instance for pool worker."""
+  global _WORKER_APPDATA
+  from qc3.application import QCApplication
+
+  # Forked worker inherits message receivers and log handlers of parent
+  # process, so they are dropped to avoid duplicated output.
+  # Inherited handlers are not closed to not flush parent's buffers twice.
+  events.clean_all_channels()
+  root_logger = logging.getLogger()
+  for handler in root_logger.handlers[:]:
+    root_logger.removeHandler(handler)
+
+  app = QCApplication(app_path)
+  app.init_runtime(do_verbose, log_level)
+  _WORKER_APPDATA = app.appdata
+
+
+def get_worker_appdata():
+  """Returns application data of current pool worker
+  (None if called outside of worker process).
+  """
+  return _WORKER_APPDATA
+
+
+def get_executor(appdata, workers):
+  """Creates process pool which workers build own application
+  instance like current one, see get_worker_appdata().
+  """
+  app = appdata.app
+  # Library usage does not initialize CLI runtime attributes
+  do_verbose = getattr(app, "do_verbose", False)
+  log_level = getattr(app, "log_level", "INFO")
+  return concurrent.futures.ProcessPoolExecutor(
+    max_workers=workers,
+    initializer=_init_worker,
+    initargs=(app.path, do_verbose, log_level),
+  )
@@ -1,7 +1,135 @@
 # -*- coding: utf-8 -*-
 
-import sys
+"""
+Test environment setup, import it before qc3 modules.
+
+Tests cover pure Python parts of the package (CGM codec, translators,
+batch conversion, serializers). When runtime helpers (qc3.utils fs,
+fsutils, mixutils, config, sconfig and qc3.configure) are not
+available, they are replaced by minimal stand-ins. qc3.cms and
+format packages, which import compiled extensions in __init__, are
+registered without running __init__ when they cannot be imported,
+so their pure Python submodules stay importable.
+
+HAS_EXTENSIONS is False when compiled extensions (lcms2, cairo) are
+not built, tests which update or render SK2 documents are skipped then.
+"""
+
+import importlib
+import logging
 import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import shutil
+import sys
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import qc3
+
+try:
+  import sample
+except ImportError:
+  # Project template placeholder, see test_advanced
+  sample = None
+
+FORMAT_PACKAGES = ("cgm", "sk2", "svg", "xml_", "skp", "soc")
+
+
+def _is_missing(name):
+  try:
+    importlib.import_module(name)
+  except ImportError:
+    return True
+  return False
+
+
+def _add_module(name, module):
+  sys.modules[name] = module
+  parent, _dot, child = name.rpartition(".")
+  setattr(sys.modules[parent], child, module)
+
+
+def _add_stand_in(name, **attrs):
+  if _is_missing(name):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    _add_module(name, module)
+
+
+def _add_package(name):
+  if _is_missing(name):
+    module = types.ModuleType(name)
+    module.__path__ = [os.path.join(ROOT, *name.split("."))]
+    _add_module(name, module)
+
+
+def _get_fileptr(path, writable=False, binary=True):
+  return open(path, ("w" if writable else "r") + ("b" if binary else ""))
+
+
+def _merge_cnf(cnf=None, kw=None):
+  merged = dict(cnf or {})
+  merged.update(kw or {})
+  return merged
+
+
+class _Decomposable:
+  def destroy(self):
+    for key in list(self.__dict__.keys()):
+      self.__dict__[key] = None
+
+
+class _DecomposableTreeObject(_Decomposable):
+  parent = None
+  childs = []
+
+  def destroy(self):
+    for child in self.childs:
+      child.destroy()
+    _Decomposable.destroy(self)
+
+
+class _Config:
+  def update(self, cnf=None):
+    for key, value in (cnf or {}).items():
+      setattr(self, key, value)
+
+  def load(self, *args):
+    pass
+
+  def save(self, *args):
+    pass
+
+
+_add_stand_in(
+  "qc3.utils.fs",
+  get_file_extension=lambda path: os.path.splitext(path)[1].lower().lstrip("."),
+  xremove_dir=lambda path: shutil.rmtree(path, True),
+)
+_add_stand_in(
+  "qc3.utils.fsutils",
+  get_fileptr=_get_fileptr,
+  exists=os.path.exists,
+  isfile=os.path.isfile,
+  isdir=os.path.isdir,
+  normalize_path=os.path.normpath,
+)
+_add_stand_in(
+  "qc3.utils.mixutils",
+  echo=lambda msg="": sys.stdout.write(msg + "\n"),
+  config_logging=lambda filepath=None, level="INFO": logging.getLogger(),
+  merge_cnf=_merge_cnf,
+  Decomposable=_Decomposable,
+  DecomposableTreeObject=_DecomposableTreeObject,
+)
+_add_stand_in("qc3.utils.config", XmlConfigParser=_Config)
+_add_stand_in("qc3.utils.sconfig", SerializedConfig=_Config)
+_add_stand_in("qc3.configure", set_values=lambda *args: None)
+
+HAS_EXTENSIONS = not (_is_missing("qc3.cms.libcms") or _is_missing("qc3.libcairo"))
 
-import sample
+_add_package("qc3.cms")
+_add_package("qc3.formats")
+for _name in FORMAT_PACKAGES:
+  _add_package("qc3.formats." + _name)
@@ -8,6 +8,7 @@ import unittest
 class AdvancedTestSuite(unittest.TestCase):
     """Advanced test cases."""
 
+    @unittest.skipIf(sample is None, "sample package is not available")
     def test_thoughts(self):
         self.assertIsNone(sample.hmm())
 
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import concurrent.futures
+import os
+import tempfile
+import time
+import types
+import unittest
+from unittest import mock
+
+from qc3 import translate
+
+
+def fake_convert(appdata, files, options):
+  """Copies source into output, 'slow' sources take longer, 'bad' ones fail"""
+  with open(files[0], "rb") as fileptr:
+    content = fileptr.read()
+  if content.startswith(b"slow"):
+    time.sleep(0.05)
+  if content.startswith(b"bad"):
+    raise Exception("Cannot translate %s" % files[0])
+  with open(files[1], "wb") as fileptr:
+    fileptr.write(content)
+
+
+def get_executor(appdata, workers):
+  return concurrent.futures.ThreadPoolExecutor(workers)
+
+
+class BatchTestSuite(unittest.TestCase):
+  """Batch translation test cases."""
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.src_dir = os.path.join(self.tmp.name, "src")
+    self.out_dir = os.path.join(self.tmp.name, "out")
+    os.makedirs(self.src_dir)
+    os.makedirs(self.out_dir)
+    app = types.SimpleNamespace(config=None)
+    self.appdata = types.SimpleNamespace(app=app)
+    self.options = {"format": "svg"}
+    patcher = mock.patch.object(translate, "convert", side_effect=fake_convert)
+    self.convert = patcher.start()
+    self.addCleanup(patcher.stop)
+    # Thread pool keeps patched translation, job queue is the same
+    patcher = mock.patch.object(translate.workers, "get_executor", get_executor)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def make_files(self, files):
+    paths = []
+    for name, content in files:
+      path = os.path.join(self.src_dir, name)
+      with open(path, "wb") as fileptr:
+        fileptr.write(content)
+      paths.append(path)
+    return paths
+
+  def run_multiple(self, files, **options):
+    options.update(self.options)
+    return translate.multiple_convert(self.appdata, files + [self.out_dir], options)
+
+  def run_batch(self, files, **options):
+    options.update(self.options)
+    jobs = [(path, path + ".svg") for path in files]
+    finished = []
+
+    def on_done(job, ok):
+      finished.append((os.path.basename(job[0]), ok))
+
+    failed = translate._batch_convert(self.appdata, iter(jobs), options, on_done)
+    return failed, finished
+
+  def test_jobs_finish_in_submission_order(self):
+    names = ["%02d.cgm" % index for index in range(12)]
+    contents = [b"slow" if index % 3 == 0 else b"good" for index in range(12)]
+    files = self.make_files(zip(names, contents))
+    for jobs in (1, 3):
+      failed, finished = self.run_batch(files, jobs=jobs)
+      self.assertEqual(failed, 0)
+      self.assertEqual(finished, [(name, True) for name in names])
+
+  def test_parallel_failures_are_counted(self):
+    files = self.make_files([("a.cgm", b"bad"), ("b.cgm", b"good"), ("c.cgm", b"bad")])
+    failed, finished = self.run_batch(files, jobs=2)
+    self.assertEqual(failed, 2)
+    self.assertEqual(finished, [("a.cgm", False), ("b.cgm", True), ("c.cgm", False)])
+
+  def test_failures_are_reported(self):
+    files = self.make_files([("a.cgm", b"good"), ("b.cgm", b"bad")])
+    self.assertEqual(self.run_multiple(files), 1)
+    self.assertEqual(self.run_multiple(files, jobs=2), 1)
+
+  def test_collisions_are_skipped(self):
+    files = self.make_files([("a.rev1.cgm", b"first"), ("a.rev2.cgm", b"second"),
+                             ("b.cgm", b"good")])
+    self.assertEqual(self.run_multiple(files), 1)
+    self.assertEqual(self.convert.call_count, 2)
+    with open(os.path.join(self.out_dir, "a.svg"), "rb") as fileptr:
+      self.assertEqual(fileptr.read(), b"first")
+
+  def test_incremental_reports_failures(self):
+    files = self.make_files([("a.cgm", b"good"), ("b.cgm", b"bad")])
+    self.assertEqual(self.run_multiple(files, incremental=True), 1)
+
+  def test_incremental_reports_collisions(self):
+    files = self.make_files([("a.rev1.cgm", b"first"), ("a.rev2.cgm", b"second")])
+    self.assertEqual(self.run_multiple(files, incremental=True), 1)
+    with open(os.path.join(self.out_dir, "a.svg"), "rb") as fileptr:
+      self.assertEqual(fileptr.read(), b"first")
+
+  def test_incremental_skips_current_files(self):
+    files = self.make_files([("a.cgm", b"good"), ("b.cgm", b"good")])
+    self.assertEqual(self.run_multiple(files, incremental=True), 0)
+    self.assertEqual(self.convert.call_count, 2)
+    self.assertEqual(self.run_multiple(files, incremental=True), 0)
+    self.assertEqual(self.convert.call_count, 2)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+BENCH_PATH = os.path.join(context.ROOT, "benchmarks", "convert_bench.py")
+SAMPLE = os.path.join(context.ROOT, "samples", "cgm", "corvette.cgm")
+
+
+def load_bench():
+  spec = importlib.util.spec_from_file_location("convert_bench", BENCH_PATH)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+
+def make_run(stages, stage_rss, peak_rss, sizes):
+  return {
+    "stages": dict(zip(("cgm_to_sk2", "update", "svg_save", "sk2_save"), stages)),
+    "total": sum(stages),
+    "stage_peak_rss_kb": dict(zip(("cgm_to_sk2", "update"), stage_rss)),
+    "peak_rss_kb": peak_rss,
+    "output_size": dict(zip(("svg", "sk2"), sizes)),
+  }
+
+
+class ConvertBenchTestSuite(unittest.TestCase):
+  """Conversion benchmark aggregation and comparison test cases."""
+
+  THRESHOLDS = {"time": 0.10, "rss": 0.10, "size": 0.0}
+
+  def setUp(self):
+    self.bench = load_bench()
+
+  def test_aggregate(self):
+    runs = [
+      make_run([1.0, 0.5, 0.2, 0.1], [100, 120], 130, [10, 20]),
+      make_run([0.8, 0.6, 0.3, 0.1], [110, 115], 125, [10, 21]),
+    ]
+    result = self.bench.aggregate(runs)
+    self.assertEqual(result["stages"], {"cgm_to_sk2": 0.8, "update": 0.5,
+                                        "svg_save": 0.2, "sk2_save": 0.1})
+    self.assertAlmostEqual(result["total"], 1.6)
+    self.assertEqual(result["stage_peak_rss_kb"], {"cgm_to_sk2": 100, "update": 115})
+    self.assertEqual(result["peak_rss_kb"], 125)
+    self.assertEqual(result["output_size"], {"svg": 10, "sk2": 21})
+
+  def compare(self, sample, base):
+    return self.bench.compare({"samples": {"a.cgm": sample}},
+                              {"samples": {"a.cgm": base}}, self.THRESHOLDS)
+
+  def test_no_regressions(self):
+    base = make_run([1.0, 0.5, 0.2, 0.1], [100, 120], 130, [10, 20])
+    sample = make_run([1.05, 0.4, 0.2, 0.1], [100, 120], 140, [10, 19])
+    self.assertEqual(self.compare(sample, base), [])
+    # Samples missing in baseline are not compared
+    self.assertEqual(self.bench.compare({"samples": {"b.cgm": sample}},
+                                        {"samples": {"a.cgm": base}},
+                                        self.THRESHOLDS), [])
+
+  def test_regressions(self):
+    base = make_run([1.0, 0.5, 0.2, 0.1], [100, 120], 130, [10, 20])
+    sample = make_run([1.0, 0.6, 0.2, 0.1], [100, 120], 150, [11, 20])
+    regressions = self.compare(sample, base)
+    self.assertEqual([item.split(":")[0] for item in regressions],
+                     ["a.cgm update time", "a.cgm peak RSS", "a.cgm svg size"])
+    self.assertTrue(regressions[0].endswith("(+20.0%)"))
+
+  @unittest.skipUnless(context.HAS_EXTENSIONS, "compiled extensions are not built")
+  def test_sample_run(self):
+    with tempfile.TemporaryDirectory() as out_dir:
+      output = subprocess.check_output(
+        [sys.executable, BENCH_PATH, "--worker", SAMPLE, out_dir])
+    result = json.loads(output.decode("utf-8").splitlines()[-1])
+    self.assertEqual(set(result["stages"]), set(self.bench.STAGES))
+    self.assertAlmostEqual(result["total"], sum(result["stages"].values()))
+    self.assertGreater(result["stages"]["update"], 0.0)
+    self.assertGreater(result["output_size"]["svg"], 0)
+    self.assertGreater(result["output_size"]["sk2"], 0)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import io
+import os
+import unittest
+
+from qc3 import events, qc3const
+from qc3.formats.cgm import cgm_const, cgm_filters, cgm_utils
+from qc3.formats.cgm.cgm_to_sk2 import CGM_to_SK2_Translator, iter_model
+from .test_cgm_to_sk2 import dump as dump_page
+
+SAMPLES_DIR = os.path.join(context.ROOT, "samples", "cgm")
+# allprims.cgm is truncated (last element is longer than file)
+SAMPLES = ("corvette.cgm", "nasa.cgm", "techdraw.cgm",
+           "ICN-S1000DBIKE-AAA-DA53000-0-U8025-00535-A-04-1.CGM")
+
+
+def read_sample(name):
+  with open(os.path.join(SAMPLES_DIR, name), "rb") as fileptr:
+    return fileptr.read()
+
+
+def dump(elements):
+  # Folders are not elements, replacement element params
+  # are kept by its childs in CGM model
+  return [(element.element_id,
+           b"" if element.element_id == cgm_const.METAFILE_DEFAULTS_REPLACEMENT
+           else bytes(element.params[:element.params_sz]))
+          for element in elements if element.element_id != -1]
+
+
+def make_pictures(count):
+  buf = bytearray()
+  cgm_utils.pack_element(buf, cgm_const.BEGIN_METAFILE, b"\x01m")
+  for index in range(count):
+    cgm_utils.pack_element(buf, cgm_const.BEGIN_PICTURE, bytes([1, index]))
+    cgm_utils.pack_element(buf, cgm_const.POLYLINE, bytes([index]) * 40)
+    cgm_utils.pack_element(buf, cgm_const.END_PICTURE)
+  cgm_utils.pack_element(buf, cgm_const.END_METAFILE)
+  return bytes(buf)
+
+
+class CgmRecordsTestSuite(unittest.TestCase):
+  """Streaming CGM element records test cases."""
+
+  def setUp(self):
+    self.signals = []
+    for channel in (events.TIMING, events.FILTER_INFO):
+      events.connect(channel, self.receiver)
+      self.addCleanup(events.disconnect, channel, self.receiver)
+
+  def receiver(self, *args):
+    self.signals.append(args)
+
+  def test_records_match_model(self):
+    for name in SAMPLES:
+      with self.subTest(sample=name):
+        data = memoryview(read_sample(name))
+        self.assertEqual(dump(cgm_filters.iter_records(data)),
+                         dump(iter_model(cgm_filters.build_model(data))))
+
+  def test_defaults_replacement(self):
+    buf = bytearray()
+    nested = bytearray()
+    cgm_utils.pack_element(nested, cgm_const.LINE_WIDTH, b"\x00\x02")
+    cgm_utils.pack_element(buf, cgm_const.BEGIN_METAFILE)
+    cgm_utils.pack_element(buf, cgm_const.METAFILE_DEFAULTS_REPLACEMENT, bytes(nested))
+    cgm_utils.pack_element(buf, cgm_const.END_METAFILE)
+    records = list(cgm_filters.iter_records(bytes(buf)))
+    self.assertEqual([record.element_id for record in records], [
+      cgm_const.BEGIN_METAFILE,
+      cgm_const.METAFILE_DEFAULTS_REPLACEMENT,
+      cgm_const.LINE_WIDTH,
+      cgm_const.END_METAFILE,
+    ])
+    self.assertEqual(bytes(records[2].params[:records[2].params_sz]), b"\x00\x02")
+
+  def test_read_records(self):
+    data = make_pictures(3)
+    records = list(cgm_filters.read_records(fileptr=io.BytesIO(data)))
+    self.assertEqual(dump(records), dump(cgm_filters.iter_records(data)))
+    stages = [signal for signal in self.signals if signal[0] == "parse"]
+    self.assertEqual(len(stages), 1)
+    self.assertEqual(stages[0][1], qc3const.CGM)
+    self.assertLessEqual(stages[0][2], stages[0][3])
+
+  def test_read_pages(self):
+    data = make_pictures(3)
+    records = cgm_filters.read_records(fileptr=io.BytesIO(data), pages=(2, 3))
+    pictures = [bytes(record.params) for record in records
+                if record.element_id == cgm_const.BEGIN_PICTURE]
+    self.assertEqual(pictures, [b"\x01\x01", b"\x01\x02"])
+
+  def test_progress(self):
+    data = make_pictures(100)
+    list(cgm_filters.read_records(fileptr=io.BytesIO(data)))
+    values = [signal[1] for signal in self.signals if signal[0] != "parse"]
+    self.assertTrue(values)
+    self.assertEqual(values, sorted(values))
+    self.assertLessEqual(values[-1], 0.95)
+
+  def test_no_receivers(self):
+    for channel in (events.TIMING, events.FILTER_INFO):
+      events.disconnect(channel, self.receiver)
+      self.addCleanup(events.connect, channel, self.receiver)
+    records = iter([1, 2, 3])
+    self.assertEqual(list(cgm_filters.track_records(records, 100)), [1, 2, 3])
+
+
+@unittest.skipUnless(context.HAS_EXTENSIONS, "compiled extensions are not built")
+class StreamTranslationTestSuite(unittest.TestCase):
+  """Streaming CGM -> SK2 translation test cases."""
+
+  def setUp(self):
+    from qc3 import qc3_init
+
+    self.app = qc3_init()
+    self.app.init_color_management()
+
+  def translate(self, elements):
+    from qc3.formats.sk2.sk2_presenter import SK2_Presenter
+
+    sk2_doc = SK2_Presenter(self.app.appdata)
+    CGM_to_SK2_Translator().translate_records(elements, sk2_doc)
+    pages = [dump_page(page) for page in sk2_doc.methods.get_pages()]
+    sk2_doc.close()
+    return pages
+
+  def test_records_match_model(self):
+    for name in SAMPLES:
+      with self.subTest(sample=name):
+        data = memoryview(read_sample(name))
+        self.assertEqual(
+          self.translate(cgm_filters.iter_records(data)),
+          self.translate(iter_model(cgm_filters.build_model(data))))
+
+
+if __name__ == '__main__':
+  unittest.main()
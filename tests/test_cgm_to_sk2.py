@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import copy
+import os
+import struct
+import tempfile
+import unittest
+
+from qc3 import libgeom, sk2const
+from qc3.formats.cgm import cgm_const, cgm_filters, cgm_model, cgm_utils
+from qc3.formats.cgm.cgm_to_sk2 import CGM_to_SK2_Translator, arc_bbox, circle_bbox
+from qc3.formats.sk2 import sk2_config, sk2_model
+
+SAMPLE = os.path.join(context.ROOT, "samples", "cgm", "corvette.cgm")
+
+
+def make_multi_picture(path):
+  """Writes copy of sample with second, truncated picture,
+  so pictures translate to pages of different content.
+  """
+  with open(SAMPLE, "rb") as fileptr:
+    data = fileptr.read()
+  descriptor_end, pictures = cgm_utils.scan_pictures(data)
+  start, end = pictures[0]
+  elements = [(element_id, bytes(params[:size]))
+              for element_id, size, _header, params
+              in cgm_utils.iter_elements(data, start, end)]
+  buf = bytearray(data[:end])
+  for element_id, params in elements[:len(elements) // 2]:
+    cgm_utils.pack_element(buf, element_id, params)
+  cgm_utils.pack_element(buf, cgm_const.END_PICTURE)
+  buf += data[end:]
+  with open(path, "wb") as fileptr:
+    fileptr.write(buf)
+
+
+def iter_objects(obj):
+  stack = [obj]
+  while stack:
+    obj = stack.pop()
+    yield obj
+    stack.extend(obj.childs)
+
+
+def dump(obj):
+  return (obj.cid, getattr(obj, "name", None), getattr(obj, "paths", None),
+          getattr(obj, "style", None), [dump(child) for child in obj.childs])
+
+
+def make_path(x, y):
+  return [[x, y], [[x + 10.0, y], [x + 10.0, y + 5.0]], sk2const.CURVE_OPENED]
+
+
+def old_handler(translator, element_id):
+  """Handler lookup of former if-chain dispatching"""
+  signature = cgm_const.CGM_ID.get(element_id, "").replace(" ", "_").lower()
+  if signature:
+    return getattr(translator, "_" + signature, None)
+  return None
+
+
+class RecordingTranslator(CGM_to_SK2_Translator):
+  def __init__(self):
+    self.calls = []
+    CGM_to_SK2_Translator.__init__(self)
+
+  def _polyline(self, element):
+    self.calls.append(("polyline", element.params))
+
+  def _circle(self, element):
+    self.calls.append(("circle", element.params))
+
+
+class DispatchTestSuite(unittest.TestCase):
+  """CGM element handler table test cases."""
+
+  def test_table_matches_lookup(self):
+    translator = CGM_to_SK2_Translator()
+    for element_id in list(cgm_const.CGM_ID) + [0x7FE0, -1]:
+      self.assertEqual(translator.handlers.get(element_id),
+                       old_handler(translator, element_id))
+    self.assertEqual(translator.handlers[cgm_const.POLYLINE], translator._polyline)
+    self.assertNotIn(cgm_const.END_METAFILE, translator.handlers)
+
+  def test_table_binds_overridden_handlers(self):
+    translator = RecordingTranslator()
+    self.assertEqual(translator.handlers[cgm_const.POLYLINE], translator._polyline)
+    self.assertEqual(translator.handlers[cgm_const.CIRCLE],
+                     old_handler(translator, cgm_const.CIRCLE))
+
+  def test_process_elements(self):
+    translator = RecordingTranslator()
+    records = [
+      cgm_model.CgmRecord(cgm_const.POLYLINE, b"1", 1),
+      cgm_model.CgmRecord(0x7FE0, b"unknown", 7),
+      cgm_model.CgmRecord(cgm_const.NOOP, b"", 0),
+      cgm_model.CgmRecord(cgm_const.CIRCLE, b"2", 1),
+      cgm_model.CgmRecord(cgm_const.END_METAFILE, b"", 0),
+      cgm_model.CgmRecord(cgm_const.POLYLINE, b"3", 1),
+    ]
+    translator.process_elements(iter(records))
+    self.assertEqual(translator.calls, [("polyline", b"1"), ("circle", b"2")])
+    translator.process_element(records[-1])
+    self.assertEqual(translator.calls[-1], ("polyline", b"3"))
+
+
+class StyleCacheTestSuite(unittest.TestCase):
+  """Style and trafo sharing test cases."""
+
+  def setUp(self):
+    self.translator = CGM_to_SK2_Translator()
+    self.translator.layer = sk2_model.Layer(sk2_config.SK2_Config())
+    self.translator.cgm = copy.deepcopy(cgm_const.CGM_INIT)
+    self.translator.cgm["vdc.prec"] = 1
+    self.translator.cgm["line.width"] = 2
+    self.translator.scale = 0.5
+    self.translator.trafo = [1.0, 0.0, 0.0, 1.0, 0.0, 0.0]
+
+  def make_element(self, element_id, fmt, *values):
+    params = struct.pack(fmt, *values)
+    return cgm_model.CgmRecord(element_id, params, len(params))
+
+  def test_style_is_shared(self):
+    style = self.translator.get_style(stroke=True)
+    self.assertIs(self.translator.get_style(stroke=True), style)
+    self.assertIsNot(self.translator.get_style(fill=True), style)
+    self.assertEqual(style[1][1], 1.0)
+
+  def test_attribute_change_drops_cache(self):
+    style = self.translator.get_style(stroke=True)
+    self.translator.process_element(self.make_element(cgm_const.LINE_WIDTH, ">h", 6))
+    new_style = self.translator.get_style(stroke=True)
+    self.assertEqual(new_style[1][1], 3.0)
+    # Shared style is never changed in place
+    self.assertEqual(style[1][1], 1.0)
+
+  def test_width_mode_change_drops_cache(self):
+    style = self.translator.get_style(stroke=True)
+    element = self.make_element(cgm_const.LINE_WIDTH_SPECIFICATION_MODE, ">h", 1)
+    self.translator.process_element(element)
+    self.assertIsNot(self.translator.get_style(stroke=True), style)
+    self.assertEqual(self.translator.get_style(stroke=True)[1][1], 2)
+
+  def test_primitives_share_style_and_trafo(self):
+    polyline = self.make_element(cgm_const.POLYLINE, ">hhhh", 0, 0, 10, 10)
+    for _index in range(3):
+      self.translator.process_element(polyline)
+    self.translator.process_element(self.make_element(cgm_const.LINE_COLOUR, ">B", 2))
+    self.translator.process_element(polyline)
+    curves = self.translator.layer.childs
+    self.assertEqual(len(curves), 4)
+    self.assertTrue(all(curve.trafo is self.translator.trafo for curve in curves))
+    self.assertIs(curves[1].style, curves[0].style)
+    self.assertIs(curves[2].style, curves[0].style)
+    self.assertIsNot(curves[3].style, curves[0].style)
+    self.assertEqual(curves[0].paths, [[[0, 0], [[10, 10]], sk2const.CURVE_OPENED]])
+
+
+class ReadersTestSuite(unittest.TestCase):
+  """Element parameter readers test cases."""
+
+  def setUp(self):
+    self.translator = CGM_to_SK2_Translator()
+    self.translator.cgm = copy.deepcopy(cgm_const.CGM_INIT)
+    self.translator.cgm["vdc.prec"] = 1
+
+  def test_read_str(self):
+    chunk = b"\x00" + bytes([5]) + "Über".encode("latin-1") + b"!\x07"
+    for data in (chunk, memoryview(chunk)):
+      txt, pos = self.translator.read_str(data, 1)
+      self.assertIsInstance(txt, str)
+      self.assertEqual((txt, pos), ("Über!", 7))
+
+  def test_read_str_beyond_params(self):
+    self.assertEqual(self.translator.read_str(b"\x00\x00", 2), ("", 2))
+    self.assertEqual(self.translator.read_str(b"\x00\x00", 1), ("", 2))
+
+  def test_read_fields(self):
+    chunk = memoryview(struct.pack(">hhhhh", 7, -3, 4, 2, 9))
+    self.assertEqual(self.translator.read_int(chunk), (7, 2))
+    self.assertEqual(self.translator.read_point(chunk, 2), ([-3, 4], 6))
+    self.assertEqual(self.translator.read_enum(chunk, 6), (2, 8))
+    self.assertEqual(self.translator.read_index(chunk, 8), (9, 10))
+
+
+class MergeTestSuite(unittest.TestCase):
+  """Merging of stroke-only primitives test cases."""
+
+  STROKE = [[], [0, 1.0, ["RGB", [1.0, 0.0, 0.0], 1.0, ""]], [], []]
+  OTHER_STROKE = [[], [0, 2.0, ["RGB", [0.0, 0.0, 1.0], 1.0, ""]], [], []]
+  FILL = [[0, 1, ["RGB", [0.0, 1.0, 0.0], 1.0, ""]], [], [], []]
+  TRAFO = [2.0, 0.0, 0.0, -2.0, 5.0, 7.0]
+
+  def make_translator(self, merge):
+    translator = CGM_to_SK2_Translator(merge=merge)
+    translator.layer = sk2_model.Layer(sk2_config.SK2_Config())
+    translator.trafo = list(self.TRAFO)
+    return translator
+
+  def add_curves(self, translator, items):
+    for index, style in enumerate(items):
+      translator.add_curve([make_path(index, 2.0 * index)], style)
+    return translator.layer.childs
+
+  def get_paths(self, curves):
+    paths = []
+    for curve in curves:
+      paths.extend(libgeom.get_transformed_paths(curve))
+    return paths
+
+  def test_merged_curve_matches_primitives(self):
+    items = [self.STROKE] * 4
+    separate = self.add_curves(self.make_translator(False), items)
+    translator = self.make_translator(True)
+    merged = self.add_curves(translator, items)
+    self.assertEqual(len(separate), 4)
+    self.assertEqual(len(merged), 1)
+    self.assertEqual(self.get_paths(merged), self.get_paths(separate))
+    self.assertIs(merged[0].style, self.STROKE)
+    self.assertIs(merged[0].trafo, translator.trafo)
+
+  def test_style_change_breaks_run(self):
+    items = [self.STROKE, self.STROKE, self.OTHER_STROKE, self.STROKE]
+    merged = self.add_curves(self.make_translator(True), items)
+    self.assertEqual([len(curve.paths) for curve in merged], [2, 1, 1])
+    self.assertEqual(
+      self.get_paths(merged),
+      self.get_paths(self.add_curves(self.make_translator(False), items)))
+
+  def test_trafo_change_breaks_run(self):
+    translator = self.make_translator(True)
+    self.add_curves(translator, [self.STROKE])
+    translator.trafo = list(self.TRAFO)
+    merged = self.add_curves(translator, [self.STROKE])
+    self.assertEqual(len(merged), 2)
+
+  def test_filled_curves_are_not_merged(self):
+    merged = self.add_curves(self.make_translator(True), [self.FILL] * 3)
+    self.assertEqual(len(merged), 3)
+
+
+class CullingTestSuite(unittest.TestCase):
+  """Culling of primitives outside of clip rectangle test cases."""
+
+  def setUp(self):
+    self.translator = CGM_to_SK2_Translator(cull=True)
+    self.translator.layer = sk2_model.Layer(sk2_config.SK2_Config())
+    self.translator.cgm = copy.deepcopy(cgm_const.CGM_INIT)
+    self.translator.cgm["vdc.prec"] = 1
+    self.translator.cgm["clip.mode"] = 1
+    self.translator.cgm["clip.rect"] = ([0, 0], [100, 100])
+    self.translator.set_clip()
+
+  def make_text(self, x, y, txt):
+    params = struct.pack(">hhhB", x, y, 1, len(txt)) + txt
+    return cgm_model.CgmRecord(cgm_const.TEXT, params, len(params))
+
+  def test_circle_bbox(self):
+    self.assertEqual(circle_bbox([1.0, 2.0], 3.0), [-2.0, -1.0, 4.0, 5.0])
+    self.assertEqual(circle_bbox([1.0, 2.0], -3.0), [-2.0, -1.0, 4.0, 5.0])
+
+  def test_arc_bbox(self):
+    bbox = arc_bbox([10.0, 0.0], [0.0, 10.0], [-10.0, 0.0])
+    self.assertEqual([round(value, 9) for value in bbox], [-10.0, -10.0, 10.0, 10.0])
+
+  def test_degenerated_arc_bbox(self):
+    bbox = arc_bbox([0.0, 0.0], [5.0, 5.0], [10.0, 10.0])
+    self.assertEqual(bbox, [0.0, 0.0, 10.0, 10.0])
+
+  def test_clip_rect_defaults_to_vdc_extent(self):
+    self.translator.cgm["clip.rect"] = None
+    self.translator.cgm["vdc.extend"] = ([10, 100], [0, 20])
+    self.translator.set_clip()
+    self.assertEqual(self.translator.clip_bbox, [0, 20, 10, 100])
+
+  def test_clipping_off(self):
+    self.translator.cgm["clip.mode"] = 0
+    self.translator.set_clip()
+    self.assertIsNone(self.translator.clip_bbox)
+    self.assertFalse(self.translator.is_culled([200, 200, 300, 300]))
+
+  def test_is_culled(self):
+    self.assertFalse(self.translator.is_culled([50, 50, 60, 60]))
+    self.assertFalse(self.translator.is_culled([-10, -10, 10, 10]))
+    self.assertFalse(self.translator.is_culled([-10, -10, 200, 200]))
+    self.assertTrue(self.translator.is_culled([101, 0, 120, 10]))
+    self.assertTrue(self.translator.is_culled([-50, -50, -1, -1]))
+    self.assertEqual(self.translator.culled, 2)
+
+  def test_curve_is_culled(self):
+    path = [[200.0, 200.0], [[300.0, 200.0]], sk2const.CURVE_OPENED]
+    self.translator.add_curve([path], [[], [], [], []])
+    self.assertEqual(self.translator.layer.childs, [])
+    self.assertEqual(self.translator.culled, 1)
+
+  def test_text_is_culled_by_anchor(self):
+    self.translator.process_element(self.make_text(200, 200, b"far"))
+    self.assertEqual(self.translator.layer.childs, [])
+    self.assertEqual(self.translator.culled, 1)
+
+  def test_text_bbox_covers_text(self):
+    self.translator.cgm["text.height"] = 10
+    # Anchor is outside, but text may reach clip rectangle
+    bbox = self.translator.get_text_bbox([130, 50], "long text")
+    self.assertFalse(self.translator.is_culled(bbox))
+    bbox = self.translator.get_text_bbox([300, 50], "long text")
+    self.assertTrue(self.translator.is_culled(bbox))
+
+
+@unittest.skipUnless(context.HAS_EXTENSIONS, "compiled extensions are not built")
+class SplitPicturesTestSuite(unittest.TestCase):
+  """Translation of CGM pictures in process pool test cases."""
+
+  def setUp(self):
+    from qc3 import qc3_init
+
+    self.tmp = tempfile.TemporaryDirectory()
+    self.path = os.path.join(self.tmp.name, "pictures.cgm")
+    make_multi_picture(self.path)
+    self.app = qc3_init()
+    self.app.init_color_management()
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def translate(self, split):
+    from qc3.formats.cgm.cgm_to_sk2 import CGM_to_SK2_Translator
+    from qc3.formats.sk2.sk2_presenter import SK2_Presenter
+
+    sk2_doc = SK2_Presenter(self.app.appdata)
+    translator = CGM_to_SK2_Translator()
+    if split:
+      translator.translate_split(
+        self.app.appdata, self.path, sk2_doc, {}, workers=2)
+    else:
+      translator.translate_records(cgm_filters.read_records(self.path), sk2_doc)
+    return sk2_doc
+
+  def test_pages_keep_picture_order(self):
+    expected = self.translate(split=False)
+    result = self.translate(split=True)
+    expected_pages = expected.methods.get_pages()
+    result_pages = result.methods.get_pages()
+    self.assertEqual(len(result_pages), 2)
+    self.assertEqual([dump(page) for page in result_pages],
+                     [dump(page) for page in expected_pages])
+    expected.close()
+    result.close()
+
+  def test_config_is_restored(self):
+    sk2_doc = self.translate(split=True)
+    for page in sk2_doc.methods.get_pages():
+      for obj in iter_objects(page):
+        self.assertIs(obj.config, sk2_doc.config)
+    sk2_doc.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import struct
+import unittest
+
+from qc3.formats.cgm import cgm_const, cgm_utils
+
+
+def pack_elements(elements):
+  buf = bytearray()
+  for element_id, params in elements:
+    cgm_utils.pack_element(buf, element_id, params)
+  return bytes(buf)
+
+
+def unpack_elements(data, pos=0, end=None):
+  return [(element_id, bytes(params[:size]))
+          for element_id, size, _header, params
+          in cgm_utils.iter_elements(data, pos, end)]
+
+
+class CgmElementsTestSuite(unittest.TestCase):
+  """CGM element encoding and decoding test cases."""
+
+  def check_round_trip(self, size):
+    params = bytes(i % 251 for i in range(size))
+    elements = [
+      (cgm_const.BEGIN_METAFILE, b""),
+      (cgm_const.POLYLINE, params),
+      (cgm_const.END_METAFILE, b""),
+    ]
+    data = pack_elements(elements)
+    self.assertEqual(len(data) % 2, 0)
+    self.assertEqual(unpack_elements(data), elements)
+    self.assertEqual(unpack_elements(memoryview(data)), elements)
+
+  def test_short_form(self):
+    for size in (0, 1, 2, 29, 30):
+      self.check_round_trip(size)
+
+  def test_long_form(self):
+    for size in (31, 32, 255, 1001, cgm_utils.PARTITION_SIZE):
+      self.check_round_trip(size)
+
+  def test_partitioned(self):
+    size = cgm_utils.PARTITION_SIZE
+    for size in (size + 1, size + 2, 2 * size, 2 * size + 3):
+      self.check_round_trip(size)
+
+  def test_headers(self):
+    data = pack_elements([(cgm_const.POLYLINE, b"\x01" * 3)])
+    self.assertEqual(data, b"\x40\x23\x01\x01\x01\x00")
+    data = pack_elements([(cgm_const.POLYLINE, b"\x01" * 31)])
+    self.assertEqual(data[:4], b"\x40\x3f\x00\x1f")
+    self.assertEqual(len(data), 4 + 32)
+
+  def test_partition_flag(self):
+    size = cgm_utils.PARTITION_SIZE
+    data = pack_elements([(cgm_const.POLYLINE, b"\x01" * (size + 1))])
+    self.assertTrue(cgm_utils.is_partitioned(data[:4]))
+    self.assertEqual(cgm_utils.HEADER.unpack_from(data, 2)[0],
+                     cgm_utils.PARTITION_FLAG | size)
+    self.assertEqual(cgm_utils.HEADER.unpack_from(data, 4 + size)[0], 1)
+    data = pack_elements([(cgm_const.POLYLINE, b"\x01" * size)])
+    self.assertFalse(cgm_utils.is_partitioned(data[:4]))
+
+  def test_range(self):
+    head = pack_elements([(cgm_const.BEGIN_METAFILE, b"abc")])
+    body = [(cgm_const.POLYLINE, b"\x02" * 40)]
+    data = head + pack_elements(body) + head
+    self.assertEqual(
+      unpack_elements(data, len(head), len(data) - len(head)), body)
+
+  def test_scan_pictures(self):
+    size = cgm_utils.PARTITION_SIZE
+    descriptor = pack_elements([(cgm_const.BEGIN_METAFILE, b"")])
+    picture1 = pack_elements([
+      (cgm_const.BEGIN_PICTURE, b"p1"),
+      (cgm_const.POLYLINE, b"\x01" * (2 * size + 1)),
+      (cgm_const.END_PICTURE, b""),
+    ])
+    picture2 = pack_elements([
+      (cgm_const.BEGIN_PICTURE, b"p2"),
+      (cgm_const.END_PICTURE, b""),
+    ])
+    tail = pack_elements([(cgm_const.END_METAFILE, b"")])
+    data = descriptor + picture1 + picture2 + tail
+    start2 = len(descriptor) + len(picture1)
+    self.assertEqual(cgm_utils.scan_pictures(data), (len(descriptor), [
+      (len(descriptor), start2),
+      (start2, start2 + len(picture2)),
+    ]))
+
+
+class CgmPointsTestSuite(unittest.TestCase):
+  """CGM point block decoding test cases."""
+
+  # (vdc type, vdc precision, encoder, points)
+  CASES = (
+    (0, 0, lambda v: struct.pack(">b", v), [[1, -2], [127, -128]]),
+    (0, 1, lambda v: struct.pack(">h", v), [[300, -300], [0, 32767]]),
+    (0, 2, lambda v: struct.pack(">bH", v >> 16, v & 0xFFFF),
+     [[70000, -70000], [5, 0]]),
+    (0, 3, lambda v: struct.pack(">i", v), [[100000, -100000], [1, 2]]),
+    (1, 0, lambda v: struct.pack(">hH", int(v // 1), int(v % 1 * 65536)),
+     [[1.5, -2.25], [0.0, 100.75]]),
+    (1, 1, lambda v: struct.pack(">iI", int(v // 1), int(v % 1 * 65536 ** 2)),
+     [[1.5, -2.25], [0.0, 100.75]]),
+    (1, 2, lambda v: struct.pack(">f", v), [[1.5, -2.25], [0.0, 100.75]]),
+    (1, 3, lambda v: struct.pack(">d", v), [[1.5, -2.25], [0.1, 1e10]]),
+  )
+
+  def encode(self, encoder, points, flags=None):
+    chunk = b""
+    for index, point in enumerate(points):
+      chunk += encoder(point[0]) + encoder(point[1])
+      if flags is not None:
+        chunk += struct.pack(">h", flags[index])
+    return chunk
+
+  def test_unpack_points(self):
+    for vdc_type, vdc_prec, encoder, points in self.CASES:
+      chunk = self.encode(encoder, points)
+      self.assertEqual(
+        cgm_utils.unpack_points(chunk, vdc_type, vdc_prec), points)
+
+  def test_unpack_large_block(self):
+    # Large blocks may be decoded by NumPy
+    for vdc_type, vdc_prec, encoder, points in self.CASES:
+      points = points * cgm_utils.NUMPY_MIN_POINTS
+      chunk = self.encode(encoder, points)
+      self.assertEqual(
+        cgm_utils.unpack_points(chunk, vdc_type, vdc_prec), points)
+
+  def test_unpack_from_offset(self):
+    for vdc_type, vdc_prec, encoder, points in self.CASES:
+      chunk = b"\x00\x07" + self.encode(encoder, points) + b"\x00"
+      result = cgm_utils.unpack_points(
+        memoryview(chunk), vdc_type, vdc_prec, pos=2)
+      self.assertEqual(result, points)
+
+  def test_unpack_flagged_points(self):
+    flags = [1, 3]
+    for vdc_type, vdc_prec, encoder, points in self.CASES:
+      chunk = self.encode(encoder, points, flags)
+      self.assertEqual(
+        cgm_utils.unpack_flagged_points(chunk, vdc_type, vdc_prec),
+        (points, flags))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import copy
+import os
+import unittest
+
+from qc3.formats.cgm import cgm_const, cgm_filters, cgm_from_sk2, cgm_utils
+from qc3.formats.cgm.cgm_to_sk2 import CGM_to_SK2_Translator
+
+SAMPLE = os.path.join(context.ROOT, "samples", "cgm", "corvette.cgm")
+
+
+def build(element_id, **kwargs):
+  return bytes(cgm_from_sk2.builder(bytearray(), element_id, **kwargs))
+
+
+def decode(data):
+  return [(element_id, bytes(params[:size]))
+          for element_id, size, _header, params in cgm_utils.iter_elements(data)]
+
+
+class CgmBuilderTestSuite(unittest.TestCase):
+  """SK2 -> CGM element encoding test cases."""
+
+  def setUp(self):
+    # Reader in state of written metafile: 16-bit integer VDC
+    self.reader = CGM_to_SK2_Translator()
+    self.reader.cgm = copy.deepcopy(cgm_const.CGM_INIT)
+    self.reader.cgm["vdc.prec"] = 1
+
+  def scale(self, points):
+    return [[int(round(cgm_from_sk2.SCALE * val)) for val in point] for point in points]
+
+  def test_polyline(self):
+    points = [[0.0, 0.0], [10.5, -20.25], [100.0, 3.0]]
+    ((element_id, params),) = decode(build(cgm_const.POLYLINE, points=points))
+    self.assertEqual(element_id, cgm_const.POLYLINE)
+    self.assertEqual(self.reader.read_points(params), self.scale(points))
+
+  def test_partitioned_polyline(self):
+    points = [[float(index % 2000), float(-index % 2000)] for index in range(9000)]
+    data = build(cgm_const.POLYLINE, points=points)
+    self.assertTrue(cgm_utils.is_partitioned(data[:4]))
+    ((_element_id, params),) = decode(data)
+    self.assertEqual(self.reader.read_points(params), self.scale(points))
+
+  def test_polygon_set(self):
+    polygons = [
+      [[0.0, 0.0], [10.0, 0.0], [10.0, 10.0]],
+      [[20.0, 20.0], [30.0, 20.0], [20.0, 20.0]],
+      [],
+    ]
+    ((element_id, params),) = decode(build(cgm_const.POLYGON_SET, polygons=polygons))
+    self.assertEqual(element_id, cgm_const.POLYGON_SET)
+    points, flags = cgm_utils.unpack_flagged_points(params, 0, 1)
+    self.assertEqual(points, self.scale(polygons[0] + [[0.0, 0.0]] + polygons[1]))
+    # Open polygon is closed by invisible edge, closed one by visible edge
+    self.assertEqual(flags, [1, 1, 1, 2, 1, 1, 3])
+
+  def test_empty_polygon(self):
+    self.assertEqual(build(cgm_const.POLYGON, points=[]), b"")
+
+  def test_strings(self):
+    for txt, expected in (("Page", "Page"), ("Größe ü", "Größe ü"),
+                          ("π ≈ 3", "? ? 3"), ("x" * 300, "x" * 254)):
+      ((_element_id, params),) = decode(build(cgm_const.BEGIN_METAFILE, txt=txt))
+      self.assertEqual(self.reader.read_str(params), (expected, len(expected) + 1))
+
+  def test_attributes(self):
+    data = build(cgm_const.LINE_WIDTH, width=1.5)
+    data += build(cgm_const.LINE_COLOUR, color=(255, 128, 0))
+    data += build(cgm_const.LINE_TYPE, dashes=cgm_const.LINE_DASHTABLE[2])
+    (_id1, width), (_id2, color), (_id3, line_type) = decode(data)
+    self.assertEqual(self.reader.read_real(width, precision=2)[0], 1.5)
+    self.assertEqual(color, b"\xff\x80\x00")
+    self.assertEqual(self.reader.read_index(line_type)[0], 3)
+
+  def test_unknown_element(self):
+    self.assertEqual(build(cgm_const.TEXT), b"")
+
+  def test_model_chunks(self):
+    # CGM model built from encoded metafile is saved back unchanged
+    points = [[float(index % 100), 1.0] for index in range(9000)]
+    data = b"".join([
+      build(cgm_const.BEGIN_METAFILE, txt="test"),
+      build(cgm_const.BEGIN_PICTURE, page_number=1),
+      build(cgm_const.BEGIN_PICTURE_BODY),
+      build(cgm_const.POLYLINE, points=points),
+      build(cgm_const.LINE_WIDTH, width=0.5),
+      build(cgm_const.END_PICTURE),
+      build(cgm_const.END_METAFILE),
+    ])
+    chunks = []
+    stack = [cgm_filters.build_model(data)]
+    while stack:
+      obj = stack.pop()
+      chunks.append(obj.chunk)
+      stack.extend(reversed(obj.childs))
+    self.assertEqual(b"".join(chunks), data)
+
+
+@unittest.skipUnless(context.HAS_EXTENSIONS, "compiled extensions are not built")
+class CgmWriterTestSuite(unittest.TestCase):
+  """SK2 -> CGM translation test cases."""
+
+  def setUp(self):
+    from qc3 import qc3_init
+
+    self.app = qc3_init()
+    self.app.init_color_management()
+
+  def translate(self, records):
+    from qc3.formats.sk2.sk2_presenter import SK2_Presenter
+
+    sk2_doc = SK2_Presenter(self.app.appdata)
+    CGM_to_SK2_Translator().translate_records(records, sk2_doc)
+    return sk2_doc
+
+  def test_round_trip(self):
+    sk2_doc = self.translate(cgm_filters.read_records(SAMPLE))
+    data = bytes(cgm_from_sk2.SK2_to_CGM_Translator().encode(sk2_doc))
+    _descriptor_end, pictures = cgm_utils.scan_pictures(data)
+    self.assertEqual(len(pictures), len(sk2_doc.methods.get_pages()))
+    result = self.translate(cgm_filters.iter_records(data))
+    for page, new_page in zip(sk2_doc.methods.get_pages(), result.methods.get_pages()):
+      layers = [len(layer.childs) > 0 for layer in page.childs]
+      new_layers = [len(layer.childs) > 0 for layer in new_page.childs]
+      self.assertEqual(any(new_layers), any(layers))
+    sk2_doc.close()
+    result.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from qc3 import translate
+
+SAMPLE = os.path.join(context.ROOT, "samples", "cgm", "corvette.cgm")
+
+
+class Document:
+  def __init__(self, content):
+    self.content = content
+    self.closed = False
+
+  def close(self):
+    self.closed = True
+
+
+def fake_loader(appdata, path, fileptr, **options):
+  return Document(fileptr.read())
+
+
+def fake_saver(doc, path, fileptr, **options):
+  fileptr.write(doc.content[::-1])
+
+
+class ConvertDataTestSuite(unittest.TestCase):
+  """In-memory translation test cases."""
+
+  def setUp(self):
+    self.docs = []
+
+    def loader(*args, **options):
+      self.docs.append(fake_loader(*args, **options))
+      return self.docs[-1]
+
+    patcher = mock.patch.object(
+      translate, "get_loader_by_data", return_value=(loader, "cgm"))
+    self.get_loader = patcher.start()
+    self.addCleanup(patcher.stop)
+    patcher = mock.patch.object(translate, "get_saver_by_id", return_value=fake_saver)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def test_bytes(self):
+    self.assertEqual(translate.convert_data(None, b"content", "svg"), b"tnetnoc")
+    self.get_loader.assert_called_once_with(b"content", return_id=True)
+    self.assertTrue(self.docs[0].closed)
+
+  def test_stream_and_buffer(self):
+    for data in (io.BytesIO(b"content"), bytearray(b"content"),
+                 memoryview(b"content")):
+      self.assertEqual(translate.convert_data(None, data, "SVG"), b"tnetnoc")
+
+  def test_unsupported_output(self):
+    with self.assertRaises(ValueError):
+      translate.convert_data(None, b"content", "xyz")
+
+  def test_unsupported_input(self):
+    self.get_loader.return_value = (None, None)
+    with self.assertRaises(ValueError):
+      translate.convert_data(None, b"content", "svg")
+
+
+class ConvertDataDetectionTestSuite(unittest.TestCase):
+  """In-memory translation with real format registry test cases."""
+
+  def test_unknown_content(self):
+    with self.assertRaises(ValueError):
+      translate.convert_data(None, b"not a drawing", "svg")
+
+
+@unittest.skipUnless(context.HAS_EXTENSIONS, "compiled extensions are not built")
+class ConvertBytesTestSuite(unittest.TestCase):
+  """qc3.convert_bytes() round trip test cases."""
+
+  def setUp(self):
+    import qc3
+
+    self.convert_bytes = qc3.convert_bytes
+    with open(SAMPLE, "rb") as fileptr:
+      self.data = fileptr.read()
+
+  def convert_file(self, out_format):
+    import qc3
+
+    with tempfile.TemporaryDirectory() as dir_path:
+      path = os.path.join(dir_path, "out." + out_format)
+      app = qc3.qc3_init()
+      app.init_color_management()
+      translate.convert(app.appdata, [SAMPLE, path], {"format": out_format})
+      with open(path, "rb") as fileptr:
+        return fileptr.read()
+
+  def test_matches_file_translation(self):
+    self.assertEqual(self.convert_bytes(self.data, "svg"), self.convert_file("svg"))
+
+  def test_stream_input(self):
+    result = self.convert_bytes(io.BytesIO(self.data), "svg", in_format="cgm")
+    self.assertEqual(result, self.convert_bytes(self.data, "svg"))
+    self.assertTrue(result.startswith(b"<?xml"))
+
+
+if __name__ == '__main__':
+  unittest.main()
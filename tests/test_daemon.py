@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import types
+import unittest
+from unittest import mock
+
+from qc3 import daemon, translate
+
+
+def fake_convert(appdata, files, options, timings=None):
+  """Copies source into output recording options, 'bad' sources fail"""
+  with open(files[0], "rb") as fileptr:
+    content = fileptr.read()
+  if content.startswith(b"bad"):
+    raise Exception("Cannot translate %s" % files[0])
+  with open(files[1], "wb") as fileptr:
+    fileptr.write(content + json.dumps(options, sort_keys=True).encode())
+  timings["total"] = 0.0
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix domain sockets are not supported")
+class DaemonTestSuite(unittest.TestCase):
+  """Conversion daemon request/reply test cases."""
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.addCleanup(self.tmp.cleanup)
+    patcher = mock.patch.object(translate, "convert", side_effect=fake_convert)
+    patcher.start()
+    self.addCleanup(patcher.stop)
+    appdata = types.SimpleNamespace()
+    sock_path = os.path.join(self.tmp.name, "qc3.sock")
+    self.server = daemon.ConversionServer(sock_path, appdata, {"format": "svg"})
+    self.addCleanup(self.server.server_close)
+    thread = threading.Thread(target=self.server.serve_forever)
+    thread.start()
+    self.addCleanup(thread.join)
+    self.addCleanup(self.server.shutdown)
+    self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    self.sock.connect(sock_path)
+    self.rfile = self.sock.makefile("rb")
+
+  def tearDown(self):
+    self.rfile.close()
+    self.sock.close()
+
+  def make_file(self, name, content):
+    path = os.path.join(self.tmp.name, name)
+    with open(path, "wb") as fileptr:
+      fileptr.write(content)
+    return path
+
+  def request(self, data):
+    self.sock.sendall(data + b"\n")
+    return json.loads(self.rfile.readline().decode("utf-8"))
+
+  def send(self, request):
+    return self.request(json.dumps(request).encode("utf-8"))
+
+  def test_conversion(self):
+    source = self.make_file("a.cgm", b"content")
+    output = os.path.join(self.tmp.name, "a.svg")
+    reply = self.send({"input": source, "output": output,
+                       "options": {"simplify": True}})
+    self.assertEqual(reply["status"], "ok")
+    self.assertEqual((reply["input"], reply["output"]), (source, output))
+    self.assertIn("total", reply["timings"])
+    self.assertIn("request", reply["timings"])
+    with open(output, "rb") as fileptr:
+      self.assertEqual(fileptr.read(),
+                       b'content{"format": "svg", "simplify": true}')
+
+  def test_format_overrides_default(self):
+    source = self.make_file("a.cgm", b"")
+    output = os.path.join(self.tmp.name, "a.sk2")
+    reply = self.send({"input": source, "output": output, "format": "sk2"})
+    self.assertEqual(reply["status"], "ok")
+    with open(output, "rb") as fileptr:
+      self.assertEqual(fileptr.read(), b'{"format": "sk2"}')
+    # Request options do not leak into daemon defaults
+    self.assertEqual(self.server.options, {"format": "svg"})
+
+  def test_failed_conversion(self):
+    source = self.make_file("bad.cgm", b"bad")
+    reply = self.send({"input": source, "output": source + ".svg"})
+    self.assertEqual(reply["status"], "error")
+    self.assertIn("Cannot translate", reply["message"])
+
+  def test_missing_field(self):
+    reply = self.send({"input": "a.cgm"})
+    self.assertEqual(reply["status"], "error")
+    self.assertEqual(reply["message"], "'output'")
+
+  def test_bad_requests(self):
+    for data in (b"{not json", b"[1, 2]"):
+      reply = self.request(data)
+      self.assertEqual(reply["status"], "error")
+      self.assertTrue(reply["message"].startswith("Bad request"))
+
+  def test_requests_on_one_connection(self):
+    names = ["%i.cgm" % index for index in range(5)]
+    for name in names:
+      source = self.make_file(name, name.encode())
+      reply = self.send({"input": source, "output": source + ".svg"})
+      self.assertEqual((reply["status"], reply["input"]), ("ok", source))
+    # Blank lines are skipped without reply
+    self.sock.sendall(b"\n")
+    self.assertEqual(self.send({})["status"], "error")
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from qc3 import formats
+
+# Format id -> signature
+SIGNATURES = {"soc": b"SOC", "cgm": b"CGM", "sk2": b"##sK2"}
+
+
+def cgm_loader(*args, **kw):
+  pass
+
+
+def sk2_loader(*args, **kw):
+  pass
+
+
+def soc_loader(*args, **kw):
+  pass
+
+
+class FormatDetectionTestSuite(unittest.TestCase):
+  """Input format sniffing test cases."""
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.addCleanup(self.tmp.cleanup)
+    self.checked = []
+    checkers = {pid: self.make_checker(pid) for pid in SIGNATURES}
+    loaders = {"cgm": cgm_loader, "sk2": sk2_loader, "soc": soc_loader}
+    for patcher in (
+      mock.patch.dict(formats.CHECKERS, checkers),
+      mock.patch.dict(formats.LOADERS, loaders),
+      mock.patch.object(formats, "read_header", side_effect=formats.read_header),
+    ):
+      patcher.start()
+      self.addCleanup(patcher.stop)
+    formats._detect_format.cache_clear()
+    self.addCleanup(formats._detect_format.cache_clear)
+
+  def make_checker(self, pid):
+    """Returns checker which looks for signature at file start (SOC
+    signature may be anywhere) and records checked sources.
+    """
+
+    def checker(source):
+      self.checked.append((pid, source))
+      if isinstance(source, str):
+        with open(source, "rb") as fileptr:
+          source = fileptr.read()
+      if pid == "soc":
+        return SIGNATURES[pid] in source
+      return source.startswith(SIGNATURES[pid])
+
+    return checker
+
+  def make_file(self, name, content):
+    path = os.path.join(self.tmp.name, name)
+    with open(path, "wb") as fileptr:
+      fileptr.write(content)
+    return path
+
+  def detect(self, path):
+    return formats.get_loader(path, return_id=True)
+
+  def test_detection_by_header(self):
+    path = self.make_file("a.cgm", b"CGM" + b"\x00" * 10000)
+    self.assertEqual(self.detect(path), (cgm_loader, "cgm"))
+    self.assertEqual(formats.read_header.call_count, 1)
+    # Extension format is checked first, by header only
+    self.assertEqual(len(self.checked), 1)
+    self.assertEqual(self.checked[0][0], "cgm")
+    self.assertEqual(len(self.checked[0][1]), formats.HEADER_SIZE)
+
+  def test_detection_by_content(self):
+    path = self.make_file("a.cgm", b"##sK2 content")
+    self.assertEqual(self.detect(path), (sk2_loader, "sk2"))
+    self.assertEqual(formats.read_header.call_count, 1)
+    self.assertTrue(all(isinstance(source, bytes) for _pid, source in self.checked))
+
+  def test_whole_file_fallback(self):
+    path = self.make_file("a.dat", b"\x00" * formats.HEADER_SIZE + b"SOC")
+    self.assertEqual(self.detect(path), (soc_loader, "soc"))
+    self.assertIn(("soc", path), self.checked)
+
+  def test_unknown_content(self):
+    path = self.make_file("a.cgm", b"unknown")
+    self.assertEqual(self.detect(path), (None, None))
+    self.assertEqual(formats.get_loader(os.path.join(self.tmp.name, "missing.cgm")), None)
+
+  def test_cache_hit(self):
+    path = self.make_file("a.cgm", b"CGM content")
+    self.detect(path)
+    self.checked.clear()
+    self.assertEqual(self.detect(path), (cgm_loader, "cgm"))
+    self.assertEqual(formats.read_header.call_count, 1)
+    self.assertEqual(self.checked, [])
+
+  def test_cache_invalidation_on_size(self):
+    path = self.make_file("a.cgm", b"CGM content")
+    self.detect(path)
+    self.make_file("a.cgm", b"##sK2 new content")
+    self.assertEqual(self.detect(path), (sk2_loader, "sk2"))
+    self.assertEqual(formats.read_header.call_count, 2)
+
+  def test_cache_invalidation_on_mtime(self):
+    path = self.make_file("a.cgm", b"CGM content")
+    stat = os.stat(path)
+    self.detect(path)
+    self.make_file("a.cgm", b"##sK2 content")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    self.assertEqual(self.detect(path), (sk2_loader, "sk2"))
+    self.assertEqual(formats.read_header.call_count, 2)
+
+  def test_in_memory_data(self):
+    data = b"##sK2" + b"\x00" * (2 * formats.HEADER_SIZE)
+    self.assertEqual(formats.get_loader_by_data(data, return_id=True),
+                     (sk2_loader, "sk2"))
+    self.assertTrue(all(len(source) == formats.HEADER_SIZE
+                        for _pid, source in self.checked))
+    self.checked.clear()
+    data = bytearray(b"\x00" * formats.HEADER_SIZE + b"SOC")
+    self.assertEqual(formats.get_loader_by_data(data), soc_loader)
+    self.assertEqual(self.checked[-1], ("soc", bytes(data)))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import unittest
+
+from qc3 import events, msgconst
+
+
+class Message:
+  """Message argument which counts formatting"""
+
+  def __init__(self):
+    self.count = 0
+
+  def __str__(self):
+    self.count += 1
+    return "value"
+
+
+class EventsTestSuite(unittest.TestCase):
+  """Event channel level filtering test cases."""
+
+  def setUp(self):
+    self.channel = ["TEST"]
+    self.received = []
+    self.addCleanup(events.clean_channel, self.channel)
+
+  def receiver(self, *args):
+    self.received.append(("all",) + args)
+
+  def error_receiver(self, *args):
+    self.received.append(("errors",) + args)
+
+  def test_empty_channel(self):
+    self.assertFalse(events.is_wanted(self.channel))
+    events.emit(self.channel, msgconst.INFO, "text")
+    self.assertEqual(self.received, [])
+
+  def test_level_filtering(self):
+    events.connect(self.channel, self.receiver)
+    events.connect(self.channel, self.error_receiver, (msgconst.ERROR,))
+    events.emit(self.channel, msgconst.INFO, "info")
+    events.emit(self.channel, msgconst.ERROR, "error")
+    self.assertEqual(self.received, [
+      ("all", msgconst.INFO, "info"),
+      ("all", msgconst.ERROR, "error"),
+      ("errors", msgconst.ERROR, "error"),
+    ])
+
+  def test_is_wanted(self):
+    events.connect(self.channel, self.error_receiver, (msgconst.ERROR,))
+    self.assertTrue(events.is_wanted(self.channel, msgconst.ERROR))
+    self.assertFalse(events.is_wanted(self.channel, msgconst.INFO))
+    events.connect(self.channel, self.receiver)
+    self.assertTrue(events.is_wanted(self.channel, msgconst.INFO))
+    events.disconnect(self.channel, self.receiver)
+    self.assertFalse(events.is_wanted(self.channel, msgconst.INFO))
+
+  def test_message_is_formatted_lazily(self):
+    arg = Message()
+    events.connect(self.channel, self.error_receiver, (msgconst.ERROR,))
+    events.emit_msg(self.channel, msgconst.INFO, "info %s", arg)
+    self.assertEqual(arg.count, 0)
+    events.emit_msg(self.channel, msgconst.ERROR, "error %s", arg)
+    self.assertEqual(arg.count, 1)
+    # Message without arguments is not formatted
+    events.emit_msg(self.channel, msgconst.ERROR, "100%")
+    self.assertEqual(self.received, [
+      ("errors", msgconst.ERROR, "error value"),
+      ("errors", msgconst.ERROR, "100%"),
+    ])
+
+  def test_disconnect_drops_levels(self):
+    events.connect(self.channel, self.error_receiver, (msgconst.ERROR,))
+    events.disconnect(self.channel, self.error_receiver)
+    self.assertNotIn(("TEST", self.error_receiver), events.LEVELS)
+    events.connect(self.channel, self.error_receiver)
+    events.emit(self.channel, msgconst.INFO, "info")
+    self.assertEqual(self.received, [("errors", msgconst.INFO, "info")])
+
+  def test_failed_receiver(self):
+    def bad_receiver(*args):
+      raise Exception("Receiver error")
+
+    events.connect(self.channel, bad_receiver)
+    events.connect(self.channel, self.receiver)
+    with self.assertLogs(events.LOG, "ERROR"):
+      events.emit(self.channel, msgconst.INFO, "info")
+    self.assertEqual(self.received, [("all", msgconst.INFO, "info")])
+
+
+if __name__ == '__main__':
+  unittest.main()
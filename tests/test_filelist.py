@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import os
+import tempfile
+import unittest
+
+from qc3 import translate
+
+
+class FileListTestSuite(unittest.TestCase):
+  """Wildcard file list test cases."""
+
+  FILES = (
+    "a.cgm",
+    "c.svg",
+    ".hidden.cgm",
+    os.path.join("sub", "d.cgm"),
+    os.path.join("sub", "deep", "e.rev1.cgm"),
+  )
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.path = self.tmp.name
+    for name in self.FILES:
+      filepath = os.path.join(self.path, name)
+      os.makedirs(os.path.dirname(filepath), exist_ok=True)
+      with open(filepath, "wb") as fileptr:
+        fileptr.write(b"")
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def get_list(self, wildcard, recursive):
+    items = translate._iter_filelist(self.path, "", wildcard, recursive)
+    return sorted((os.path.relpath(path, self.path), subpath, name)
+                  for path, subpath, name in items)
+
+  def test_flat(self):
+    self.assertEqual(self.get_list("*.cgm", False), [("a.cgm", "", "a")])
+
+  def test_recursive(self):
+    self.assertEqual(self.get_list("*.cgm", True), [
+      ("a.cgm", "", "a"),
+      (os.path.join("sub", "d.cgm"), "sub", "d"),
+      (os.path.join("sub", "deep", "e.rev1.cgm"),
+       os.path.join("sub", "deep"), "e"),
+    ])
+
+  def test_hidden_files_by_explicit_prefix(self):
+    items = self.get_list(".*.cgm", False)
+    self.assertEqual([item[0] for item in items], [".hidden.cgm"])
+
+  def test_directories_are_not_matched(self):
+    self.assertEqual(self.get_list("sub*", False), [])
+
+  def test_files_precede_subdirectories(self):
+    items = translate._iter_filelist(self.path, "", "*.cgm", True)
+    self.assertEqual([subpath for _path, subpath, _name in items],
+                     ["", "sub", os.path.join("sub", "deep")])
+
+  def test_subdirectories_are_walked_depth_first(self):
+    for name in ("a", "b"):
+      for subpath in (name, os.path.join(name, "x")):
+        filepath = os.path.join(self.path, subpath, "f.cgm")
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        open(filepath, "wb").close()
+    items = translate._iter_filelist(self.path, "", "f.cgm", True)
+    subpaths = [subpath for _path, subpath, _name in items]
+    self.assertEqual(sorted(subpaths), ["a", os.path.join("a", "x"),
+                                        "b", os.path.join("b", "x")])
+    for name in ("a", "b"):
+      index = subpaths.index(name)
+      self.assertEqual(subpaths[index + 1], os.path.join(name, "x"))
+
+  def test_files_are_yielded_while_walking(self):
+    items = translate._iter_filelist(self.path, "", "*.cgm", True)
+    self.assertEqual(next(items)[2], "a")
+    # Subdirectory is scanned after first file is consumed
+    open(os.path.join(self.path, "sub", "new.cgm"), "wb").close()
+    names = sorted(name for _path, _subpath, name in items)
+    self.assertEqual(names, ["d", "e", "new"])
+
+  def test_missing_directory(self):
+    items = translate._iter_filelist(
+      os.path.join(self.path, "missing"), "", "*.cgm", True)
+    self.assertEqual(list(items), [])
+
+
+if __name__ == '__main__':
+  unittest.main()
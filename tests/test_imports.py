@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import json
+import subprocess
+import sys
+import unittest
+
+# Modules which must not be imported by CLI startup path,
+# see benchmarks/import_time.py
+DEFERRED = (
+  "cairo",
+  "jinja2",
+  "numpy",
+  "PIL",
+  "qc3.app_cms",
+  "qc3.cms",
+  "qc3.libcairo",
+  "qc3.libimg",
+  "qc3.libpango",
+)
+
+# Test environment may import extensions itself (probing), so only
+# modules imported after it are checked
+SCRIPT = """
+import json, sys
+from tests import context
+loaded = set(sys.modules)
+for name in sys.argv[1:]:
+  __import__(name)
+from qc3.libgeom import cwrap, shaping
+print(json.dumps({
+  "modules": sorted(set(sys.modules) - loaded),
+  "libcairo": cwrap._LIBCAIRO is not None,
+  "cairo": shaping.cairo is not None,
+}))
+"""
+
+
+def is_deferred(name):
+  return any(name == item or name.startswith(item + ".") for item in DEFERRED)
+
+
+class LazyImportTestSuite(unittest.TestCase):
+  """CLI startup import test cases."""
+
+  def run_imports(self, *modules):
+    output = subprocess.check_output(
+      [sys.executable, "-c", SCRIPT] + list(modules), cwd=context.ROOT)
+    return json.loads(output.decode("utf-8"))
+
+  def test_cli_startup(self):
+    result = self.run_imports("qc3.application", "qc3.translate", "qc3.daemon")
+    self.assertIn("qc3.translate", result["modules"])
+    self.assertEqual([name for name in result["modules"] if is_deferred(name)], [])
+
+  def test_geometry_import(self):
+    result = self.run_imports("qc3.libgeom", "qc3.formats.cgm.cgm_to_sk2")
+    self.assertEqual([name for name in result["modules"] if is_deferred(name)], [])
+    self.assertFalse(result["libcairo"])
+    self.assertFalse(result["cairo"])
+
+
+if __name__ == '__main__':
+  unittest.main()
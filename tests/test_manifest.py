@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import os
+import tempfile
+import unittest
+
+from qc3 import manifest
+
+
+class ManifestTestSuite(unittest.TestCase):
+  """Incremental translation manifest test cases."""
+
+  def setUp(self):
+    self.tmp = tempfile.TemporaryDirectory()
+    self.dir_path = self.tmp.name
+    self.source = os.path.join(self.dir_path, "drawing.cgm")
+    self.output = os.path.join(self.dir_path, "drawing.svg")
+    with open(self.source, "wb") as fileptr:
+      fileptr.write(b"source content")
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def make_manifest(self, fingerprint="config"):
+    return manifest.ConversionManifest(self.dir_path, "svg", fingerprint)
+
+  def make_record(self, mft):
+    return mft.make_record(self.source, manifest.file_hash(self.source))
+
+  def save_output(self, mft):
+    with open(self.output, "wb") as fileptr:
+      fileptr.write(b"output content")
+    mft.update(self.output, self.make_record(mft))
+    mft.save()
+
+  def test_miss_without_entry(self):
+    mft = self.make_manifest()
+    self.assertFalse(mft.is_current(self.output, self.make_record(mft)))
+
+  def test_hit_after_reload(self):
+    self.save_output(self.make_manifest())
+    mft = self.make_manifest()
+    self.assertTrue(mft.is_current(self.output, self.make_record(mft)))
+
+  def test_miss_on_changed_source(self):
+    self.save_output(self.make_manifest())
+    with open(self.source, "wb") as fileptr:
+      fileptr.write(b"changed content")
+    mft = self.make_manifest()
+    self.assertFalse(mft.is_current(self.output, self.make_record(mft)))
+
+  def test_miss_on_changed_config(self):
+    self.save_output(self.make_manifest())
+    mft = self.make_manifest("other config")
+    self.assertFalse(mft.is_current(self.output, self.make_record(mft)))
+
+  def test_miss_on_removed_output(self):
+    self.save_output(self.make_manifest())
+    os.remove(self.output)
+    mft = self.make_manifest()
+    self.assertFalse(mft.is_current(self.output, self.make_record(mft)))
+
+  def test_failed_translation_drops_entry(self):
+    mft = self.make_manifest()
+    self.save_output(mft)
+    mft.update(self.output, None)
+    mft.save()
+    mft = self.make_manifest()
+    self.assertFalse(mft.is_current(self.output, self.make_record(mft)))
+
+  def test_corrupted_manifest_is_ignored(self):
+    with open(os.path.join(self.dir_path, manifest.MANIFEST_FILENAME), "w") as fileptr:
+      fileptr.write("{not json")
+    self.assertEqual(self.make_manifest().entries, {})
+
+  def test_runtime_options_do_not_affect_fingerprint(self):
+    fingerprint = manifest.config_fingerprint(None, {"format": "svg"})
+    options = {"format": "svg", "jobs": 4, "verbose": True}
+    self.assertEqual(manifest.config_fingerprint(None, options), fingerprint)
+    options = {"format": "svg", "simplify": True}
+    self.assertNotEqual(manifest.config_fingerprint(None, options), fingerprint)
+
+
+if __name__ == '__main__':
+  unittest.main()
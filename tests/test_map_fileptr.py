@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import io
+import mmap
+import os
+import tempfile
+import threading
+import unittest
+
+from qc3.formats.cgm import cgm_filters
+from qc3.formats.cgm.cgm_to_sk2 import iter_model
+from qc3.formats.generic_filters import map_fileptr
+from .test_cgm_filters import dump
+
+SAMPLE = os.path.join(context.ROOT, "samples", "cgm", "corvette.cgm")
+
+
+class Presenter:
+  cid = "cgm"
+  config = None
+  model = None
+
+
+class UnseekableStream(io.RawIOBase):
+  """Stream without file descriptor and seeking"""
+
+  def __init__(self, data):
+    self.stream = io.BytesIO(data)
+
+  def readable(self):
+    return True
+
+  def readinto(self, buf):
+    return self.stream.readinto(buf)
+
+
+class MapFileptrTestSuite(unittest.TestCase):
+  """Binary loader input mapping test cases."""
+
+  def setUp(self):
+    with open(SAMPLE, "rb") as fileptr:
+      self.data = fileptr.read()
+
+  def test_regular_file_is_mapped(self):
+    with open(SAMPLE, "rb") as fileptr:
+      view = map_fileptr(fileptr)
+    self.assertIsInstance(view.obj, mmap.mmap)
+    self.assertTrue(view.readonly)
+    # Mapping outlives closed file
+    self.assertEqual(view.tobytes(), self.data)
+
+  def test_empty_file(self):
+    with tempfile.TemporaryDirectory() as dir_path:
+      path = os.path.join(dir_path, "empty.cgm")
+      open(path, "wb").close()
+      with open(path, "rb") as fileptr:
+        self.assertEqual(map_fileptr(fileptr).tobytes(), b"")
+
+  def test_stream_is_read(self):
+    fileptr = io.BytesIO(self.data)
+    fileptr.read(10)
+    view = map_fileptr(fileptr)
+    self.assertEqual(view.tobytes(), self.data)
+
+  def test_unseekable_stream(self):
+    view = map_fileptr(io.BufferedReader(UnseekableStream(self.data)))
+    self.assertEqual(view.tobytes(), self.data)
+
+  def test_pipe(self):
+    read_fd, write_fd = os.pipe()
+
+    def write():
+      with os.fdopen(write_fd, "wb") as fileptr:
+        fileptr.write(self.data)
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    with os.fdopen(read_fd, "rb") as fileptr:
+      view = map_fileptr(fileptr)
+    thread.join()
+    self.assertEqual(view.tobytes(), self.data)
+
+  def test_loader_input(self):
+    expected = dump(cgm_filters.iter_records(self.data))
+    for source in ({"path": SAMPLE}, {"fileptr": io.BytesIO(self.data)}):
+      with self.subTest(source=list(source)[0]):
+        model = cgm_filters.CgmLoader().load(Presenter(), **source)
+        self.assertEqual(dump(iter_model(model)), expected)
+
+
+if __name__ == '__main__':
+  unittest.main()
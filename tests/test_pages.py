@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import argparse
+import unittest
+
+from qc3.application import page_range
+from qc3.formats.cgm.cgm_filters import select_pictures
+
+
+class PagesTestSuite(unittest.TestCase):
+  """Picture range selection test cases."""
+
+  PICTURES = [(10, 20), (20, 30), (30, 40)]
+
+  def test_page_range(self):
+    self.assertEqual(page_range("3"), (3, 3))
+    self.assertEqual(page_range("2-5"), (2, 5))
+    self.assertEqual(page_range("4-4"), (4, 4))
+
+  def test_invalid_page_range(self):
+    for value in ("", "0", "5-2", "a", "1-b", "-3", "0-2"):
+      with self.assertRaises(argparse.ArgumentTypeError):
+        page_range(value)
+
+  def test_select_pictures(self):
+    self.assertEqual(select_pictures(self.PICTURES, (1, 1)), [(10, 20)])
+    self.assertEqual(select_pictures(self.PICTURES, (2, 3)),
+                     [(20, 30), (30, 40)])
+
+  def test_select_pictures_beyond_end(self):
+    self.assertEqual(select_pictures(self.PICTURES, (3, 10)), [(30, 40)])
+
+  def test_select_missing_pictures(self):
+    for pages in ((4, 5), (0, 1)):
+      with self.assertRaises(Exception):
+        select_pictures(self.PICTURES, pages)
+    with self.assertRaises(Exception):
+      select_pictures([], (1, 1))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import json
+import os
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from qc3 import events, profiler, translate
+
+
+def fake_convert(appdata, files, options):
+  """Emits parse and save stages, 'bad' files fail after parsing"""
+  events.emit(events.TIMING, "parse", "cgm", 1.0, 1.5)
+  if files[0].startswith("bad"):
+    raise Exception("Cannot translate %s" % files[0])
+  events.emit(events.TIMING, "save", "svg", 2.0, 2.25)
+  events.emit(events.TIMING, "cpath", None, 2.0, 2.125)
+  events.emit(events.TIMING, "cpath", None, 2.125, 2.25)
+
+
+class ProfilerTestSuite(unittest.TestCase):
+  """TIMING channel profiler test cases."""
+
+  def test_stages(self):
+    with profiler.TimingProfiler() as prof:
+      fake_convert(None, ("a.cgm", "a.svg"), {})
+    events.emit(events.TIMING, "parse", "cgm", 3.0, 4.0)
+    self.assertEqual(prof.stages, {
+      "cgm.parse": {"time": 0.5, "count": 1},
+      "svg.save": {"time": 0.25, "count": 1},
+      "cpath": {"time": 0.25, "count": 2},
+    })
+    self.assertEqual(events.TIMING, ["TIMING"])
+    record = prof.make_record(("a.cgm", "a.svg"), True)
+    self.assertEqual((record["input"], record["output"], record["status"]),
+                     ("a.cgm", "a.svg", "ok"))
+    self.assertGreaterEqual(record["wall"], 0.0)
+
+  def test_channel_is_silent_without_profiler(self):
+    self.assertFalse(events.is_wanted(events.TIMING, "parse"))
+    with profiler.TimingProfiler():
+      self.assertTrue(events.is_wanted(events.TIMING, "parse"))
+    self.assertFalse(events.is_wanted(events.TIMING, "parse"))
+
+  def test_batch_report(self):
+    report = profiler.ProfileReport()
+    for job, ok in ((("a.cgm", "a.svg"), True), (("bad.cgm", "bad.svg"), False)):
+      with profiler.TimingProfiler() as prof:
+        try:
+          fake_convert(None, job, {})
+        except Exception:
+          pass
+      report.add(prof.make_record(job, ok))
+    report.add(None)
+    result = report.get_report()
+    self.assertEqual([record["status"] for record in result["files"]], ["ok", "fail"])
+    self.assertEqual(result["batch"]["files"], 2)
+    self.assertEqual(result["batch"]["failed"], 1)
+    self.assertEqual(result["batch"]["stages"]["cgm.parse"], {"time": 1.0, "count": 2})
+    self.assertEqual(result["batch"]["stages"]["svg.save"], {"time": 0.25, "count": 1})
+
+  def test_single_convert_report(self):
+    with tempfile.TemporaryDirectory() as dir_path, \
+        mock.patch.object(translate, "convert", side_effect=fake_convert):
+      path = os.path.join(dir_path, "profile.json")
+      appdata = types.SimpleNamespace()
+      translate.single_convert(appdata, ["a.cgm", "a.svg"], {"profile": path})
+      with self.assertRaises(Exception):
+        translate.single_convert(appdata, ["bad.cgm", "bad.svg"], {"profile": path})
+      with open(path) as fileptr:
+        report = json.load(fileptr)
+    self.assertEqual(len(report["files"]), 1)
+    record = report["files"][0]
+    self.assertEqual((record["input"], record["status"]), ("bad.cgm", "fail"))
+    self.assertEqual(record["stages"], {"cgm.parse": {"time": 0.5, "count": 1}})
+    self.assertEqual(events.TIMING, ["TIMING"])
+
+
+if __name__ == '__main__':
+  unittest.main()
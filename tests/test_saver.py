@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import io
+import os
+import tempfile
+import unittest
+
+from qc3.formats.generic_filters import AbstractSaver
+
+
+class Presenter:
+  cid = 0
+  config = None
+  model = None
+
+  def update(self):
+    pass
+
+
+class RecordingFile(io.BytesIO):
+  """Stream which records size of every write call"""
+
+  def __init__(self):
+    io.BytesIO.__init__(self)
+    self.writes = []
+
+  def write(self, data):
+    self.writes.append(len(data))
+    return io.BytesIO.write(self, data)
+
+
+class FragmentSaver(AbstractSaver):
+  """Writes fragments, output buffer is dropped if unbuffered"""
+
+  def __init__(self, fragments, unbuffered=False):
+    AbstractSaver.__init__(self)
+    self.fragments = fragments
+    self.unbuffered = unbuffered
+
+  def do_save(self):
+    if self.unbuffered:
+      self.buffer = None
+    for item in self.fragments:
+      if isinstance(item, list):
+        self.writelines(item)
+      else:
+        self.write(item)
+    self.writeln("end")
+
+
+def make_fragments(count):
+  fragments = []
+  for index in range(count):
+    fragments.append("<path d='M %i 0 L 1 1' title='тест' />\n" % index)
+    fragments.append(bytes([index % 256]) * (index % 7))
+    if index % 100 == 0:
+      fragments.append(["line %i" % index, "line ü"])
+  return fragments
+
+
+class SaverTestSuite(unittest.TestCase):
+  """Buffered saver output test cases."""
+
+  def save(self, fragments, unbuffered=False):
+    fileptr = RecordingFile()
+    FragmentSaver(fragments, unbuffered).save(Presenter(), fileptr=fileptr)
+    return fileptr
+
+  def test_buffered_output_is_identical(self):
+    fragments = make_fragments(20000)
+    expected = self.save(fragments, unbuffered=True)
+    result = self.save(fragments)
+    self.assertEqual(result.getvalue(), expected.getvalue())
+    self.assertLess(len(result.writes), len(expected.writes))
+
+  def test_large_output_is_flushed_in_blocks(self):
+    block_size = AbstractSaver.block_size
+    fragments = [b"a" * 1000] * 300 + [b"b" * (block_size + 1)] + [b"c" * 10]
+    result = self.save(fragments)
+    expected = b"".join(fragments) + b"end\n"
+    self.assertEqual(result.getvalue(), expected)
+    self.assertGreater(len(result.getvalue()), block_size)
+    self.assertEqual(sum(result.writes), len(expected))
+    self.assertTrue(all(size >= block_size for size in result.writes[:-1]))
+    # Block limit is reached by small fragments, then by large one
+    self.assertEqual(len(result.writes), 3)
+
+  def test_save_to_path(self):
+    fragments = make_fragments(100)
+    with tempfile.TemporaryDirectory() as dir_path:
+      path = os.path.join(dir_path, "out.txt")
+      FragmentSaver(fragments).save(Presenter(), path)
+      with open(path, "rb") as fileptr:
+        content = fileptr.read()
+    self.assertEqual(content, self.save(fragments, unbuffered=True).getvalue())
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import math
+import types
+import unittest
+
+from qc3 import sk2const
+from qc3.libgeom import get_simplified_paths, simplify_points
+
+
+def bezier_point(p0, p1, p2, p3, t):
+  s = 1.0 - t
+  return [s ** 3 * p0[i] + 3 * s * s * t * p1[i] + 3 * s * t * t * p2[i] +
+          t ** 3 * p3[i] for i in (0, 1)]
+
+
+def polyline_distance(point, points):
+  ret = None
+  for start, end in zip(points[:-1], points[1:]):
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length2 = dx * dx + dy * dy
+    t = 0.0
+    if length2:
+      t = ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / length2
+      t = min(1.0, max(0.0, t))
+    dist = math.hypot(point[0] - start[0] - t * dx,
+                      point[1] - start[1] - t * dy)
+    ret = dist if ret is None else min(ret, dist)
+  return ret
+
+
+class SimplifyTestSuite(unittest.TestCase):
+  """Polyline simplification test cases."""
+
+  def test_short_polylines(self):
+    self.assertEqual(simplify_points([], 1.0), [])
+    self.assertEqual(simplify_points([[0, 0], [1, 1]], 1.0), [[0, 0], [1, 1]])
+
+  def test_collinear_points_are_dropped(self):
+    points = [[0, 0], [1, 0.1], [2, -0.1], [3, 0], [10, 0]]
+    self.assertEqual(simplify_points(points, 0.5), [[0, 0], [10, 0]])
+
+  def test_deviation_above_tolerance_is_kept(self):
+    points = [[0, 0], [5, 2], [10, 0]]
+    self.assertEqual(simplify_points(points, 1.0), points)
+    self.assertEqual(simplify_points(points, 3.0), [[0, 0], [10, 0]])
+
+  def test_overshoot_beyond_chord_is_kept(self):
+    points = [[0, 0], [10, 0], [5, 0]]
+    self.assertEqual(simplify_points(points, 1.0), points)
+
+  def test_closed_polyline(self):
+    points = [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]
+    self.assertEqual(simplify_points(points, 1.0), points)
+
+  def test_simplified_curve_within_tolerance(self):
+    p0, p1, p2, p3 = [0.0, 0.0], [0.0, 100.0], [100.0, 100.0], [100.0, 0.0]
+    curve = types.SimpleNamespace(
+      paths=[[p0, [[p1, p2, p3, sk2const.NODE_CUSP]], sk2const.CURVE_OPENED]],
+      trafo=[1.0, 0.0, 0.0, 1.0, 0.0, 0.0])
+    for tolerance in (0.1, 1.0, 5.0):
+      paths = get_simplified_paths(curve, tolerance)
+      self.assertEqual(len(paths), 1)
+      points = [paths[0][0]] + paths[0][1]
+      self.assertEqual(points[0], p0)
+      self.assertEqual(points[-1], p3)
+      for i in range(201):
+        point = bezier_point(p0, p1, p2, p3, i / 200.0)
+        self.assertLessEqual(polyline_distance(point, points), tolerance)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from . import context  # noqa: F401
+
+import unittest
+
+from qc3 import sk2const
+from qc3.formats.svg.svg_utils import fixed_to_str, join_nums
+from qc3.formats.svg.svg_utils import parse_svg_path_cmds, translate_paths_to_d
+
+CUSP = sk2const.NODE_CUSP
+OPENED = sk2const.CURVE_OPENED
+CLOSED = sk2const.CURVE_CLOSED
+
+
+class SvgPathDataTestSuite(unittest.TestCase):
+  """SVG path data serialization test cases."""
+
+  def test_numbers(self):
+    self.assertEqual(fixed_to_str(0), "0")
+    self.assertEqual(fixed_to_str(120000), "12")
+    self.assertEqual(fixed_to_str(-5000), "-.5")
+    self.assertEqual(fixed_to_str(15), ".0015")
+    self.assertEqual(fixed_to_str(-123450), "-12.345")
+
+  def test_separators(self):
+    self.assertEqual(join_nums(["1", "-2", ".5", ".5", "3"]), "1-2 .5.5 3")
+    self.assertEqual(join_nums(["3"], "1.5"), " 3")
+    self.assertEqual(join_nums([".5"], "1.5"), ".5")
+    self.assertEqual(join_nums([".5"], "1"), " .5")
+
+  def test_horizontal_and_vertical_lines(self):
+    paths = [[[0.0, 0.0], [[10.0, 0.0], [10.0, 10.0], [0.0, 10.0]], CLOSED]]
+    self.assertEqual(translate_paths_to_d(paths), "M0 0H10V10H0Z")
+
+  def test_implicit_lineto(self):
+    paths = [[[0.0, 0.0], [[7.0, 3.0], [8.0, 5.0]], OPENED]]
+    self.assertEqual(translate_paths_to_d(paths), "M0 0 7 3 8 5")
+
+  def test_relative_commands(self):
+    paths = [[[1000.0, 1000.0], [[1001.0, 1002.0], [1003.0, 1001.0]], OPENED]]
+    self.assertEqual(translate_paths_to_d(paths), "M1000 1000l1 2 2-1")
+
+  def test_relative_moveto(self):
+    paths = [
+      [[1000.0, 1000.0], [[1000.0, 1010.0]], OPENED],
+      [[1001.0, 1010.0], [[1001.0, 1000.0]], OPENED],
+    ]
+    self.assertEqual(translate_paths_to_d(paths), "M1000 1000v10m1 0v-10")
+
+  def test_curve(self):
+    paths = [[[0.0, 0.0], [[[0.0, 10.0], [10.5, 12.0], [-3.0, 4.0], CUSP]], OPENED]]
+    self.assertEqual(translate_paths_to_d(paths), "M0 0C0 10 10.5 12-3 4")
+
+  def test_trafo(self):
+    paths = [[[0.0, 0.0], [[1.0, 0.0], [[1.0, 1.0], [2.0, 1.0], [2.0, 2.0], CUSP]], OPENED]]
+    trafo = [0.0, 2.0, -2.0, 0.0, 5.0, 5.0]
+    self.assertEqual(translate_paths_to_d(paths, trafo), "M5 5V7C3 7 3 9 1 9")
+
+  def test_rounding(self):
+    paths = [[[0.123456, -0.00004], [[1 / 3.0, 2 / 3.0]], OPENED]]
+    self.assertEqual(translate_paths_to_d(paths), "M.1235 0 .3333.6667")
+
+  def test_parsed_back(self):
+    paths = [
+      [[10.0, 20.0], [[30.5, 20.0], [[40.0, 25.0], [45.0, 30.0], [50.0, 20.0], CUSP],
+                      [50.0, -5.25], [10.0, 20.0]], CLOSED],
+      [[100.0, 100.0], [[90.0, 110.0], [90.0, 100.0]], OPENED],
+    ]
+    trafo = [1.5, 0.0, 0.0, -1.5, 3.0, 200.0]
+    parsed = parse_svg_path_cmds(translate_paths_to_d(paths, trafo))
+    self.assertEqual(len(parsed), len(paths))
+    for path, result in zip(paths, parsed):
+      self.assertEqual(result[2], path[2])
+      expected = [path[0]] + path[1]
+      points = [result[0]] + result[1]
+      self.assertEqual(len(points), len(expected))
+      for point, source in zip(points, expected):
+        if len(source) > 2:
+          point, source = point[2], source[2]
+        x = 1.5 * source[0] + 3.0
+        y = -1.5 * source[1] + 200.0
+        self.assertAlmostEqual(point[0], x, 4)
+        self.assertAlmostEqual(point[1], y, 4)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from . import context
+
+import glob
+import os
+import tempfile
+import unittest
+
+SAMPLES = sorted(glob.glob(os.path.join(context.ROOT, "samples", "cgm", "*.cgm")))
+
+
+@unittest.skipUnless(context.HAS_EXTENSIONS, "compiled extensions are not built")
+class SvgStreamTestSuite(unittest.TestCase):
+  """Streamed SK2 -> SVG writer test cases."""
+
+  def setUp(self):
+    from qc3 import qc3_init
+
+    self.tmp = tempfile.TemporaryDirectory()
+    self.app = qc3_init()
+    self.app.init_color_management()
+
+  def tearDown(self):
+    self.tmp.cleanup()
+
+  def load_sample(self, path):
+    from qc3.formats.cgm import cgm_filters
+    from qc3.formats.cgm.cgm_to_sk2 import CGM_to_SK2_Translator
+    from qc3.formats.sk2.sk2_presenter import SK2_Presenter
+
+    sk2_doc = SK2_Presenter(self.app.appdata)
+    CGM_to_SK2_Translator().translate_records(
+      cgm_filters.read_records(path), sk2_doc)
+    return sk2_doc
+
+  def read(self, path):
+    with open(path, "rb") as fileptr:
+      return fileptr.read().decode("utf-8")
+
+  def test_stream_matches_model(self):
+    from qc3.formats.svg.svg_presenter import SVG_Presenter
+
+    for path in SAMPLES:
+      with self.subTest(sample=os.path.basename(path)):
+        sk2_doc = self.load_sample(path)
+        model_path = os.path.join(self.tmp.name, "model.svg")
+        svg_doc = SVG_Presenter(self.app.appdata)
+        svg_doc.translate_from_sk2(sk2_doc)
+        svg_doc.save(model_path)
+        svg_doc.close()
+        stream_path = os.path.join(self.tmp.name, "stream.svg")
+        svg_doc = SVG_Presenter(self.app.appdata)
+        svg_doc.stream_from_sk2(sk2_doc, stream_path)
+        svg_doc.close()
+        sk2_doc.close()
+        self.assertEqual(self.read(stream_path), self.read(model_path))
+
+
+if __name__ == '__main__':
+  unittest.main()